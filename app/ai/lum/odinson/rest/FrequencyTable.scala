@@ -1,36 +1,34 @@
 package ai.lum.odinson.rest
 
+import scala.collection.mutable
+
+/** Keeps the terms ranked `minIdx` to `maxIdx` (inclusive) by frequency (ties keep the order in
+  * which terms were seen, i.e., alphanumeric order).
+  *
+  * Only the best `maxIdx + 1` terms are held (in a heap whose head is the worst of them), so each
+  * update costs O(log maxIdx) regardless of the number of terms.
+  */
 class FrequencyTable(minIdx: Int, maxIdx: Int, reverse: Boolean) {
 
-  private var freqs: List[(String, Long)] = Nil
-
-  private def greaterThanOrEqualTo(reverse: Boolean)(first: Long, second: Long) =
-    if (reverse) first <= second else first >= second
-
-  private def greaterThan(reverse: Boolean)(first: Long, second: Option[Long]) =
-    if (reverse) {
-      // anything is less than a None
-      first < second.getOrElse(Long.MaxValue)
-    } else {
-      // anything is greater than a None
-      first > second.getOrElse(Long.MinValue)
+  // (term, frequency, arrival); greater means ranked lower
+  private val worstFirst: Ordering[(String, Long, Long)] =
+    Ordering.by[(String, Long, Long), (Long, Long)] { case (_, freq, arrival) =>
+      (if (reverse) freq else -freq, arrival)
     }
 
-  private val geq: (Long, Long) => Boolean = greaterThanOrEqualTo(reverse)
-  private val gt: (Long, Option[Long]) => Boolean = greaterThan(reverse)
+  private val kept = mutable.PriorityQueue.empty[(String, Long, Long)](worstFirst)
+  private var numSeen = 0L
 
   def update(newTerm: String, newFreq: Long): Unit = {
-    // only update if new term is higher (or lower, if reversed) frequency as last member
-    // OR if we don't have enough elements in our frequency table
-    if (gt(newFreq, freqs.lastOption.map(_._2)) || freqs.length <= maxIdx) {
-      // separate those in front of this value from those behind
-      val (before, after) = freqs.partition { case (_, extantFreq) => geq(extantFreq, newFreq) }
-      // secondary sorting feature is alphanumeric, same as the input order
-      // therefore we can safely ignore everything we cut out after maxIdx
-      freqs = ((before :+ Tuple2(newTerm, newFreq)) ++ after).take(maxIdx + 1)
-    }
+    kept.enqueue((newTerm, newFreq, numSeen))
+    numSeen += 1
+    if (kept.size > maxIdx + 1) kept.dequeue()
   }
 
-  def get: List[(String, Long)] = freqs.slice(minIdx, maxIdx + 1)
+  def get: List[(String, Long)] =
+    kept.toList
+      .sorted(worstFirst)
+      .slice(minIdx, maxIdx + 1)
+      .map { case (term, freq, _) => (term, freq) }
 
 }
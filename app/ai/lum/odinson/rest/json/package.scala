@@ -66,11 +66,9 @@ package object json {
       config: Config
     ): JsValue = {
 
-      val scoreDocs: JsValue = enriched match {
-        case true =>
-          Json.arr(results.scoreDocs.map { sd => mkJsonWithEnrichedResponse(sd, config) }: _*)
-        case false => Json.arr(results.scoreDocs.map(mkJsonForScoreDoc): _*)
-      }
+      val scoreDocs: JsValue = JsArray(
+        results.scoreDocs.toSeq.map { sd => mkJsonForScoreDoc(sd, enriched, config) }
+      )
 
       Json.obj(
         // format: off
@@ -89,9 +87,29 @@ package object json {
       duration: Float,
       allowTriggerOverlaps: Boolean,
       mentions: Seq[Mention]
-    ): JsValue = {
+    ): JsValue =
+      mkMentionsJson(
+        metadataQuery,
+        duration,
+        allowTriggerOverlaps,
+        mkJsonForMentions(mentions.iterator)
+      )
 
-      val mentionsJson: JsValue = Json.arr(mentions.map(mkJsonForMention): _*)
+    /** JSON for each mention.  Mentions are encoded as the iterator produces them, so only their
+      * JSON (and never every Mention) is held in memory.
+      */
+    def mkJsonForMentions(mentions: Iterator[Mention]): JsArray = {
+      val builder = Vector.newBuilder[JsValue]
+      mentions.foreach(mention => builder += mkJsonForMention(mention))
+      JsArray(builder.result())
+    }
+
+    def mkMentionsJson(
+      metadataQuery: Option[String],
+      duration: Float,
+      allowTriggerOverlaps: Boolean,
+      mentionsJson: JsArray
+    ): JsValue = {
 
       Json.obj(
         // format: off
@@ -110,7 +128,7 @@ package object json {
       engine.dataGatherer.getTokens(luceneDocId, displayField)
     }
     
-    def mkJsonForMention(mention: Mention): Json.JsValueWrapper = {
+    def mkJsonForMention(mention: Mention): JsObject = {
       // We want **all** tokens for the sentence
       val tokens = getTokens(mention.luceneDocId)
       //println(s"""(${mention.start} - ${mention.end} w/ label ${mention.label.getOrElse("???")}): ${tokens.slice(mention.start, mention.end).mkString(" ")}""")
@@ -149,7 +167,16 @@ package object json {
 
     }
 
-    def mkJsonForScoreDoc(odinsonScoreDoc: OdinsonScoreDoc): Json.JsValueWrapper = {
+    def mkJsonForScoreDoc(
+      odinsonScoreDoc: OdinsonScoreDoc,
+      enriched: Boolean,
+      config: Config
+    ): JsObject = enriched match {
+      case true  => mkJsonWithEnrichedResponse(odinsonScoreDoc, config)
+      case false => mkJsonForScoreDoc(odinsonScoreDoc)
+    }
+
+    def mkJsonForScoreDoc(odinsonScoreDoc: OdinsonScoreDoc): JsObject = {
       val displayField = engine.index.displayField
       // val doc = engine.indexSearcher.doc(odinsonScoreDoc.doc)
       // we want **all** tokens for the sentence
@@ -242,7 +269,7 @@ package object json {
     def mkJsonWithEnrichedResponse(
       odinsonScoreDoc: OdinsonScoreDoc,
       config: Config
-    ): Json.JsValueWrapper = {
+    ): JsObject = {
       Json.obj(
         // format: off
         "sentenceId"    -> odinsonScoreDoc.doc,
@@ -262,8 +289,7 @@ package object json {
     ): JsValue = {
       val sentenceIndex = getSentenceIndex(sentenceLuceneDocId)
       val odinsonDocId = getOdinsonDocId(sentenceLuceneDocId)
-      val sentence = getSentence(odinsonDocId, sentenceIndex, config)
-      Json.parse(sentence.toJson)
+      Json.parse(getSentenceJson(odinsonDocId, sentenceIndex, config))
     }
 
     def mkAbridgedSentenceJson(sentenceLuceneDocId: Int, config: Config): JsValue = {
@@ -0,0 +1,23 @@
+package ai.lum.odinson.rest.requests
+
+import play.api.libs.json._
+
+case class SentenceIdsRequest(
+  sentenceIds: List[Int],
+  pretty: Option[Boolean] = None
+)
+
+object SentenceIdsRequest {
+  implicit val fmt: OFormat[SentenceIdsRequest] = Json.format[SentenceIdsRequest]
+  implicit val read: Reads[SentenceIdsRequest] = Json.reads[SentenceIdsRequest]
+}
+
+case class DocumentIdsRequest(
+  documentIds: List[String],
+  pretty: Option[Boolean] = None
+)
+
+object DocumentIdsRequest {
+  implicit val fmt: OFormat[DocumentIdsRequest] = Json.format[DocumentIdsRequest]
+  implicit val read: Reads[DocumentIdsRequest] = Json.reads[DocumentIdsRequest]
+}
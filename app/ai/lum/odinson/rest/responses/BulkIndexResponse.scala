@@ -0,0 +1,43 @@
+package ai.lum.odinson.rest.responses
+
+import play.api.libs.json._
+
+/** The outcome of indexing one document of a bulk request.
+  *
+  * @param line
+  *   The (1-based) line of the request body holding the document.
+  * @param id
+  *   The document's ID (if it could be parsed).
+  * @param error
+  *   Why the document was not indexed (if it failed).
+  */
+case class DocumentStatus(
+  line: Int,
+  id: Option[String],
+  indexed: Boolean,
+  error: Option[String] = None
+)
+
+object DocumentStatus {
+  implicit val fmt: OFormat[DocumentStatus] = Json.format[DocumentStatus]
+}
+
+case class BulkIndexResponse(
+  numIndexed: Int,
+  numFailed: Int,
+  results: Seq[DocumentStatus]
+)
+
+object BulkIndexResponse {
+  implicit val fmt: OFormat[BulkIndexResponse] = Json.format[BulkIndexResponse]
+
+  def fromStatuses(statuses: Seq[DocumentStatus]): BulkIndexResponse = {
+    val numIndexed = statuses.count(_.indexed)
+    BulkIndexResponse(
+      numIndexed = numIndexed,
+      numFailed = statuses.size - numIndexed,
+      results = statuses
+    )
+  }
+
+}
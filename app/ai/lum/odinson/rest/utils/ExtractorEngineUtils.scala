@@ -7,6 +7,7 @@ import ai.lum.odinson.lucene.index.OdinsonIndexWriter
 import org.apache.lucene.document.{ Document => LuceneDocument }
 import com.typesafe.config.Config
 import java.io.File
+import scala.util.control.NonFatal
 
 object ExtractorEngineUtils {
 
@@ -57,6 +58,42 @@ object ExtractorEngineUtils {
       OdinsonDocument.fromJson(f)
     }
 
+    /** Retrieves the JSON of a single sentence without parsing the rest of its document (see
+      * [[SentenceSidecar]]).  Documents without a sidecar are parsed once and given one.
+      */
+    def getSentenceJson(
+      odinsonDocId: String,
+      sentenceIndex: Int,
+      config: Config
+    ): String = getSentenceJsons(odinsonDocId, Seq(sentenceIndex), config).head
+
+    /** Retrieves the JSON of several sentences of the same document, reading it once. */
+    def getSentenceJsons(
+      odinsonDocId: String,
+      sentenceIndices: Seq[Int],
+      config: Config
+    ): Seq[String] = {
+      val f = getDocJsonFile(odinsonDocId, config)
+      def outOfRange(sentenceIndex: Int) = OdinsonException(
+        s"sentence index '${sentenceIndex}' out of range for doc '${odinsonDocId}'"
+      )
+      try {
+        SentenceSidecar.readMany(f, sentenceIndices) match {
+          case Some(jsons) => jsons
+          case None =>
+            val doc = OdinsonDocument.fromJson(f)
+            // backfill (best effort)
+            try { SentenceSidecar.write(doc, f) } catch { case NonFatal(_) => () }
+            sentenceIndices.map { i =>
+              doc.sentences.lift(i).getOrElse(throw outOfRange(i)).toJson
+            }
+        }
+      } catch {
+        case _: IndexOutOfBoundsException =>
+          throw OdinsonException(s"sentence index out of range for doc '${odinsonDocId}'")
+      }
+    }
+
     def getSentence(
       odinsonDocId: String,
       sentenceIndex: Int,
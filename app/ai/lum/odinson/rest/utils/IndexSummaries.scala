@@ -0,0 +1,70 @@
+package ai.lum.odinson.rest.utils
+
+import ai.lum.odinson.rest.json._
+import java.nio.charset.StandardCharsets
+import java.security.MessageDigest
+import java.util.concurrent.ConcurrentHashMap
+import play.api.http.HeaderNames
+import play.api.libs.json._
+import play.api.mvc.{ RequestHeader, Result, Results }
+
+/** JSON summaries of an index (vocabularies, corpus information, etc.) computed at most once per
+  * index generation (see [[SharedEngine.generation]]) and served from memory.
+  *
+  * Each summary carries an ETag (a digest of its JSON), so clients can revalidate with
+  * If-None-Match instead of downloading an unchanged summary again.
+  */
+class IndexSummaries {
+
+  import IndexSummaries._
+
+  // name -> latest summary
+  private val entries = new ConcurrentHashMap[String, Summary]()
+
+  /** The summary for name, computing it if it is missing or was computed against an older
+    * generation of the index.
+    */
+  def get(name: String, generation: Long)(compute: => JsValue): Summary = {
+    val current = entries.get(name)
+    if (current != null && current.generation >= generation) {
+      current
+    } else {
+      // NOTE: if the index is written to while computing, the summary is recomputed on next use
+      val json = compute
+      val summary = Summary(generation, json, digest(json))
+      entries.put(name, summary)
+      summary
+    }
+  }
+
+  def invalidateAll(): Unit = entries.clear()
+
+}
+
+object IndexSummaries {
+
+  case class Summary(generation: Long, json: JsValue, digest: String) {
+
+    def etag(pretty: Option[Boolean]): String =
+      if (pretty.getOrElse(false)) s""""${digest}-pretty"""" else s""""${digest}""""
+
+    /** Responds with the summary, or with 304 (Not Modified) if the client already has it. */
+    def result(request: RequestHeader, pretty: Option[Boolean]): Result = {
+      val tag = etag(pretty)
+      val cached = request.headers.get(HeaderNames.IF_NONE_MATCH).exists { header =>
+        header.split(",").map(_.trim.stripPrefix("W/")).exists(t => t == tag || t == "*")
+      }
+      val result = if (cached) Results.NotModified else json.format(pretty)
+      result.withHeaders(HeaderNames.ETAG -> tag)
+    }
+
+  }
+
+  def digest(json: JsValue): String = {
+    val bytes = MessageDigest
+      .getInstance("SHA-256")
+      .digest(Json.stringify(json).getBytes(StandardCharsets.UTF_8))
+    bytes.take(16).map(b => f"${b & 0xff}%02x").mkString
+  }
+
+}
@@ -28,6 +28,7 @@ object OdinsonDocumentUtils {
         case Some(sf: OdinsonStringField) =>
           val f = new File(docsDir, sf.string)
           f.writeString(doc.toJson)
+          SentenceSidecar.write(doc, f)
         case _ => ()
       }
     }
@@ -39,6 +40,7 @@ object OdinsonDocumentUtils {
         case Some(sf: OdinsonStringField) =>
           val f = new File(docsDir, sf.string)
           f.delete()
+          SentenceSidecar.delete(f)
         case None =>
           throw OdinsonException(s"No parentDocFieldFileName found for ${doc.id}")
       }
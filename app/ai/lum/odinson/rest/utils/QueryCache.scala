@@ -0,0 +1,101 @@
+package ai.lum.odinson.rest.utils
+
+import ai.lum.common.ConfigUtils._
+import ai.lum.odinson.{ ExtractorEngine, Extractor }
+import ai.lum.odinson.lucene.search.OdinsonQuery
+import com.github.benmanes.caffeine.cache.{ Cache, Caffeine }
+import com.typesafe.config.Config
+import java.util.function.{ Function => JFunction }
+import play.api.libs.json._
+
+/** Bounded caches of compiled patterns and grammars.
+  *
+  * Compiling depends on the index (ex. the vocabulary of dependency relations), so each entry is
+  * keyed by the index generation it was compiled against (see [[SharedEngine.generation]]) and the
+  * caches are cleared whenever the index is written to.
+  */
+class QueryCache(config: Config) {
+
+  // format: off
+  val maxQueries  = config.apply[Long]("odinson.rest.compiledCache.maxQueries")
+  val maxGrammars = config.apply[Long]("odinson.rest.compiledCache.maxGrammars")
+  // format: on
+
+  // (generation, pattern or grammar, metadata query)
+  type Key = (Long, String, Option[String])
+
+  private val queries: Cache[Key, OdinsonQuery] =
+    Caffeine.newBuilder().maximumSize(maxQueries).recordStats().build[Key, OdinsonQuery]()
+
+  private val grammars: Cache[Key, Seq[Extractor]] =
+    Caffeine.newBuilder().maximumSize(maxGrammars).recordStats().build[Key, Seq[Extractor]]()
+
+  private def loader[V](compile: => V): JFunction[Key, V] = new JFunction[Key, V] {
+    def apply(key: Key): V = compile
+  }
+
+  /** Compiles an Odinson pattern (optionally filtered by a metadata query), reusing a cached
+    * compilation when possible.
+    */
+  def query(
+    engine: ExtractorEngine,
+    generation: Long,
+    pattern: String,
+    metadataQuery: Option[String]
+  ): OdinsonQuery =
+    queries.get(
+      (generation, pattern, metadataQuery),
+      loader {
+        metadataQuery match {
+          case Some(mq) => engine.compiler.mkQuery(pattern, mq)
+          case None     => engine.compiler.mkQuery(pattern)
+        }
+      }
+    )
+
+  /** Compiles an Odinson grammar (optionally filtered by a metadata query), reusing a cached
+    * compilation when possible.
+    */
+  def grammar(
+    engine: ExtractorEngine,
+    generation: Long,
+    rules: String,
+    metadataQuery: Option[String]
+  ): Seq[Extractor] =
+    grammars.get(
+      (generation, rules, metadataQuery),
+      loader {
+        metadataQuery match {
+          case Some(raw) =>
+            val mq = engine.compiler.mkParentQuery(raw)
+            engine.compileRuleString(rules = rules, metadataFilter = mq)
+          case None => engine.ruleReader.compileRuleString(rules)
+        }
+      }
+    )
+
+  def invalidateAll(): Unit = {
+    queries.invalidateAll()
+    grammars.invalidateAll()
+  }
+
+  private def statsJson(cache: Cache[_, _]): JsObject = {
+    val stats = cache.stats()
+    Json.obj(
+      // format: off
+      "hits"      -> stats.hitCount,
+      "misses"    -> stats.missCount,
+      "hitRate"   -> stats.hitRate,
+      "evictions" -> stats.evictionCount,
+      "size"      -> cache.estimatedSize
+      // format: on
+    )
+  }
+
+  /** Hit/miss counters for each cache. */
+  def stats: JsObject = Json.obj(
+    "queries" -> statsJson(queries),
+    "grammars" -> statsJson(grammars)
+  )
+
+}
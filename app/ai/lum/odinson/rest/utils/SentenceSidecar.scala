@@ -0,0 +1,80 @@
+package ai.lum.odinson.rest.utils
+
+import ai.lum.odinson.{ Document => OdinsonDocument }
+import java.io.{ BufferedOutputStream, DataOutputStream, File, FileOutputStream, RandomAccessFile }
+import java.nio.charset.StandardCharsets
+import java.nio.file.{ Files, StandardCopyOption }
+
+/** Per-sentence access to a serialized OdinsonDocument.
+  *
+  * Next to each document's JSON file (`<name>.json`) we keep a sidecar (`<name>.json.sentences`)
+  * holding the JSON of each sentence along with its offsets, so that retrieving one sentence reads
+  * and parses only that sentence (regardless of the size of its document).
+  *
+  * Layout:
+  *   - number of sentences (N, int)
+  *   - N + 1 offsets (long) into the data section (sentence i spans offsets i to i + 1)
+  *   - data: the UTF-8 JSON of each sentence
+  */
+object SentenceSidecar {
+
+  val SUFFIX = ".sentences"
+
+  def sidecarFor(docFile: File): File = new File(docFile.getPath + SUFFIX)
+
+  def write(doc: OdinsonDocument, docFile: File): Unit = {
+    val sentences = doc.sentences.map(_.toJson.getBytes(StandardCharsets.UTF_8))
+    val target = sidecarFor(docFile)
+    // write to a temporary file so that readers never see a partial sidecar
+    val tmp = File.createTempFile(target.getName, ".tmp", target.getParentFile)
+    val out = new DataOutputStream(new BufferedOutputStream(new FileOutputStream(tmp)))
+    try {
+      out.writeInt(sentences.size)
+      sentences.scanLeft(0L)(_ + _.length).foreach(offset => out.writeLong(offset))
+      sentences.foreach(bytes => out.write(bytes))
+    } finally {
+      out.close()
+    }
+    Files.move(tmp.toPath, target.toPath, StandardCopyOption.REPLACE_EXISTING)
+  }
+
+  /** The JSON of the requested sentence, or None if the document has no sidecar. */
+  def read(docFile: File, sentenceIndex: Int): Option[String] =
+    readMany(docFile, Seq(sentenceIndex)).map(_.head)
+
+  /** The JSON of each requested sentence (reading the sidecar once), or None if the document has
+    * no sidecar.
+    */
+  def readMany(docFile: File, sentenceIndices: Seq[Int]): Option[Seq[String]] = {
+    val sidecar = sidecarFor(docFile)
+    if (!sidecar.exists()) {
+      None
+    } else {
+      val f = new RandomAccessFile(sidecar, "r")
+      try {
+        val numSentences = f.readInt()
+        val dataStart = 4L + 8L * (numSentences + 1)
+        val sentences = sentenceIndices.map { sentenceIndex =>
+          if (sentenceIndex < 0 || sentenceIndex >= numSentences) {
+            throw new IndexOutOfBoundsException(
+              s"sentence index '${sentenceIndex}' out of range for ${numSentences} sentences"
+            )
+          }
+          f.seek(4L + 8L * sentenceIndex)
+          val start = f.readLong()
+          val end = f.readLong()
+          val bytes = new Array[Byte]((end - start).toInt)
+          f.seek(dataStart + start)
+          f.readFully(bytes)
+          new String(bytes, StandardCharsets.UTF_8)
+        }
+        Some(sentences)
+      } finally {
+        f.close()
+      }
+    }
+  }
+
+  def delete(docFile: File): Unit = sidecarFor(docFile).delete()
+
+}
@@ -0,0 +1,307 @@
+package ai.lum.odinson.rest.utils
+
+import ai.lum.common.ConfigUtils._
+import ai.lum.odinson.{ ExtractorEngine, Extractor }
+import ai.lum.odinson.lucene.search.OdinsonQuery
+import com.typesafe.config.Config
+import play.api.Logger
+import play.api.libs.json.JsValue
+import java.io.File
+import java.util.concurrent.{
+  Executors,
+  ScheduledExecutorService,
+  Semaphore,
+  ThreadFactory,
+  TimeUnit
+}
+import java.util.concurrent.atomic.{ AtomicBoolean, AtomicLong }
+import java.util.concurrent.locks.StampedLock
+import scala.collection.mutable
+import scala.util.control.NonFatal
+
+/** A long-lived [[https://github.com/lum-ai/odinson/blob/master/core/src/main/scala/ai/lum/odinson/ExtractorEngine.scala ai.lum.odinson.ExtractorEngine]]
+  * shared by every request against the same index.
+  *
+  * Opening an engine (index reader, writer, compiler, state) for each request dominates the latency of
+  * cheap calls such as /api/numdocs.  Instead, the engine is opened once and its reader is refreshed
+  * after each write (and, optionally, every `odinson.rest.engine.refreshMs`) so that searches see
+  * changes in near-real-time.
+  *
+  * Lucene allows a single writer per index directory, so engines are shared JVM-wide by index
+  * directory (see [[SharedEngine.forConfig]]).
+  */
+class SharedEngine(config: Config) {
+
+  // format: off
+  val shared             = config.apply[Boolean]("odinson.rest.engine.shared")
+  val refreshAfterWrites = config.apply[Boolean]("odinson.rest.engine.refreshAfterWrites")
+  val refreshMs          = config.apply[Long]   ("odinson.rest.engine.refreshMs")
+  // format: on
+
+  // readers and writers share the engine;
+  // the exclusive lock is only taken to (re)open or close the engine.
+  // NOTE: unlike a ReentrantReadWriteLock, a shared lease can be released by any thread (see streaming responses)
+  private val lock = new StampedLock()
+  // grammar execution reads and clears the engine's state
+  // NOTE: a semaphore (rather than a monitor) so that streaming responses can release it from any thread
+  private val stateLock = new Semaphore(1)
+  @volatile private var engine: Option[ExtractorEngine] = None
+
+  /** Incremented after every write to the index. */
+  private val _generation = new AtomicLong(0L)
+
+  def generation: Long = _generation.get()
+
+  /** Compiled patterns and grammars for this index. */
+  val compiled = new QueryCache(config)
+
+  /** Vocabularies, corpus information, etc. for this index. */
+  val summaries = new IndexSummaries()
+
+  /** The named summary of the current generation of the index, computing it if needed. */
+  def summary(name: String)(compute: => JsValue): IndexSummaries.Summary =
+    summaries.get(name, generation)(compute)
+
+  private def written(): Unit = {
+    _generation.incrementAndGet()
+    compiled.invalidateAll()
+  }
+
+  /** Compiles an Odinson pattern (optionally filtered by a metadata query) using the cache. */
+  def mkQuery(engine: ExtractorEngine, pattern: String, metadataQuery: Option[String]): OdinsonQuery =
+    compiled.query(engine, generation, pattern, metadataQuery)
+
+  /** Compiles an Odinson grammar (optionally filtered by a metadata query) using the cache. */
+  def compileGrammar(
+    engine: ExtractorEngine,
+    rules: String,
+    metadataQuery: Option[String]
+  ): Seq[Extractor] =
+    compiled.grammar(engine, generation, rules, metadataQuery)
+
+  private val refresher: Option[ScheduledExecutorService] =
+    if (shared && refreshMs > 0) {
+      val scheduler = Executors.newSingleThreadScheduledExecutor(SharedEngine.daemonThreads)
+      scheduler.scheduleWithFixedDelay(
+        new Runnable { def run(): Unit = refresh() },
+        refreshMs,
+        refreshMs,
+        TimeUnit.MILLISECONDS
+      )
+      Some(scheduler)
+    } else None
+
+  /** Opens the engine unless another thread already did so.
+    * NOTE: expects the exclusive lock to be held.
+    */
+  private def open(): ExtractorEngine = engine match {
+    case Some(e) => e
+    case None =>
+      val e = ExtractorEngine.fromConfig(config)
+      engine = Some(e)
+      e
+  }
+
+  /** Takes a shared lease on the engine, opening it if needed.  The engine stays open until every
+    * lease is closed.  Leases can be closed from any thread.
+    */
+  def lease(): SharedEngine.Lease =
+    if (!shared) {
+      val e = ExtractorEngine.fromConfig(config)
+      new SharedEngine.Lease(e, () => e.close())
+    } else {
+      var stamp = lock.readLock()
+      val e = engine match {
+        case Some(e) => e
+        case None =>
+          // upgrade to open the engine
+          lock.unlockRead(stamp)
+          val writeStamp = lock.writeLock()
+          val opened =
+            try {
+              open()
+            } catch {
+              case error: Throwable =>
+                lock.unlockWrite(writeStamp)
+                throw error
+            }
+          // downgrade
+          stamp = lock.tryConvertToReadLock(writeStamp)
+          opened
+      }
+      val readStamp = stamp
+      new SharedEngine.Lease(e, () => lock.unlockRead(readStamp))
+    }
+
+  private def withShared[T](f: ExtractorEngine => T): T = {
+    val lease = this.lease()
+    try {
+      f(lease.engine)
+    } finally {
+      lease.close()
+    }
+  }
+
+  /** Runs f against the shared engine (or, when `odinson.rest.engine.shared = false`, a per-call engine). */
+  def read[T](f: ExtractorEngine => T): T =
+    if (shared) withShared(f) else ExtractorEngine.usingEngine(config)(f)
+
+  /** Runs f (which uses and then discards the engine's state) against the shared engine.
+    * Calls are serialized and the state is cleared before and after each call, so that the
+    * mentions of a grammar don't outlive it on the long-lived engine.
+    */
+  def withState[T](f: ExtractorEngine => T): T =
+    if (shared) {
+      withShared { e =>
+        stateLock.acquire()
+        try {
+          e.clearState()
+          f(e)
+        } finally {
+          try {
+            e.clearState()
+          } finally {
+            stateLock.release()
+          }
+        }
+      }
+    } else ExtractorEngine.usingEngine(config)(f)
+
+  /** Like [[withState]], but the engine (and its state) is held until the lease is closed (from any
+    * thread), which also clears the state.  Used to stream the results of a grammar.
+    */
+  def leaseState(): SharedEngine.Lease = {
+    val lease = this.lease()
+    if (!shared) {
+      // a fresh engine (and state) for this lease
+      lease
+    } else {
+      try {
+        stateLock.acquire()
+      } catch {
+        case error: Throwable =>
+          lease.close()
+          throw error
+      }
+      val release = () =>
+        try {
+          lease.engine.clearState()
+        } finally {
+          try {
+            stateLock.release()
+          } finally {
+            lease.close()
+          }
+        }
+      try {
+        lease.engine.clearState()
+      } catch {
+        case error: Throwable =>
+          release()
+          throw error
+      }
+      new SharedEngine.Lease(lease.engine, release)
+    }
+  }
+
+  /** Runs f (which modifies the index) and then makes the changes visible to searches. */
+  def write[T](f: ExtractorEngine => T): T =
+    if (shared) {
+      withShared { e =>
+        try {
+          f(e)
+        } finally {
+          try {
+            if (refreshAfterWrites) e.index.refresh()
+          } finally {
+            // after the refresh, so nothing compiled against the old reader is cached under the new generation
+            written()
+          }
+        }
+      }
+    } else {
+      val res = ExtractorEngine.usingEngine(config)(f)
+      written()
+      res
+    }
+
+  /** Runs f (which modifies the index) against a short-lived engine opened with a different config
+    * (ex. a larger odinson.index.maxNumberOfTokensPerSentence).  The shared engine is closed for the
+    * duration of the call (Lucene allows a single writer per index) and reopened on next use.
+    */
+  def writeWith[T](otherConfig: Config)(f: ExtractorEngine => T): T = {
+    val stamp = lock.writeLock()
+    try {
+      engine.foreach(_.close())
+      engine = None
+      ExtractorEngine.usingEngine(otherConfig)(f)
+    } finally {
+      written()
+      lock.unlockWrite(stamp)
+    }
+  }
+
+  /** Makes recent writes (including those of other processes) visible to searches. */
+  def refresh(): Unit = {
+    val stamp = lock.readLock()
+    try {
+      engine.foreach(_.index.refresh())
+      summaries.invalidateAll()
+    } catch {
+      case NonFatal(error) =>
+        SharedEngine.logger.error("failed to refresh index", error)
+    } finally {
+      lock.unlockRead(stamp)
+    }
+  }
+
+  def close(): Unit = {
+    refresher.foreach(_.shutdownNow())
+    val stamp = lock.writeLock()
+    try {
+      engine.foreach(_.close())
+      engine = None
+    } finally {
+      lock.unlockWrite(stamp)
+    }
+  }
+
+}
+
+object SharedEngine {
+
+  private val logger: Logger = Logger(getClass)
+
+  /** A shared hold on an engine.  Close it (exactly once is enough) to release the engine. */
+  class Lease(val engine: ExtractorEngine, release: () => Unit) extends AutoCloseable {
+    private val closed = new AtomicBoolean(false)
+
+    def close(): Unit = if (closed.compareAndSet(false, true)) release()
+  }
+
+  // index directory -> engine
+  private val engines = mutable.Map.empty[String, SharedEngine]
+
+  private val daemonThreads = new ThreadFactory {
+    def newThread(r: Runnable): Thread = {
+      val t = new Thread(r, "odinson-index-refresh")
+      t.setDaemon(true)
+      t
+    }
+  }
+
+  /** The engine for config's odinson.indexDir.  The first config seen for an index is used to open it. */
+  def forConfig(config: Config): SharedEngine = engines.synchronized {
+    val indexDir = config.apply[File]("odinson.indexDir").getCanonicalPath
+    engines.getOrElseUpdate(indexDir, new SharedEngine(config))
+  }
+
+  /** Closes every engine (and releases their index locks). */
+  def closeAll(): Unit = engines.synchronized {
+    engines.values.foreach(_.close())
+    engines.clear()
+  }
+
+  sys.addShutdownHook(closeAll())
+
+}
@@ -0,0 +1,94 @@
+package ai.lum.odinson.rest.utils
+
+import akka.NotUsed
+import akka.stream.scaladsl.Source
+import akka.util.ByteString
+import java.io.{ File, FileOutputStream, RandomAccessFile }
+
+/** An append-only temporary file that one thread writes while a response reads it.
+  *
+  * Lets a producer holding a shared resource (ex. a grammar holding the engine and its state) run
+  * at its own pace rather than at the pace of the client: whatever the client has not read yet
+  * waits on disk instead of in memory.  The file is deleted once the response is done with it.
+  */
+class SpillFile(prefix: String, chunkSize: Int = SpillFile.DefaultChunkSize) {
+
+  private val file = File.createTempFile(prefix, ".tmp")
+  private val out = new FileOutputStream(file)
+
+  // guarded by this
+  private var written = 0L
+  private var done = false
+  private var failure: Option[Throwable] = None
+
+  @volatile private var cancelled = false
+
+  /** Whether the reader stopped (ex. the client disconnected), so the writer can stop too. */
+  def isCancelled: Boolean = cancelled
+
+  /** Appends bytes, making them available to the reader. */
+  def write(bytes: ByteString): Unit = {
+    out.write(bytes.toArray)
+    synchronized {
+      written += bytes.length
+      notifyAll()
+    }
+  }
+
+  /** Marks the end of the data. */
+  def finish(): Unit = end(None)
+
+  /** Ends the data with an error (the reader fails once it has read everything before it). */
+  def fail(error: Throwable): Unit = end(Some(error))
+
+  private def end(error: Option[Throwable]): Unit =
+    try {
+      out.close()
+    } finally {
+      synchronized {
+        done = true
+        failure = error
+        notifyAll()
+      }
+    }
+
+  /** Blocks until more than `position` bytes were written (or the data ended).
+    * @return
+    *   the number of bytes written
+    */
+  private def awaitBeyond(position: Long): Long = synchronized {
+    while (written <= position && !done) wait()
+    if (written <= position) failure.foreach(error => throw error)
+    written
+  }
+
+  /** The data, in chunks of at most chunkSize bytes, as it is written.  The source blocks while it
+    * waits for the writer, so it runs on Akka's IO dispatcher.
+    */
+  def source: Source[ByteString, NotUsed] =
+    Source.unfoldResource[ByteString, RandomAccessFile](
+      () => new RandomAccessFile(file, "r"),
+      in => {
+        val position = in.getFilePointer
+        val available = awaitBeyond(position)
+        if (available <= position) None
+        else {
+          val chunk = new Array[Byte](math.min(chunkSize.toLong, available - position).toInt)
+          in.readFully(chunk)
+          Some(ByteString.fromArrayUnsafe(chunk))
+        }
+      },
+      in => {
+        cancelled = true
+        in.close()
+        file.delete()
+      }
+    )
+
+}
+
+object SpillFile {
+
+  val DefaultChunkSize: Int = 64 * 1024
+
+}
@@ -0,0 +1,143 @@
+package ai.lum.odinson.rest.utils
+
+import ai.lum.common.ConfigUtils._
+import com.typesafe.config.Config
+import java.util.concurrent.{
+  ArrayBlockingQueue,
+  RejectedExecutionException,
+  ThreadFactory,
+  ThreadPoolExecutor,
+  TimeUnit
+}
+import java.util.concurrent.atomic.{ AtomicInteger, AtomicLong }
+import play.api.http.HeaderNames
+import play.api.libs.json._
+import play.api.mvc.{ Result, Results }
+import scala.concurrent.{ Future, Promise }
+import scala.util.Try
+
+/** A fixed number of threads with a bounded queue of pending work.
+  *
+  * Once every thread is busy and the queue is full, new work is rejected right away (see
+  * [[WorkPool.Rejected]]) instead of piling up, so that an overloaded kind of request (ex. long
+  * grammars) is shed with 503 (Service Unavailable) without delaying other kinds of requests.
+  */
+class WorkPool(val name: String, val threads: Int, val queueSize: Int) {
+
+  private val rejected = new AtomicLong(0L)
+
+  private val executor = new ThreadPoolExecutor(
+    threads,
+    threads,
+    0L,
+    TimeUnit.MILLISECONDS,
+    new ArrayBlockingQueue[Runnable](queueSize),
+    WorkPool.daemonThreads(s"odinson-${name}"),
+    new ThreadPoolExecutor.AbortPolicy()
+  )
+
+  /** Runs f on this pool.
+    * @throws WorkPool.Rejected
+    *   if every thread is busy and the queue is full.
+    */
+  def submit[T](f: => T): Future[T] = {
+    val promise = Promise[T]()
+    try {
+      executor.execute(new Runnable { def run(): Unit = promise.complete(Try(f)) })
+    } catch {
+      case _: RejectedExecutionException =>
+        rejected.incrementAndGet()
+        throw new WorkPool.Rejected(name)
+    }
+    promise.future
+  }
+
+  /** Runs an action on this pool, responding with 503 (Service Unavailable) if the pool is full. */
+  def apply(action: => Result): Future[Result] =
+    try {
+      submit(action)
+    } catch {
+      case e: WorkPool.Rejected => Future.successful(e.result)
+    }
+
+  def stats: JsObject = Json.obj(
+    // format: off
+    "threads"   -> threads,
+    "active"    -> executor.getActiveCount,
+    "queued"    -> executor.getQueue.size,
+    "queueSize" -> queueSize,
+    "completed" -> executor.getCompletedTaskCount,
+    "rejected"  -> rejected.get
+    // format: on
+  )
+
+  def shutdown(): Unit = executor.shutdownNow()
+
+}
+
+object WorkPool {
+
+  class Rejected(pool: String)
+      extends RejectedExecutionException(s"too many pending '${pool}' requests") {
+
+    def result: Result =
+      Results
+        .ServiceUnavailable(getMessage)
+        .withHeaders(HeaderNames.RETRY_AFTER -> "1")
+  }
+
+  def fromConfig(config: Config, name: String): WorkPool =
+    new WorkPool(
+      name,
+      config.apply[Int](s"odinson.rest.pools.${name}.threads"),
+      config.apply[Int](s"odinson.rest.pools.${name}.queueSize")
+    )
+
+  def daemonThreads(prefix: String): ThreadFactory = new ThreadFactory {
+    private val count = new AtomicInteger(0)
+
+    def newThread(r: Runnable): Thread = {
+      val t = new Thread(r, s"${prefix}-${count.incrementAndGet()}")
+      t.setDaemon(true)
+      t
+    }
+  }
+
+}
+
+/** Separate pools for each kind of work, so that one kind can't starve the others (ex. long
+  * grammars delaying searches and healthchecks, which stay on Play's default dispatcher).
+  */
+class WorkPools(config: Config) {
+
+  /** searches, lookups of documents and sentences, vocabularies, validation */
+  val search = WorkPool.fromConfig(config, "search")
+
+  /** index writes (index, update, delete) */
+  val index = WorkPool.fromConfig(config, "index")
+
+  /** long-running grammars and frequency statistics */
+  val jobs = WorkPool.fromConfig(config, "jobs")
+
+  def stats: JsObject = Json.obj(
+    search.name -> search.stats,
+    index.name -> index.stats,
+    jobs.name -> jobs.stats
+  )
+
+}
+
+object WorkPools {
+
+  private var pools: Option[WorkPools] = None
+
+  /** The pools shared by every controller.  The first config seen is used to create them. */
+  def forConfig(config: Config): WorkPools = synchronized {
+    pools.getOrElse {
+      val created = new WorkPools(config)
+      pools = Some(created)
+      created
+    }
+  }
+
+}
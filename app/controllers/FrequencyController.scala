@@ -2,7 +2,7 @@ package controllers
 
 import ai.lum.common.ConfigFactory
 import ai.lum.common.ConfigUtils._
-import ai.lum.odinson.Mention
+import ai.lum.odinson.{ Extractor, Mention }
 import com.typesafe.config.Config
 import ai.lum.odinson.ExtractorEngine
 import ai.lum.odinson.rest.{ FrequencyTable, TermsAndFreqs }
@@ -18,6 +18,7 @@ import play.api.mvc._
 import javax.inject._
 import scala.annotation.tailrec
 import scala.collection.JavaConverters._
+import scala.collection.mutable
 import scala.concurrent.duration._
 import scala.concurrent.{ ExecutionContext, Future }
 import scala.math._
@@ -35,10 +36,14 @@ class FrequencyController @Inject() (
   import ExceptionUtils._
   import ExtractorEngineUtils._
 
-  val vocabularyExpiry = playConfig.get[Duration]("play.cache.vocabularyExpiry")
-
   val posTagTokenField = config.apply[String]("odinson.index.posTagTokenField")
 
+  /** The engine shared by all requests against this index. */
+  val engines = SharedEngine.forConfig(config)
+
+  /** Thread pools for searches, index writes and long-running jobs. */
+  val pools = WorkPools.forConfig(config)
+
   /** Convenience method to determine if a string matches a given regular expression.
     * @param s
     *   The String to be searched.
@@ -83,7 +88,7 @@ class FrequencyController @Inject() (
     reverse: Option[Boolean],
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
+    pools.jobs {
       try {
         // cutoff the results to the requested ranks
         val defaultMin = 0
@@ -92,7 +97,7 @@ class FrequencyController @Inject() (
         val minIdx = min.getOrElse(defaultMin)
         val maxIdx = max.getOrElse(defaultMax)
 
-        ExtractorEngine.usingEngine(config) { extractorEngine =>
+        engines.read { extractorEngine =>
           // ensure that the requested field exists in the index
           val fields = extractorEngine.index.listFields()
           val fieldNames = fields.iterator.asScala.toList
@@ -136,7 +141,7 @@ class FrequencyController @Inject() (
                     TermsAndFreqs(termsEnum).foreach { termAndFreq =>
                       termFreqs.enqueue((termAndFreq.term, termAndFreq.freq))
                       // if we exceed the size we need, just throw the oldest away
-                      if (termFreqs.size > maxIdx) termFreqs.dequeue()
+                      if (termFreqs.size > maxIdx + 1) termFreqs.dequeue()
                     }
                     termFreqs
                       .toIndexedSeq
@@ -232,6 +237,51 @@ class FrequencyController @Inject() (
     }
   }
 
+  /** Whether every rule runs in the first (and only) iteration of the extraction.  Only then can
+    * no rule depend on the mentions found by another, so the grammar can be run without state.
+    */
+  def isStateless(extractors: Seq[Extractor]): Boolean =
+    extractors.forall(e => e.priority.minIterations <= 1 && !e.priority.matches(2))
+
+  /** Count the mentions found by each rule over every sentence in the index.
+    *
+    * Mentions are counted as the iterator produces them (and then dropped), so memory grows with
+    * the number of rules rather than the number of mentions.  Grammars with later priorities
+    * need the mentions of earlier iterations, so they are extracted with the engine's state
+    * (which holds every mention until [[SharedEngine.withState]] clears it).
+    * @return
+    *   Number of mentions found by each rule (rules without mentions are absent).
+    */
+  def countMentionsByRule(
+    extractorEngine: ExtractorEngine,
+    extractors: Seq[Extractor],
+    allowTriggerOverlaps: Boolean
+  ): Map[String, Int] = {
+    val counts = mutable.HashMap.empty[String, Int]
+    val mentions: Iterator[Mention] =
+      if (isStateless(extractors)) {
+        extractorEngine.extractNoState(
+          extractors,
+          numSentences = extractorEngine.numDocs(),
+          allowTriggerOverlaps = allowTriggerOverlaps,
+          disableMatchSelector = false
+        )
+      } else {
+        extractorEngine.extractMentions(
+          extractors,
+          numSentences = extractorEngine.numDocs(),
+          allowTriggerOverlaps = allowTriggerOverlaps,
+          disableMatchSelector = false
+        )
+      }
+    mentions
+      // rule name is all that matters
+      .foreach { mention =>
+        counts(mention.foundBy) = counts.getOrElse(mention.foundBy, 0) + 1
+      }
+    counts.toMap
+  }
+
   /** Count how many times each rule matches from the active grammar on the active dataset.
     * @param grammar
     *   An Odinson grammar.
@@ -255,86 +305,72 @@ class FrequencyController @Inject() (
     * @return
     *   JSON frequency table as an array of objects.
     */
-  def ruleFreq() = Action { request =>
-    ExtractorEngine.usingEngine(config) { extractorEngine =>
-      val ruleFreqRequest = request.body.asJson.get.as[RuleFreqRequest]
-      // println(s"GrammarRequest: ${gr}")
-      val grammar = ruleFreqRequest.grammar
-      val allowTriggerOverlaps = ruleFreqRequest.allowTriggerOverlaps.getOrElse(false)
-      // TODO: Allow grouping factor: "ruleType" (basic or event), "accuracy" (wrong or right), others?
-      // val group = gr.group
-      val filter = ruleFreqRequest.filter
-      val order = ruleFreqRequest.order
-      val min = ruleFreqRequest.min
-      val max = ruleFreqRequest.max
-      val scale = ruleFreqRequest.scale
-      val reverse = ruleFreqRequest.reverse
-      val pretty = ruleFreqRequest.pretty
-      try {
-        // rules -> OdinsonQuery
-        val extractors = extractorEngine.ruleReader.compileRuleString(grammar)
-
-        val mentions: Seq[Mention] = {
-          val iterator = extractorEngine.extractMentions(
-            extractors,
-            numSentences = extractorEngine.numDocs(),
-            allowTriggerOverlaps = allowTriggerOverlaps,
-            disableMatchSelector = false
-          )
-          iterator.toVector
-        }
-
-        val ruleFreqs = mentions
-          // rule name is all that matters
-          .map(_.foundBy)
-          // collect the instances of each rule's results
-          .groupBy(identity)
-          // filter the rules by name, if a filter was passed
-          // NB: this is Scala style anchored regex, *not* Lucene's RegExp
-          // TODO: unify regex style with that of termFreq's filter
-          .filter { case (ruleName, ms @ _) => isMatch(ruleName, filter) }
-          // count how many matches for each rule
-          .map { case (k, v) => k -> v.length }
-          .toSeq
-
-        // order the resulting frequencies as requested
-        val ordered = order match {
-          // alphabetical
-          case Some("alpha") => ruleFreqs.sortBy { case (ruleName, _) => ruleName }
-          // frequency (default)
-          case _ => ruleFreqs.sortBy { case (ruleName, freq) => (-freq, ruleName) }
-        }
-
-        // reverse if necessary
-        val reversed = reverse match {
-          case Some(true) => ordered.reverse
-          case _          => ordered
-        }
+  def ruleFreq() = Action.async { request =>
+    pools.jobs {
+      engines.withState { extractorEngine =>
+        val ruleFreqRequest = request.body.asJson.get.as[RuleFreqRequest]
+        // println(s"GrammarRequest: ${gr}")
+        val grammar = ruleFreqRequest.grammar
+        val allowTriggerOverlaps = ruleFreqRequest.allowTriggerOverlaps.getOrElse(false)
+        // TODO: Allow grouping factor: "ruleType" (basic or event), "accuracy" (wrong or right), others?
+        // val group = gr.group
+        val filter = ruleFreqRequest.filter
+        val order = ruleFreqRequest.order
+        val min = ruleFreqRequest.min
+        val max = ruleFreqRequest.max
+        val scale = ruleFreqRequest.scale
+        val reverse = ruleFreqRequest.reverse
+        val pretty = ruleFreqRequest.pretty
+        try {
+          // rules -> OdinsonQuery
+          val extractors = engines.compileGrammar(extractorEngine, grammar, None)
+
+          val ruleFreqs = countMentionsByRule(extractorEngine, extractors, allowTriggerOverlaps)
+            // filter the rules by name, if a filter was passed
+            // NB: this is Scala style anchored regex, *not* Lucene's RegExp
+            // TODO: unify regex style with that of termFreq's filter
+            .filter { case (ruleName, _) => isMatch(ruleName, filter) }
+            .toSeq
+
+          // order the resulting frequencies as requested
+          val ordered = order match {
+            // alphabetical
+            case Some("alpha") => ruleFreqs.sortBy { case (ruleName, _) => ruleName }
+            // frequency (default)
+            case _ => ruleFreqs.sortBy { case (ruleName, freq) => (-freq, ruleName) }
+          }
 
-        // Count instances of every rule
-        val countTotal = reversed.map(_._2).sum
+          // reverse if necessary
+          val reversed = reverse match {
+            case Some(true) => ordered.reverse
+            case _          => ordered
+          }
 
-        // cutoff the results to the requested ranks
-        val defaultMin = 0
-        val defaultMax = 9
-        val sliced =
-          reversed.slice(min.getOrElse(defaultMin), max.getOrElse(defaultMax) + 1).toIndexedSeq
-
-        // transform the frequencies as requested, preserving order
-        val scaled = scale match {
-          case Some("log10") => sliced map { case (rule, freq) => (rule, log10(freq)) }
-          case Some("percent") =>
-            sliced map { case (rule, freq) => (rule, freq.toDouble / countTotal) }
-          case _ => sliced.map { case (rule, freq) => (rule, freq.toDouble) }
-        }
+          // Count instances of every rule
+          val countTotal = reversed.map(_._2).sum
+
+          // cutoff the results to the requested ranks
+          val defaultMin = 0
+          val defaultMax = 9
+          val sliced =
+            reversed.slice(min.getOrElse(defaultMin), max.getOrElse(defaultMax) + 1).toIndexedSeq
+
+          // transform the frequencies as requested, preserving order
+          val scaled = scale match {
+            case Some("log10") => sliced map { case (rule, freq) => (rule, log10(freq)) }
+            case Some("percent") =>
+              sliced map { case (rule, freq) => (rule, freq.toDouble / countTotal) }
+            case _ => sliced.map { case (rule, freq) => (rule, freq.toDouble) }
+          }
 
-        // rearrange data into a Seq of Maps for Jsonization
-        val jsonObjs = scaled.map { case (ruleName, freq) =>
-          Json.obj("term" -> ruleName, "frequency" -> freq)
-        }
+          // rearrange data into a Seq of Maps for Jsonization
+          val jsonObjs = scaled.map { case (ruleName, freq) =>
+            Json.obj("term" -> ruleName, "frequency" -> freq)
+          }
 
-        Json.arr(jsonObjs).format(pretty)
-      } catch handleNonFatal
+          Json.arr(jsonObjs).format(pretty)
+        } catch handleNonFatal
+      }
     }
   }
 
@@ -496,8 +532,8 @@ class FrequencyController @Inject() (
     xLogScale: Option[Boolean],
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
-      ExtractorEngine.usingEngine(config) { extractorEngine =>
+    pools.jobs {
+      engines.read { extractorEngine =>
         // ensure that the requested field exists in the index
         val fields = extractorEngine.index.listFields()
 
@@ -536,44 +572,32 @@ class FrequencyController @Inject() (
     * @return
     *   A JSON array of each bin, defined by width, lower bound (inclusive), and frequency.
     */
-  def ruleHist() = Action { request =>
-    ExtractorEngine.usingEngine(config) { extractorEngine =>
-      val ruleHistRequest = request.body.asJson.get.as[RuleHistRequest]
-      val grammar = ruleHistRequest.grammar
-      val allowTriggerOverlaps = ruleHistRequest.allowTriggerOverlaps.getOrElse(false)
-      val bins = ruleHistRequest.bins
-      val equalProbability = ruleHistRequest.equalProbability
-      val xLogScale = ruleHistRequest.xLogScale
-      val pretty = ruleHistRequest.pretty
-      try {
-        // rules -> OdinsonQuery
-        val extractors = extractorEngine.ruleReader.compileRuleString(grammar)
-
-        val mentions: Seq[Mention] = {
-          val iterator = extractorEngine.extractMentions(
-            extractors,
-            numSentences = extractorEngine.numDocs(),
-            allowTriggerOverlaps = allowTriggerOverlaps,
-            disableMatchSelector = false
-          )
-          iterator.toVector
-        }
-
-        val frequencies = mentions
-          // rule name is all that matters
-          .map(_.foundBy)
-          // collect the instances of each rule's results
-          .groupBy(identity)
-          // filter the rules by name, if a filter was passed
-          // .filter{ case (ruleName, ms) => isMatch(ruleName, filter) }
-          // count how many matches for each rule
-          .map { case (k@_, v) => v.length.toDouble }
-          .toList
+  def ruleHist() = Action.async { request =>
+    pools.jobs {
+      engines.withState { extractorEngine =>
+        val ruleHistRequest = request.body.asJson.get.as[RuleHistRequest]
+        val grammar = ruleHistRequest.grammar
+        val allowTriggerOverlaps = ruleHistRequest.allowTriggerOverlaps.getOrElse(false)
+        val bins = ruleHistRequest.bins
+        val equalProbability = ruleHistRequest.equalProbability
+        val xLogScale = ruleHistRequest.xLogScale
+        val pretty = ruleHistRequest.pretty
+        try {
+          // rules -> OdinsonQuery
+          val extractors = engines.compileGrammar(extractorEngine, grammar, None)
+
+          val frequencies = countMentionsByRule(extractorEngine, extractors, allowTriggerOverlaps)
+            // filter the rules by name, if a filter was passed
+            // .filter{ case (ruleName, _) => isMatch(ruleName, filter) }
+            .values
+            .map(_.toDouble)
+            .toList
 
-        val jsonObjs = processCounts(frequencies, bins, equalProbability, xLogScale)
+          val jsonObjs = processCounts(frequencies, bins, equalProbability, xLogScale)
 
-        Json.arr(jsonObjs).format(pretty)
-      } catch handleNonFatal
+          Json.arr(jsonObjs).format(pretty)
+        } catch handleNonFatal
+      }
     }
   }
 
@@ -585,7 +609,7 @@ class FrequencyController @Inject() (
     */
   private def fieldVocabulary(field: String): List[String] = {
     // get terms from the requested field (error if it doesn't exist)
-    ExtractorEngine.usingEngine(config) { extractorEngine =>
+    engines.read { extractorEngine =>
       val fields = extractorEngine.index.listFields()
       val terms = TermsAndFreqs(fields.terms(field).iterator()).map(_.term).toList
 
@@ -599,15 +623,17 @@ class FrequencyController @Inject() (
     * @return
     *   A JSON array of the tags in use in this index.
     */
-  def tagsVocabulary(pretty: Option[Boolean]) = Action.async {
-    // get ready to fail if tags aren't reachable
-    try {
-      cache.getOrElseUpdate[JsValue]("vocabulary.tags", vocabularyExpiry) {
-        val tags = fieldVocabulary(posTagTokenField)
-        val json = Json.toJson(tags)
-        Future(json)
-      }.map { json => json.format(pretty) }
-    } catch handleNonFatalInFuture
+  def tagsVocabulary(pretty: Option[Boolean]) = Action.async { request =>
+    pools.search {
+      // get ready to fail if tags aren't reachable
+      try {
+        // computed once per generation of the index
+        val summary = engines.summary("vocabulary.tags") {
+          Json.toJson(fieldVocabulary(posTagTokenField))
+        }
+        summary.result(request, pretty)
+      } catch handleNonFatal
+    }
   }
 
 }
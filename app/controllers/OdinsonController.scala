@@ -12,21 +12,36 @@ import com.typesafe.config.{ Config, ConfigRenderOptions, ConfigValueFactory }
 import ai.lum.odinson.rest.BuildInfo
 import ai.lum.odinson.rest.requests._
 import ai.lum.odinson.rest.responses._
-import ai.lum.odinson.rest.utils.{ OdinsonConfigUtils }
+import ai.lum.odinson.rest.utils.{
+  OdinsonConfigUtils,
+  SentenceSidecar,
+  SharedEngine,
+  SpillFile,
+  WorkPool,
+  WorkPools
+}
+import akka.stream.ActorAttributes
+import akka.stream.scaladsl.{ Flow, Keep, Source, StreamConverters }
+import akka.util.ByteString
 //import org.apache.lucene.document.{ Document => LuceneDocument }
 import org.apache.lucene.store.FSDirectory
 //import play.api.Configuration
 import play.api.http.ContentTypes
 import play.api.libs.json._
+import play.api.libs.streams.Accumulator
 import play.api.mvc._
-import java.io.File
+import java.io.{ BufferedInputStream, BufferedReader, File, InputStream, InputStreamReader }
 import java.nio.file.Path
 //import java.nio.file.{ Files, Path }
 import java.nio.charset.StandardCharsets
+import java.util.concurrent.TimeUnit
+import java.util.zip.GZIPInputStream
 import javax.inject._
 import scala.collection.JavaConverters._
+import scala.concurrent.duration.FiniteDuration
 //import scala.concurrent.duration._
-import scala.concurrent.{ ExecutionContext, Future }
+import scala.concurrent.{ ExecutionContext, Future, Promise }
+import scala.util.control.NonFatal
 
 @Singleton
 class OdinsonController @Inject() (
@@ -47,8 +62,20 @@ class OdinsonController @Inject() (
   val pageSize             = config.apply[Int]   ("odinson.pageSize")
   val posTagTokenField     = config.apply[String]("odinson.index.posTagTokenField")
   val defaultMaxTokens     = config.apply[Int]("odinson.index.maxNumberOfTokensPerSentence")
+  val bulkCommitEvery      = config.apply[Int]("odinson.rest.bulk.commitEvery")
+  val bulkMaxBytes         = config.apply[Long]("odinson.rest.bulk.maxBytes")
+  val bulkReadTimeout      = FiniteDuration(config.getDuration("odinson.rest.bulk.readTimeout").toMillis, TimeUnit.MILLISECONDS)
+  val streamBatchSize      = config.apply[Int]("odinson.rest.stream.batchSize")
   // format: on
 
+  /** The engine shared by all requests against this index. */
+  val engines = SharedEngine.forConfig(config)
+
+  /** Thread pools for searches, index writes and long-running jobs. */
+  val pools = WorkPools.forConfig(config)
+
+  val NDJSON = "application/x-ndjson"
+
   /** Initializes index directory structure if the app is started with an empty index.
     */
   def initializeIndex(): Unit = {
@@ -67,7 +94,7 @@ class OdinsonController @Inject() (
     }
     // Files.setPosixFilePermissions(docsDir.toPath(), permissions)
     // Files.setPosixFilePermissions(indexDir.toPath(), permissions)
-    ExtractorEngine.usingEngine(config) { engine =>
+    engines.read { engine =>
       // initialize empty index
     }
   }
@@ -94,32 +121,36 @@ class OdinsonController @Inject() (
     * @return
     *   A status code indicating validity
     */
-  def validateOdinsonDocumentRelaxedMode(): Action[AnyContent] = Action { request =>
-    try {
-      val json = request.body.asJson.get
-      val _ = json match {
-        case jsObject: JsObject => validateOdinsonDocument(jsObject, false)
-        // case jsArray: JsArray
-        case _ => BadRequest("Malformed JSON.  Send a single OdinsonDocument.")
-      }
-      Status(OK)
-    } catch handleNonFatal
+  def validateOdinsonDocumentRelaxedMode(): Action[AnyContent] = Action.async { request =>
+    pools.search {
+      try {
+        val json = request.body.asJson.get
+        val _ = json match {
+          case jsObject: JsObject => validateOdinsonDocument(jsObject, false)
+          // case jsArray: JsArray
+          case _ => BadRequest("Malformed JSON.  Send a single OdinsonDocument.")
+        }
+        Status(OK)
+      } catch handleNonFatal
+    }
   }
 
   /** Returns 200 if the Json body can be turned into an Odinson Document.
     * @return
     *   A status code indicating validity
     */
-  def validateOdinsonDocumentStrictMode(): Action[AnyContent] = Action { request =>
-    try {
-      val json = request.body.asJson.get
-      val _ = json match {
-        case jsObject: JsObject => validateOdinsonDocument(jsObject, false)
-        // case jsArray: JsArray
-        case _ => BadRequest("Malformed JSON.  Send a single OdinsonDocument.")
-      }
-      Status(OK)
-    } catch handleNonFatal
+  def validateOdinsonDocumentStrictMode(): Action[AnyContent] = Action.async { request =>
+    pools.search {
+      try {
+        val json = request.body.asJson.get
+        val _ = json match {
+          case jsObject: JsObject => validateOdinsonDocument(jsObject, false)
+          // case jsArray: JsArray
+          case _ => BadRequest("Malformed JSON.  Send a single OdinsonDocument.")
+        }
+        Status(OK)
+      } catch handleNonFatal
+    }
   }
 
   // def indexOdinsonDoc(): Action[AnyContent] = Action { request =>
@@ -143,13 +174,14 @@ class OdinsonController @Inject() (
   // }
 
   def deleteOdinsonDoc(odinsonDocId: String) = Action.async {
-    Future {
+    pools.index {
       try {
         // this must be blocking
-        ExtractorEngine.usingEngine(config) { engine =>
+        engines.write { engine =>
           // Delete doc's JSON file
           val oldDocFile = engine.getDocJsonFile(odinsonDocId, config)
           oldDocFile.delete()
+          SentenceSidecar.delete(oldDocFile)
           // Delete doc from index
           engine.index.deleteOdinsonDoc(odinsonDocId)
           Ok
@@ -164,37 +196,138 @@ class OdinsonController @Inject() (
     }
   }
 
-  def updateOdinsonDoc(maxTokens: Int = -1): Action[AnyContent] = Action { request =>
+  /** Runs f (which modifies the index) with an engine allowing for maxTokens tokens per sentence.
+    */
+  def writeWithMaxTokens[T](maxTokens: Int)(f: ExtractorEngine => T): T = {
+    val maxTokensPerSentence: Int = maxTokens.max(defaultMaxTokens)
+    if (maxTokensPerSentence > defaultMaxTokens) {
+      val tempConfig = config.withValue(
+        "odinson.index.maxNumberOfTokensPerSentence",
+        ConfigValueFactory.fromAnyRef(maxTokensPerSentence)
+      )
+      engines.writeWith(tempConfig)(f)
+    } else {
+      // the shared engine's writer uses the default limit
+      engines.write(f)
+    }
+  }
+
+  /** Replaces any indexed version of the document (and its JSON file) with the provided one. */
+  def replaceOdinsonDoc(engine: ExtractorEngine, doc: OdinsonDocument): Unit = {
+    // Delete old JSON file (if exists)
     try {
-      request.body.asJson match {
-        case Some(json) =>
-          val doc = {
-            OdinsonDocument.fromJson(json.toString).addFileNameMetadata(config)
-          }
+      val oldDocFile = engine.getDocJsonFile(doc.id, config)
+      oldDocFile.delete()
+      SentenceSidecar.delete(oldDocFile)
+    } catch { case _: Throwable => { () } }
+    // Update index & write JSON file
+    engine.index.updateOdinsonDoc(doc)
+    doc.writeDoc(config)
+  }
 
-          val maxTokensPerSentence: Int = maxTokens.max(defaultMaxTokens)
-          val tempConfig = config.withValue(
-            "odinson.index.maxNumberOfTokensPerSentence",
-            ConfigValueFactory.fromAnyRef(maxTokensPerSentence)
-          )
-          println(s"maxTokensPerSentence: ${maxTokensPerSentence}")
-          ExtractorEngine.usingEngine(tempConfig) { engine =>
-            // Delete old JSON file (if exists)
-            try {
-              val oldDocFile = engine.getDocJsonFile(doc.id, tempConfig)
-              oldDocFile.delete()
-            } catch { case _: Throwable => { () } }
-            // Update index & write JSON file
-            engine.index.updateOdinsonDoc(doc)
-            doc.writeDoc(config)
-            Ok
-          }
-        // FIXME: better error
-        case None => Status(500)
-      }
-    } catch handleNonFatal
+  def updateOdinsonDoc(maxTokens: Int = -1): Action[AnyContent] = Action.async { request =>
+    pools.index {
+      try {
+        request.body.asJson match {
+          case Some(json) =>
+            val doc = {
+              OdinsonDocument.fromJson(json.toString).addFileNameMetadata(config)
+            }
+            writeWithMaxTokens(maxTokens) { engine =>
+              replaceOdinsonDoc(engine, doc)
+              Ok
+            }
+          // FIXME: better error
+          case None => Status(500)
+        }
+      } catch handleNonFatal
+    }
+  }
+
+  /** Hands the request body to the action as an InputStream while it is still being uploaded, so
+    * that a bulk request is processed as it arrives rather than buffered first.  Reading more than
+    * `odinson.rest.bulk.maxBytes`, or waiting longer than `odinson.rest.bulk.readTimeout` for the
+    * next chunk, fails the read with an IOException.
+    */
+  val streamedBody: BodyParser[InputStream] = BodyParser { _ =>
+    Accumulator(
+      Flow[ByteString]
+        .limitWeighted(bulkMaxBytes)(_.size.toLong)
+        .toMat(StreamConverters.asInputStream(bulkReadTimeout))(Keep.right)
+        .mapMaterializedValue { in =>
+          Future.successful(Right(in): Either[Result, InputStream])
+        }
+    )
+  }
+
+  /** Opens a (possibly gzipped) request body as lines of text. */
+  def bodyLines(body: InputStream): BufferedReader = {
+    val in = new BufferedInputStream(body)
+    // check for gzip's magic number
+    in.mark(2)
+    val gzipped = in.read() == 0x1f && in.read() == 0x8b
+    in.reset()
+    val decompressed = if (gzipped) new GZIPInputStream(in) else in
+    new BufferedReader(new InputStreamReader(decompressed, StandardCharsets.UTF_8))
   }
 
+  /** Indexes (or re-indexes) the OdinsonDocument on a line of a bulk request. */
+  def indexLine(engine: ExtractorEngine, line: String, lineNumber: Int): DocumentStatus = {
+    var id: Option[String] = None
+    try {
+      val doc = OdinsonDocument.fromJson(line).addFileNameMetadata(config)
+      id = Some(doc.id)
+      replaceOdinsonDoc(engine, doc)
+      DocumentStatus(line = lineNumber, id = id, indexed = true)
+    } catch {
+      case NonFatal(e) =>
+        DocumentStatus(line = lineNumber, id = id, indexed = false, error = Some(e.toString))
+    }
+  }
+
+  /** Indexes (or re-indexes) many OdinsonDocuments sent as NDJSON (one document per line,
+    * optionally gzipped).  The body is streamed: documents are indexed in batches of
+    * `odinson.rest.bulk.commitEvery` while the rest of the body is still being uploaded, and each
+    * batch is committed once it has been indexed.  If the upload fails (or exceeds
+    * `odinson.rest.bulk.maxBytes`), the request fails, but batches indexed before that point remain
+    * indexed.
+    * @return
+    *   The status of each document.
+    */
+  def updateOdinsonDocs(maxTokens: Int = -1): Action[InputStream] =
+    Action.async(streamedBody) { request =>
+      pools
+        .index {
+          try {
+            val reader = bodyLines(request.body)
+            try {
+              val lines = Iterator
+                .continually(reader.readLine())
+                .takeWhile(_ != null)
+                .zipWithIndex
+                .filter { case (line, _) => line.trim.nonEmpty }
+              val batches =
+                if (bulkCommitEvery > 0) lines.grouped(bulkCommitEvery) else Iterator(lines.toVector)
+              // each batch is read from the body before the index is taken, so no lock is held while
+              // waiting for the upload.  Each batch is committed once its write completes.
+              val statuses = batches.flatMap { batch =>
+                writeWithMaxTokens(maxTokens) { engine =>
+                  val batchStatuses = batch.map { case (line, i) => indexLine(engine, line, i + 1) }
+                  // NOTE: otherwise, the write commits the batch
+                  if (!engines.refreshAfterWrites) engine.index.refresh()
+                  batchStatuses
+                }
+              }.toVector
+              Json.toJson(BulkIndexResponse.fromStatuses(statuses)).format(None)
+            } finally {
+              reader.close()
+            }
+          } catch handleNonFatal
+        }
+        // the body is never read if the request is shed
+        .andThen { case _ => request.body.close() }
+    }
+
   def buildInfo(pretty: Option[Boolean]) = Action {
     Ok(BuildInfo.toJson.format(pretty)).as(ContentTypes.JSON)
   }
@@ -205,6 +338,16 @@ class OdinsonController @Inject() (
     json.format(pretty)
   }
 
+  /** Busy threads, queued requests and rejections of each thread pool. */
+  def poolStats(pretty: Option[Boolean]) = Action {
+    pools.stats.format(pretty)
+  }
+
+  /** Hit/miss counters for the caches of compiled patterns and grammars. */
+  def cacheStats(pretty: Option[Boolean]) = Action {
+    engines.compiled.stats.format(pretty)
+  }
+
   def healthcheck() = Action.async {
     Future {
       Ok(Json.toJson(200))
@@ -212,8 +355,8 @@ class OdinsonController @Inject() (
   }
   
   def numDocs = Action.async {
-    Future {
-      ExtractorEngine.usingEngine(config) { engine =>
+    pools.search {
+      engines.read { engine =>
         Ok(engine.numDocs.toString).as(ContentTypes.JSON)
       }
     }
@@ -222,38 +365,40 @@ class OdinsonController @Inject() (
   /** Information about the current corpus. <br> Directory name, num docs, num dependency types,
     * etc.
     */
-  def corpusInfo(pretty: Option[Boolean]) = Action.async {
-    Future {
-      ExtractorEngine.usingEngine(config) { engine =>
-        val numDocs = engine.numDocs()
-        val corpusDir = config.apply[File]("odinson.indexDir").getName
-        val depsVocabSize = {
-          loadVocabulary.terms.toSet.size
-        }
-        //val fields = engine.index.listFields()
-        //val fieldNames = fields.iterator.asScala.toList
-        val storedFields =
-          if (engine.numDocs < 1) {
-            Nil
-          } else {
-            val firstDoc = engine.doc(0)
-            firstDoc.iterator.asScala.map(_.name).toList
+  def corpusInfo(pretty: Option[Boolean]) = Action.async { request =>
+    pools.search {
+      val summary = engines.summary("corpus") {
+        engines.read { engine =>
+          val numDocs = engine.numDocs()
+          val corpusDir = config.apply[File]("odinson.indexDir").getName
+          val depsVocabSize = {
+            loadVocabulary.terms.toSet.size
           }
-        val tokenFields = engine.dataGatherer.storedFields
-        val allFields = engine.index.listFields()
-        val allFieldNames = allFields.iterator.asScala.toList
-        val docFields = allFieldNames diff tokenFields
-
-        val json = Json.obj(
-          "numDocs" -> numDocs,
-          "corpus" -> corpusDir,
-          "distinctDependencyRelations" -> depsVocabSize,
-          "tokenFields" -> tokenFields,
-          "docFields" -> docFields,
-          "storedFields" -> storedFields
-        )
-        json.format(pretty)
+          //val fields = engine.index.listFields()
+          //val fieldNames = fields.iterator.asScala.toList
+          val storedFields =
+            if (engine.numDocs < 1) {
+              Nil
+            } else {
+              val firstDoc = engine.doc(0)
+              firstDoc.iterator.asScala.map(_.name).toList
+            }
+          val tokenFields = engine.dataGatherer.storedFields
+          val allFields = engine.index.listFields()
+          val allFieldNames = allFields.iterator.asScala.toList
+          val docFields = allFieldNames diff tokenFields
+
+          Json.obj(
+            "numDocs" -> numDocs,
+            "corpus" -> corpusDir,
+            "distinctDependencyRelations" -> depsVocabSize,
+            "tokenFields" -> tokenFields,
+            "docFields" -> docFields,
+            "storedFields" -> storedFields
+          )
+        }
       }
+      summary.result(request, pretty)
     }
   }
 
@@ -265,21 +410,22 @@ class OdinsonController @Inject() (
 
   /** Retrieves vocabulary of dependencies for the current index.
     */
-  def dependenciesVocabulary(pretty: Option[Boolean]) = Action.async {
-    Future {
-      // NOTE: It's possible the vocabulary could change if the index is updated
-      val vocabulary = loadVocabulary
-      val vocab = vocabulary.terms.toList.sorted
-      val json = Json.toJson(vocab)
-      json.format(pretty)
+  def dependenciesVocabulary(pretty: Option[Boolean]) = Action.async { request =>
+    pools.search {
+      // NOTE: the vocabulary changes as the index is updated, so it is reloaded after each write
+      val summary = engines.summary("vocabulary.dependencies") {
+        val vocabulary = loadVocabulary
+        Json.toJson(vocabulary.terms.toList.sorted)
+      }
+      summary.result(request, pretty)
     }
   }
 
   /** Retrieves JSON for given Odinson Document ID.
     */
   def odinsonDocumentJsonForId(odinsonDocId: String, pretty: Option[Boolean]) = Action.async {
-    Future {
-      ExtractorEngine.usingEngine(config) { engine =>
+    pools.search {
+      engines.read { engine =>
         try {
           val doc = engine.odinsonDoc(odinsonDocId, config)
           val json: JsValue = Json.parse(doc.toJson)
@@ -299,9 +445,9 @@ class OdinsonController @Inject() (
   /** Retrieves JSON for given sentence ID. <br> Used to visualize parse and token attributes.
     */
   def sentenceJsonForSentId(sentenceId: Int, pretty: Option[Boolean]) = Action.async {
-    Future {
+    pools.search {
       try {
-        ExtractorEngine.usingEngine(config) { engine =>
+        engines.read { engine =>
           // ensure doc id is correct
           val json = engine.mkUnabridgedSentenceJson(sentenceId, config)
           json.format(pretty)
@@ -333,49 +479,53 @@ class OdinsonController @Inject() (
 
   /** Validates an Odinson rule.
     */
-  def validateOdinsonRule(): Action[AnyContent] = Action { request =>
-    try {
-      bodyToString(request.body) match {
-        case Some(rule) =>
-          ExtractorEngine.usingEngine(config) { engine =>
-            // validation here
-            // println(f"rule:\t${rule}")
-            engine.mkQuery(rule)
-          }
-        case None =>
-          BadRequest("Malformed body.  Send a single rule.")
+  def validateOdinsonRule(): Action[AnyContent] = Action.async { request =>
+    pools.search {
+      try {
+        bodyToString(request.body) match {
+          case Some(rule) =>
+            engines.read { engine =>
+              // validation here
+              // println(f"rule:\t${rule}")
+              engine.mkQuery(rule)
+            }
+          case None =>
+            BadRequest("Malformed body.  Send a single rule.")
+        }
+        Status(OK)
+      } catch {
+        case error: Throwable =>
+          Status(500)(
+            Json.toJson(OdinsonErrors.fromException(error))
+          )
       }
-      Status(OK)
-    } catch {
-      case error: Throwable =>
-        Status(500)(
-          Json.toJson(OdinsonErrors.fromException(error))
-        )
     }
   }
 
   /** Validates an Odinson grammar.
     */
-  def validateOdinsonGrammar(): Action[AnyContent] = Action { request =>
-    try {
-      bodyToString(request.body) match {
-        case Some(grammar) =>
-          ExtractorEngine.usingEngine(config) { engine =>
-            // validation here
-            val _ = engine.compileRuleString(rules = grammar)
-            // println(f"grammar:")
-            // res.foreach(ex => println(f"   extractor => ${ex}"))
-            // println()
-          }
-        case None =>
-          BadRequest("Malformed body.  Send a single grammar (YAML).")
+  def validateOdinsonGrammar(): Action[AnyContent] = Action.async { request =>
+    pools.search {
+      try {
+        bodyToString(request.body) match {
+          case Some(grammar) =>
+            engines.read { engine =>
+              // validation here
+              val _ = engine.compileRuleString(rules = grammar)
+              // println(f"grammar:")
+              // res.foreach(ex => println(f"   extractor => ${ex}"))
+              // println()
+            }
+          case None =>
+            BadRequest("Malformed body.  Send a single grammar (YAML).")
+        }
+        Status(OK)
+      } catch {
+        case error: Throwable =>
+          Status(500)(
+            Json.toJson(OdinsonErrors.fromException(error))
+          )
       }
-      Status(OK)
-    } catch {
-      case error: Throwable =>
-        Status(500)(
-          Json.toJson(OdinsonErrors.fromException(error))
-        )
     }
   }
 
@@ -396,14 +546,8 @@ class OdinsonController @Inject() (
     metadataQuery: Option[String],
     label: String = "Mention"
   ): Unit = {
-    metadataQuery match {
-      case None =>
-        val q = engine.compiler.mkQuery(odinsonQuery)
-        engine.query(q)
-      case Some(filter) =>
-        val q = engine.compiler.mkQuery(odinsonQuery, filter)
-        engine.query(q)
-    }
+    val q = engines.mkQuery(engine, odinsonQuery, metadataQuery)
+    engine.query(q)
   }
 
   /** Queries the index.
@@ -451,70 +595,134 @@ class OdinsonController @Inject() (
     metadataQuery: Option[String] = None,
     label: Option[String] = None,
     pretty: Option[Boolean] = None
-  ): Action[String] = Action(parse.text) { (request: Request[String]) =>
-    try {
-      request.body match {
-        case grammar: String =>
-          // validation here
-          // FIXME: do this in a non-blocking way
-          val engine = ExtractorEngine.fromConfig(config)
-          //ExtractorEngine.usingEngine(config) { engine =>
-            val allowOverlaps: Boolean = allowTriggerOverlaps.getOrElse(false)
-            try {
-              // rules -> OdinsonQuery
-              val extractors = metadataQuery match {
-                case None => engine.ruleReader.compileRuleString(grammar)
-                case Some(raw) => 
-                  val mq = engine.compiler.mkParentQuery(raw)
-                  engine.compileRuleString(rules=grammar, metadataFilter=mq)
-              }
+  ): Action[String] = Action.async(parse.text) { (request: Request[String]) =>
+    pools.jobs {
+      try {
+        request.body match {
+          case grammar: String =>
+            // validation here
+            // FIXME: do this in a non-blocking way
+            // grammars are applied using (and then discard) the engine's state
+            engines.withState { engine =>
+              val allowOverlaps: Boolean = allowTriggerOverlaps.getOrElse(false)
+              try {
+                // rules -> OdinsonQuery
+                val extractors = engines.compileGrammar(engine, grammar, metadataQuery)
 
-              val start = System.currentTimeMillis()
+                val start = System.currentTimeMillis()
 
-              val maxSentences: Int = maxDocs match {
-                case Some(md) => md
-                case None     => engine.numDocs()
-              }
+                val maxSentences: Int = maxDocs match {
+                  case Some(md) => md
+                  case None     => engine.numDocs()
+                }
 
-              val mentions: Seq[Mention] = {
                 // FIXME: should deal in iterators to better support pagination...?
                 //println(s"Using state ${engine.state}")
-                val iterator = engine.extractMentions(
+                val mentions: Iterator[Mention] = engine.extractMentions(
                   extractors,
                   numSentences = maxSentences,
                   allowTriggerOverlaps = allowOverlaps,
                   disableMatchSelector = false
                 )
-                iterator.toVector
-              }
 
-              val filteredMentions = label match {
-                case Some(lbl) => mentions.filter(_.label == Some(lbl))
-                case None => mentions
+                val filteredMentions = label match {
+                  case Some(lbl) => mentions.filter(_.label == Some(lbl))
+                  case None => mentions
+                }
+
+                // encode mentions as they are found (rather than collecting every Mention first)
+                val mentionsJson = engine.mkJsonForMentions(filteredMentions)
+                val duration = (System.currentTimeMillis() - start) / 1000f // duration in seconds
+                val json =
+                  Json.toJson(engine.mkMentionsJson(None, duration, allowOverlaps, mentionsJson))
+                // println(s"${engine.state.getAllMentions().toSeq.size} mentions in state")
+                // engine.state.getAllMentions().foreach{ m => DisplayUtils.displayMention(m, engine)}
+                json.format(pretty)
+              } catch {
+                case e: Throwable => 
+                  handleNonFatal(e)
               }
+            }
+          case _ =>
+            BadRequest("Malformed body.  Send grammar.")
+        }
+      } catch {
+        case error: Throwable =>
+          Status(500)(
+            Json.toJson(OdinsonErrors.fromException(error))
+          )
+      }
+    }
+  }
 
-              val duration = (System.currentTimeMillis() - start) / 1000f // duration in seconds
-              val json =
-                Json.toJson(engine.mkMentionsJson(None, duration, allowOverlaps, filteredMentions))
-              // println(s"${engine.state.getAllMentions().toSeq.size} mentions in state")
-              // engine.state.getAllMentions().foreach{ m => DisplayUtils.displayMention(m, engine)}
-              json.format(pretty)
+  /** Streams the mentions found by the provided Odinson grammar as NDJSON (one mention per line).
+    * Mentions are written as they are extracted, so neither the server nor the client need to
+    * hold every mention in memory, regardless of the size of the corpus.  Mentions the client has
+    * not read yet wait in a temporary file, so a slow client doesn't keep the engine's state.
+    *
+    * @param maxDocs
+    *   The maximum number of sentences to execute the rules against (default: every sentence).
+    * @param allowTriggerOverlaps
+    *   Whether or not event arguments are permitted to overlap with the event's trigger.
+    * @param metadataQuery
+    *   A Lucene query to filter documents (optional).
+    * @param label
+    *   Only stream mentions with this label (optional).
+    * @return
+    *   chunked NDJSON of mentions
+    */
+  def streamGrammar(
+    maxDocs: Option[Int] = None,
+    allowTriggerOverlaps: Option[Boolean] = None,
+    metadataQuery: Option[String] = None,
+    label: Option[String] = None
+  ): Action[String] = Action.async(parse.text) { (request: Request[String]) =>
+    // Odinson can't resume an extraction, so the engine (and its state) is leased for the whole
+    // grammar.  The mentions are spilled to a temporary file as they are extracted and streamed
+    // from there, so the lease ends with the extraction rather than with a slow client.
+    val response = Promise[Result]()
+    try {
+      pools.jobs
+        .submit {
+          val lease = engines.leaseState()
+          try {
+            val engine = lease.engine
+            val extractors = engines.compileGrammar(engine, request.body, metadataQuery)
+            val mentions: Iterator[Mention] = engine.extractMentions(
+              extractors,
+              numSentences = maxDocs.getOrElse(engine.numDocs()),
+              allowTriggerOverlaps = allowTriggerOverlaps.getOrElse(false),
+              disableMatchSelector = false
+            )
+            val filteredMentions = label match {
+              case Some(lbl) => mentions.filter(_.label == Some(lbl))
+              case None      => mentions
+            }
+            val spill = new SpillFile("odinson-grammar-")
+            // reading the spill file blocks, so keep it off Play's default dispatcher
+            val source = spill.source.withAttributes(ActorAttributes.IODispatcher)
+            response.success(Ok.chunked(source).as(NDJSON))
+            try {
+              // stop extracting once the client disconnects
+              filteredMentions.takeWhile(_ => !spill.isCancelled).foreach { mention =>
+                spill.write(ByteString(Json.stringify(engine.mkJsonForMention(mention)) + "\n"))
+              }
+              spill.finish()
             } catch {
-              case e: Throwable => 
-                handleNonFatal(e)
-            } finally {
-            engine.close()
+              case NonFatal(e) => spill.fail(e)
+            }
+          } catch {
+            case NonFatal(e) => response.trySuccess(describeNonFatal(e))
+          } finally {
+            lease.close()
           }
-        //  }
-        case _ =>
-          BadRequest("Malformed body.  Send grammar.")
-      }
+        }
+        .failed
+        .foreach(response.tryFailure)
     } catch {
-      case error: Throwable =>
-        Status(500)(
-          Json.toJson(OdinsonErrors.fromException(error))
-        )
+      case e: WorkPool.Rejected => response.success(e.result)
     }
+    response.future
   }
 
   /** Executes the provided Odinson pattern.
@@ -543,16 +751,11 @@ class OdinsonController @Inject() (
     enriched: Boolean,
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
+    pools.search {
       // FIXME: do this in a non-blocking way
-      ExtractorEngine.usingEngine(config) { engine =>
+      engines.read { engine =>
         try {
-          val oq = metadataQuery match {
-            case Some(pq) =>
-              engine.compiler.mkQuery(odinsonQuery, pq)
-            case None =>
-              engine.compiler.mkQuery(odinsonQuery)
-          }
+          val oq = engines.mkQuery(engine, odinsonQuery, metadataQuery)
           val start = System.currentTimeMillis()
           val results: OdinResults = retrieveResults(engine, oq, prevDoc, prevScore)
           val duration = (System.currentTimeMillis() - start) / 1000f // duration in seconds
@@ -582,54 +785,129 @@ class OdinsonController @Inject() (
     }
   }
 
-  /** Applies a disjunction of the provided patterns against the corpus.
+  /** Iterates over every hit of a pattern (after the optional cursor), searching in batches of
+    * batchSize hits.  Each batch takes its own lease on the engine and is converted with f before
+    * the lease is released, so no lease is held between batches (ex. while a client reads them).
+    * Like paging with prevDoc, each batch sees the index as of when it is searched.
+    * NOTE: the first batch is searched right away.
+    */
+  def allScoreDocs[T](
+    odinsonQuery: String,
+    metadataQuery: Option[String],
+    prevDoc: Option[Int],
+    prevScore: Option[Float],
+    batchSize: Int
+  )(f: (ExtractorEngine, OdinsonScoreDoc) => T): Iterator[T] = {
+    // (the last hit of the batch, the converted hits)
+    def search(after: Option[OdinsonScoreDoc]): (Option[OdinsonScoreDoc], Vector[T]) =
+      engines.read { engine =>
+        // cached unless the index changed since the previous batch
+        val oq = engines.mkQuery(engine, odinsonQuery, metadataQuery)
+        val results = after match {
+          case Some(prev) => engine.query(oq, batchSize, prev)
+          case None       => engine.query(oq, batchSize)
+        }
+        (results.scoreDocs.lastOption, results.scoreDocs.toVector.map(sd => f(engine, sd)))
+      }
+    val start = (prevDoc, prevScore) match {
+      case (Some(doc), Some(score)) => Some(new OdinsonScoreDoc(doc, score))
+      case _                        => None
+    }
+    Iterator
+      .iterate(search(start)) { case (last, _) => search(last) }
+      .takeWhile { case (_, hits) => hits.nonEmpty }
+      .flatMap { case (_, hits) => hits }
+  }
+
+  /** Streams every hit of the provided Odinson pattern as NDJSON (one ScoreDoc per line).
+    * Hits are searched in batches of `odinson.rest.stream.batchSize` (reusing the compiled pattern)
+    * and written as they are found, so exporting all matches takes a single request instead of one
+    * per page.  The engine is only held while a batch is searched, not while the client reads it.
+    * @param odinsonQuery
+    *   An Odinson pattern
+    * @param metadataQuery
+    *   A Lucene query to filter documents (optional).
+    * @param prevDoc
+    *   The last Document ID seen before the stream should start (optional).
+    * @param prevScore
+    *   The score of that Document (optional).
     * @return
-    *   JSON of matches
+    *   chunked NDJSON of ScoreDocs
     */
-  def runDisjunctiveQuery() = Action { request =>
-    // FIXME: do this in a non-blocking way
-    ExtractorEngine.usingEngine(config) { engine =>
-      // FIXME: replace .get with validation check
-      val spr = request.body.asJson.get.as[SimplePatternsRequest]
+  def streamQuery(
+    odinsonQuery: String,
+    metadataQuery: Option[String],
+    prevDoc: Option[Int],
+    prevScore: Option[Float],
+    enriched: Boolean
+  ) = Action.async {
+    pools.search {
       try {
-        val patterns: List[OdinsonQuery] = spr.patterns.map(engine.compiler.mkQuery).toList
-        val disjunctiveQuery = new OdinOrQuery(patterns, field = patterns.head.getField)
-        val oq = spr.metadataQuery match {
-          case Some(pq) =>
-            engine.compiler.mkQuery(disjunctiveQuery, pq)
-          case None =>
-            disjunctiveQuery
+        // the first batch is searched (and the pattern compiled) here, so errors get a proper response
+        val lines = allScoreDocs(odinsonQuery, metadataQuery, prevDoc, prevScore, streamBatchSize) {
+          (engine, sd) =>
+            ByteString(Json.stringify(engine.mkJsonForScoreDoc(sd, enriched, config)) + "\n")
         }
-        val start = System.currentTimeMillis()
-        val results: OdinResults = retrieveResults(engine, oq, spr.prevDoc, spr.prevScore)
-        val duration = (System.currentTimeMillis() - start) / 1000f // duration in seconds
-
-        // NOTE: no use of state here
-
-        val json = Json.toJson(engine.mkJson(
-          spr.patterns.map{ patt => s"(${patt})"}.mkString(" | "),
-          spr.metadataQuery,
-          duration,
-          results,
-          spr.enriched.getOrElse(false),
-          config
-        ))
-        json.format(spr.pretty)
+        val source = Source
+          .fromIterator(() => lines)
+          // later batches block, so keep them off Play's default dispatcher
+          .withAttributes(ActorAttributes.IODispatcher)
+        Ok.chunked(source).as(NDJSON)
       } catch handleNonFatal
     }
   }
 
+  /** Applies a disjunction of the provided patterns against the corpus.
+    * @return
+    *   JSON of matches
+    */
+  def runDisjunctiveQuery() = Action.async { request =>
+    pools.search {
+      // FIXME: do this in a non-blocking way
+      engines.read { engine =>
+        // FIXME: replace .get with validation check
+        val spr = request.body.asJson.get.as[SimplePatternsRequest]
+        try {
+          val patterns: List[OdinsonQuery] =
+            spr.patterns.map { p => engines.mkQuery(engine, p, None) }.toList
+          val disjunctiveQuery = new OdinOrQuery(patterns, field = patterns.head.getField)
+          val oq = spr.metadataQuery match {
+            case Some(pq) =>
+              engine.compiler.mkQuery(disjunctiveQuery, pq)
+            case None =>
+              disjunctiveQuery
+          }
+          val start = System.currentTimeMillis()
+          val results: OdinResults = retrieveResults(engine, oq, spr.prevDoc, spr.prevScore)
+          val duration = (System.currentTimeMillis() - start) / 1000f // duration in seconds
+
+          // NOTE: no use of state here
+
+          val json = Json.toJson(engine.mkJson(
+            spr.patterns.map{ patt => s"(${patt})"}.mkString(" | "),
+            spr.metadataQuery,
+            duration,
+            results,
+            spr.enriched.getOrElse(false),
+            config
+          ))
+          json.format(spr.pretty)
+        } catch handleNonFatal
+      }
+    }
+  }
+
   def getMetadataJsonByDocumentId(
     odinsonDocId: String,
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
+    pools.search {
       // FIXME: do this in a non-blocking way
-      ExtractorEngine.usingEngine(config) { engine =>
+      engines.read { engine =>
         try {
           val doc: OdinsonDocument =
             engine.odinsonDoc(odinsonDocId, config)
-          val json: JsValue = Json.parse(doc.toJson)("metadata")
+          val json: JsValue = metadataJson(doc)
           json.format(pretty)
         } catch {
           case _: NullPointerException =>
@@ -647,15 +925,14 @@ class OdinsonController @Inject() (
     sentenceId: Int,
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
+    pools.search {
       // FIXME: do this in a non-blocking way
-      //ExtractorEngine.usingEngine(config) { engine =>
-      val engine = ExtractorEngine.fromConfig(config)
+      engines.read { engine =>
         try {
           val odinsonDocId = engine.getOdinsonDocId(sentenceId)
           val doc: OdinsonDocument =
             engine.odinsonDoc(odinsonDocId, config)
-          val json: JsValue = Json.parse(doc.toJson)("metadata")
+          val json: JsValue = metadataJson(doc)
           json.format(pretty)
         } catch {
           case _: NullPointerException =>
@@ -664,10 +941,8 @@ class OdinsonController @Inject() (
             )
           case _: Throwable =>
             BadRequest(s"sentenceId '${sentenceId}' not found")
-        } finally {
-          engine.close()
         }
-      //}
+      }
     }
   }
 
@@ -675,9 +950,9 @@ class OdinsonController @Inject() (
     sentenceId: Int,
     pretty: Option[Boolean]
   ) = Action.async {
-    Future {
+    pools.search {
       // FIXME: do this in a non-blocking way
-      ExtractorEngine.usingEngine(config) { engine =>
+      engines.read { engine =>
         try {
           val odinsonDocId = engine.getOdinsonDocId(sentenceId)
           val doc: OdinsonDocument =
@@ -696,4 +971,141 @@ class OdinsonController @Inject() (
     }
   }
 
+
+  /** JSON of each document (or None if the document can't be found).  Each document is read once. */
+  def docsJson(engine: ExtractorEngine, odinsonDocIds: Seq[String]): Map[String, JsValue] =
+    odinsonDocIds.distinct.flatMap { odinsonDocId =>
+      try {
+        Some(odinsonDocId -> Json.parse(engine.odinsonDoc(odinsonDocId, config).toJson))
+      } catch {
+        case NonFatal(_) => None
+      }
+    }.toMap
+
+  /** JSON of a document's metadata.  Only the metadata is serialized (not the sentences). */
+  def metadataJson(doc: OdinsonDocument): JsValue =
+    Json.parse(doc.copy(sentences = Nil).toJson)("metadata")
+
+  /** JSON of the metadata of each document that can be found. */
+  def docsMetadataJson(engine: ExtractorEngine, odinsonDocIds: Seq[String]): Map[String, JsValue] =
+    odinsonDocIds.distinct.flatMap { odinsonDocId =>
+      try {
+        Some(odinsonDocId -> metadataJson(engine.odinsonDoc(odinsonDocId, config)))
+      } catch {
+        case NonFatal(_) => None
+      }
+    }.toMap
+
+  /** Parent document ID of each sentence that can be found. */
+  def parentDocIds(engine: ExtractorEngine, sentenceIds: Seq[Int]): Map[Int, String] =
+    sentenceIds.distinct.flatMap { sentenceId =>
+      try {
+        Some(sentenceId -> engine.getOdinsonDocId(sentenceId))
+      } catch {
+        case NonFatal(_) => None
+      }
+    }.toMap
+
+  /** JSON of each sentence (or None if the sentence can't be found).  Sentences are grouped by
+    * parent document, so that each document is read once.
+    */
+  def sentencesJson(engine: ExtractorEngine, sentenceIds: Seq[Int]): Seq[Option[JsValue]] = {
+    val found: Map[Int, JsValue] = parentDocIds(engine, sentenceIds).toSeq
+      .groupBy(_._2)
+      .flatMap { case (odinsonDocId, sentences) =>
+        val ids = sentences.map(_._1)
+        try {
+          val jsons = engine.getSentenceJsons(
+            odinsonDocId,
+            ids.map(id => engine.getSentenceIndex(id)),
+            config
+          )
+          ids.zip(jsons.map(json => Json.parse(json)))
+        } catch {
+          case NonFatal(_) => Nil
+        }
+      }
+    sentenceIds.map(found.get)
+  }
+
+  /** Responds with one JSON value per requested ID (null for any ID that can't be found). */
+  def jsonForIds(values: Seq[Option[JsValue]], pretty: Option[Boolean]): Result =
+    JsArray(values.map(_.getOrElse(JsNull))).format(pretty)
+
+  /** Retrieves JSON for many sentence IDs (in the order requested).
+    */
+  def sentencesJsonForSentIds() = Action.async { request =>
+    pools.search {
+      try {
+        // FIXME: replace .get with validation check
+        val req = request.body.asJson.get.as[SentenceIdsRequest]
+        engines.read { engine =>
+          jsonForIds(sentencesJson(engine, req.sentenceIds), req.pretty)
+        }
+      } catch handleNonFatal
+    }
+  }
+
+  /** Retrieves JSON for many Odinson Document IDs (in the order requested).
+    */
+  def odinsonDocumentsJsonForIds() = Action.async { request =>
+    pools.search {
+      try {
+        // FIXME: replace .get with validation check
+        val req = request.body.asJson.get.as[DocumentIdsRequest]
+        engines.read { engine =>
+          val docs = docsJson(engine, req.documentIds)
+          jsonForIds(req.documentIds.map(docs.get), req.pretty)
+        }
+      } catch handleNonFatal
+    }
+  }
+
+  /** Retrieves the parent document JSON of many sentence IDs (in the order requested).
+    */
+  def getParentDocsJsonBySentenceIds() = Action.async { request =>
+    pools.search {
+      try {
+        // FIXME: replace .get with validation check
+        val req = request.body.asJson.get.as[SentenceIdsRequest]
+        engines.read { engine =>
+          val docIds = parentDocIds(engine, req.sentenceIds)
+          val docs = docsJson(engine, docIds.values.toSeq)
+          jsonForIds(req.sentenceIds.map(id => docIds.get(id).flatMap(docs.get)), req.pretty)
+        }
+      } catch handleNonFatal
+    }
+  }
+
+  /** Retrieves the metadata of many Odinson Document IDs (in the order requested).
+    */
+  def getMetadataJsonByDocumentIds() = Action.async { request =>
+    pools.search {
+      try {
+        // FIXME: replace .get with validation check
+        val req = request.body.asJson.get.as[DocumentIdsRequest]
+        engines.read { engine =>
+          val metadata = docsMetadataJson(engine, req.documentIds)
+          jsonForIds(req.documentIds.map(metadata.get), req.pretty)
+        }
+      } catch handleNonFatal
+    }
+  }
+
+  /** Retrieves the metadata of the parent documents of many sentence IDs (in the order requested).
+    */
+  def getMetadataJsonBySentenceIds() = Action.async { request =>
+    pools.search {
+      try {
+        // FIXME: replace .get with validation check
+        val req = request.body.asJson.get.as[SentenceIdsRequest]
+        engines.read { engine =>
+          val docIds = parentDocIds(engine, req.sentenceIds)
+          val metadata = docsMetadataJson(engine, docIds.values.toSeq)
+          jsonForIds(req.sentenceIds.map(id => docIds.get(id).flatMap(metadata.get)), req.pretty)
+        }
+      } catch handleNonFatal
+    }
+  }
+
 }
@@ -0,0 +1,64 @@
+"""Time and peak memory of building a large synthetic Document,
+before (eagerly materializing tokens and token attribute views) and after (lazy views).
+
+Usage:
+    python benchmarks/doc_construction.py [num_sentences] [num_tokens]
+"""
+
+from lum.odinson.doc import Document
+import sys
+import time
+import tracemalloc
+
+ATTRIBUTES = ["raw", "word", "norm", "lemma", "tag", "chunk", "entity"]
+
+
+def mk_doc_json(num_sentences: int, num_tokens: int) -> dict:
+    def mk_sentence(i: int) -> dict:
+        fields = [
+            {
+                "$type": "ai.lum.odinson.TokensField",
+                "name": name,
+                "tokens": [f"{name}-{i}-{j}" for j in range(num_tokens)],
+            }
+            for name in ATTRIBUTES
+        ]
+        return {"numTokens": num_tokens, "fields": fields}
+
+    return {
+        "id": "synthetic",
+        "metadata": [],
+        "sentences": [mk_sentence(i) for i in range(num_sentences)],
+    }
+
+
+def measure(name: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} time={elapsed * 1000:.1f}ms  peak={peak / 2**20:.1f}MiB")
+
+
+def eager(data: dict) -> Document:
+    doc = Document.model_validate(data)
+    # what construction used to do
+    doc.tokens
+    for name in ATTRIBUTES:
+        getattr(doc, name)
+    return doc
+
+
+def lazy(data: dict) -> Document:
+    return Document.model_validate(data)
+
+
+if __name__ == "__main__":
+    num_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    data = mk_doc_json(num_sentences, num_tokens)
+    print(f"{num_sentences} sentences x {num_tokens} tokens")
+    measure("before", lambda: eager(data))
+    measure("after", lambda: lazy(data))
@@ -0,0 +1,83 @@
+"""Latency of /api/healthcheck and /api/numdocs while long grammars run against a running server.
+
+Grammars, searches and index writes run on separate thread pools (see `odinson.rest.pools`), so
+cheap calls should stay fast while every `jobs` thread is busy, and grammars beyond the `jobs`
+queue should be rejected right away with 503 (Service Unavailable) rather than piling up.
+Compare a build that runs every request on Play's default dispatcher (before) with one that uses
+the pools (after), over an index large enough for the grammar to take a few seconds:
+
+    docker run -p 9000:9000 -v "$DATA:/app/data" lumai/odinson-rest
+    PYTHONPATH=. python benchmarks/healthcheck_under_load.py http://localhost:9000
+
+Usage:
+    python benchmarks/healthcheck_under_load.py <address> [num_grammars] [num_calls]
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from lum.odinson.rest.api import OdinsonBaseAPI
+import statistics
+import sys
+import threading
+import time
+
+GRAMMAR = """
+rules:
+  - name: noun-pairs
+    type: basic
+    label: NounPair
+    pattern: |
+      [tag=/N.*/] []* [tag=/N.*/]
+"""
+
+
+def report(name: str, latencies) -> None:
+    ms = sorted(l * 1000 for l in latencies)
+    p99 = ms[int(0.99 * (len(ms) - 1))]
+    print(
+        f"{name:<18} mean={statistics.mean(ms):.2f}ms  p50={statistics.median(ms):.2f}ms  "
+        f"p99={p99:.2f}ms  max={ms[-1]:.2f}ms"
+    )
+
+
+def cheap_calls(address: str, endpoint: str, n: int, done: threading.Event):
+    api = OdinsonBaseAPI(address)
+    latencies: List[float] = []
+    while len(latencies) < n and not done.is_set():
+        start = time.perf_counter()
+        api.transport.get(f"{address}{endpoint}").raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    api.close()
+    return latencies
+
+
+def grammar(address: str) -> int:
+    api = OdinsonBaseAPI(address)
+    try:
+        res = api.transport.post(
+            f"{address}/api/execute/grammar",
+            data=GRAMMAR,
+            headers={"Content-type": "text/plain"},
+        )
+        return res.status_code
+    finally:
+        api.close()
+
+
+if __name__ == "__main__":
+    address = sys.argv[1]
+    num_grammars = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    done = threading.Event()
+    report("idle healthcheck", cheap_calls(address, "/api/healthcheck", n, done))
+    with ThreadPoolExecutor(max_workers=num_grammars + 2) as pool:
+        grammars = [pool.submit(grammar, address) for _ in range(num_grammars)]
+        # give the grammars a head start
+        time.sleep(0.5)
+        health = pool.submit(cheap_calls, address, "/api/healthcheck", n, done)
+        numdocs = pool.submit(cheap_calls, address, "/api/numdocs", n, done)
+        report("/api/healthcheck", health.result())
+        report("/api/numdocs", numdocs.result())
+        statuses = Counter(g.result() for g in grammars)
+    print(f"/api/execute/grammar statuses: {dict(statuses)}")
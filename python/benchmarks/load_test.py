@@ -0,0 +1,60 @@
+"""Latency of /api/execute/pattern and /api/numdocs under concurrent load against a running server.
+
+Compare per-request engines (before) with the shared engine (after) by starting the server with
+ODINSON_SHARED_ENGINE=false and then with the default configuration:
+
+    docker run -p 9000:9000 -v "$DATA:/app/data" -e ODINSON_SHARED_ENGINE=false lumai/odinson-rest
+    PYTHONPATH=. python benchmarks/load_test.py http://localhost:9000
+
+Usage:
+    python benchmarks/load_test.py <address> [num_calls] [concurrency] [pattern]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from lum.odinson.rest.api import OdinsonBaseAPI
+import statistics
+import sys
+import time
+
+
+def timed(fn, n: int, concurrency: int):
+    def worker(calls: int):
+        # one connection pool per client
+        api = OdinsonBaseAPI(address)
+        latencies = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            fn(api)
+            latencies.append(time.perf_counter() - start)
+        api.close()
+        return latencies
+
+    per_worker = [n // concurrency] * concurrency
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, per_worker))
+    elapsed = time.perf_counter() - start
+    return [l for latencies in results for l in latencies], elapsed
+
+
+def report(name: str, latencies, elapsed: float) -> None:
+    ms = sorted(l * 1000 for l in latencies)
+    p99 = ms[int(0.99 * (len(ms) - 1))]
+    print(
+        f"{name:<22} mean={statistics.mean(ms):.2f}ms  p50={statistics.median(ms):.2f}ms  "
+        f"p99={p99:.2f}ms  ({len(ms) / elapsed:.1f} req/s)"
+    )
+
+
+if __name__ == "__main__":
+    address = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    pattern = sys.argv[4] if len(sys.argv) > 4 else "[tag=/N.*/]"
+    # warm up
+    timed(lambda api: api.numdocs, concurrency, concurrency)
+    report("/api/numdocs", *timed(lambda api: api.numdocs, n, concurrency))
+    report(
+        "/api/execute/pattern",
+        *timed(lambda api: api._search(pattern, raw=True), n, concurrency),
+    )
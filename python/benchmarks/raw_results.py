@@ -0,0 +1,59 @@
+"""Decode time for a large page of search hits with event matches,
+validated (Results) vs. raw (plain dicts).
+
+Usage:
+    python benchmarks/raw_results.py [num_hits]
+"""
+
+from lum.odinson.rest.responses import Results
+from lum.odinson.rest.serialization import decode, loads
+import json
+import statistics
+import sys
+import time
+
+
+def mk_results(num_hits: int) -> bytes:
+    def mk_score_doc(i: int) -> dict:
+        arg = {"start": 3, "end": 5, "text": "some argument"}
+        event = {
+            "start": 1,
+            "end": 5,
+            "text": "some event text",
+            "trigger": {"start": 1, "end": 2, "text": "trigger"},
+            "namedCaptures": [{"name": "theme", "label": "Thing", "match": arg}],
+        }
+        return {
+            "sentenceId": i,
+            "score": 1.0,
+            "documentId": f"doc-{i // 10}",
+            "sentenceIndex": i % 10,
+            "words": [f"word-{j}" for j in range(30)],
+            "matches": [event, {"start": 0, "end": 1, "text": "word-0"}],
+        }
+
+    data = {
+        "odinsonQuery": "[lemma=trigger] >nsubj []",
+        "duration": 1.0,
+        "totalHits": num_hits,
+        "scoreDocs": [mk_score_doc(i) for i in range(num_hits)],
+    }
+    return json.dumps(data).encode("utf-8")
+
+
+def timed(fn, n: int = 5) -> float:
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+if __name__ == "__main__":
+    num_hits = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    data = mk_results(num_hits)
+    print(f"{num_hits} hits ({len(data) / 2**20:.1f}MiB)")
+    validated = timed(lambda: decode(Results, data))
+    raw = timed(lambda: loads(data))
+    print(f"validated={validated:.1f}ms  raw={raw:.1f}ms  ({validated / raw:.1f}x)")
@@ -0,0 +1,130 @@
+"""Peak memory of the server during /api/rule-freq, /api/rule-hist and /api/execute/grammar
+over a large synthetic index.
+
+Every token of the synthetic corpus is a noun, so the grammar's rules find (many times) more
+mentions than there are sentences.  Memory is sampled with `docker stats` while each call runs.
+Compare a build that collects every Mention (before) with one that counts mentions as they are
+found (after), using a heap small enough to make the difference visible.  The memory sampled
+once each call returns shows what the shared engine kept (ex. mentions left in its state):
+
+    docker run --name odinson -p 9000:9000 -e JAVA_OPTS=-Xmx1g lumai/odinson-rest
+    PYTHONPATH=. python benchmarks/rule_freq_heap.py http://localhost:9000 odinson
+
+Usage:
+    python benchmarks/rule_freq_heap.py <address> <container> [num_docs] [num_sentences] [num_tokens]
+"""
+
+from lum.odinson.doc import Document
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.serialization import dumps
+import subprocess
+import sys
+import threading
+import time
+
+GRAMMAR = """
+rules:
+  - name: nouns
+    type: basic
+    label: Noun
+    pattern: |
+      [tag=/N.*/]
+  - name: noun-pairs
+    type: basic
+    label: NounPair
+    pattern: |
+      [tag=/N.*/] [tag=/N.*/]
+"""
+
+UNITS = {"B": 1, "KiB": 2**10, "MiB": 2**20, "GiB": 2**30}
+
+
+def mk_doc(i: int, num_sentences: int, num_tokens: int) -> Document:
+    def mk_sentence(j: int) -> dict:
+        words = [f"w{(i + j + k) % 5000}" for k in range(num_tokens)]
+        fields = [
+            {"$type": "ai.lum.odinson.TokensField", "name": name, "tokens": tokens}
+            for (name, tokens) in [
+                ("raw", words),
+                ("word", words),
+                ("lemma", words),
+                ("tag", ["NN"] * num_tokens),
+            ]
+        ]
+        return {"numTokens": num_tokens, "fields": fields}
+
+    return Document.model_validate(
+        {
+            "id": f"synthetic-{i}",
+            "metadata": [],
+            "sentences": [mk_sentence(j) for j in range(num_sentences)],
+        }
+    )
+
+
+def memory_usage(container: str) -> float:
+    """Current memory usage of the container (in MiB)"""
+    out = subprocess.run(
+        ["docker", "stats", "--no-stream", "--format", "{{.MemUsage}}", container],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    used = out.split("/")[0].strip()
+    for unit, scale in sorted(UNITS.items(), key=lambda kv: -len(kv[0])):
+        if used.endswith(unit):
+            return float(used[: -len(unit)]) * scale / 2**20
+    raise ValueError(f"unexpected memory usage: {out}")
+
+
+def measure(name: str, container: str, fn) -> None:
+    peak = [memory_usage(container)]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], memory_usage(container))
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        fn()
+        status = "ok"
+    except Exception as e:
+        status = f"failed ({e})"
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    after = memory_usage(container)
+    print(
+        f"{name:<22} time={elapsed:.1f}s  peak={peak[0]:.0f}MiB  after={after:.0f}MiB  {status}"
+    )
+
+
+if __name__ == "__main__":
+    address = sys.argv[1]
+    container = sys.argv[2]
+    num_docs = int(sys.argv[3]) if len(sys.argv) > 3 else 10_000
+    num_sentences = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+    num_tokens = int(sys.argv[5]) if len(sys.argv) > 5 else 20
+    api = OdinsonBaseAPI(address)
+    docs = (mk_doc(i, num_sentences, num_tokens) for i in range(num_docs))
+    indexed = api.index_many(docs)
+    print(f"indexed {indexed.num_indexed} docs ({api.numdocs} sentences)")
+    measure("/api/rule-freq", container, lambda: api.rule_freq(GRAMMAR))
+    measure(
+        "/api/rule-hist",
+        container,
+        lambda: api.transport.post(
+            f"{address}/api/rule-hist",
+            data=dumps({"grammar": GRAMMAR}),
+            headers={"Content-type": "application/json"},
+        ).raise_for_status(),
+    )
+    measure(
+        "/api/execute/grammar",
+        container,
+        lambda: api.execute_grammar(GRAMMAR, max_docs=1000, raw=True),
+    )
+    api.close()
@@ -0,0 +1,118 @@
+"""Encode/decode time for multi-megabyte Document and GrammarResults payloads,
+before (model_dump + json / json + model_validate) and after (straight to and from bytes).
+
+Usage:
+    python benchmarks/serialization.py [num_sentences] [num_mentions]
+"""
+
+from typing import Any, Dict, List
+from lum.odinson.doc import Document
+from lum.odinson.rest.responses import GrammarResults
+from lum.odinson.rest.serialization import decode, encode
+import json
+import statistics
+import sys
+import time
+
+ATTRIBUTES = ["raw", "word", "norm", "lemma", "tag", "chunk", "entity"]
+
+
+def mk_doc(num_sentences: int, num_tokens: int = 30) -> Document:
+    def mk_sentence(i: int) -> dict:
+        fields: List[Dict[str, Any]] = [
+            {
+                "$type": "ai.lum.odinson.TokensField",
+                "name": name,
+                "tokens": [f"{name}-{i}-{j}" for j in range(num_tokens)],
+            }
+            for name in ATTRIBUTES
+        ]
+        edges = [[j, j + 1, "dep"] for j in range(num_tokens - 1)]
+        fields.append(
+            {
+                "$type": "ai.lum.odinson.GraphField",
+                "name": "dependencies",
+                "edges": edges,
+                "roots": [0],
+            }
+        )
+        return {"numTokens": num_tokens, "fields": fields}
+
+    data = {
+        "id": "synthetic",
+        "metadata": [],
+        "sentences": [mk_sentence(i) for i in range(num_sentences)],
+    }
+    return Document.model_validate(data)
+
+
+def mk_grammar_results(num_mentions: int) -> bytes:
+    def mk_mention(i: int) -> dict:
+        arg = {"start": 3, "end": 5, "text": "some argument"}
+        return {
+            "label": "Event",
+            "sentenceId": i,
+            "documentId": f"doc-{i // 10}",
+            "sentenceIndex": i % 10,
+            "words": [f"word-{j}" for j in range(30)],
+            "foundBy": "rule-1",
+            "match": [
+                {
+                    "start": 1,
+                    "end": 5,
+                    "text": "some event text",
+                    "trigger": {"start": 1, "end": 2, "text": "trigger"},
+                    "namedCaptures": [
+                        {"name": "theme", "label": "Thing", "match": arg}
+                    ],
+                }
+            ],
+        }
+
+    data = {
+        "duration": 1.0,
+        "allowTriggerOverlaps": False,
+        "mentions": [mk_mention(i) for i in range(num_mentions)],
+    }
+    return json.dumps(data).encode("utf-8")
+
+
+def timed(fn, n: int = 5) -> float:
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(
+        f"{name:<24} before={before:.1f}ms  after={after:.1f}ms  ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    num_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_mentions = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    doc = mk_doc(num_sentences)
+    doc_bytes = encode(doc)
+    gr_bytes = mk_grammar_results(num_mentions)
+    print(
+        f"Document: {len(doc_bytes) / 2**20:.1f}MiB, GrammarResults: {len(gr_bytes) / 2**20:.1f}MiB"
+    )
+    report(
+        "encode Document",
+        timed(lambda: json.dumps(doc.dict()).encode("utf-8")),
+        timed(lambda: encode(doc)),
+    )
+    report(
+        "decode Document",
+        timed(lambda: Document.model_validate(json.loads(doc_bytes))),
+        timed(lambda: decode(Document, doc_bytes)),
+    )
+    report(
+        "decode GrammarResults",
+        timed(lambda: GrammarResults(**json.loads(gr_bytes))),
+        timed(lambda: decode(GrammarResults, gr_bytes)),
+    )
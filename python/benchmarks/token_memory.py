@@ -0,0 +1,54 @@
+"""Memory held by the Tokens of many retrieved sentences,
+before (one attribute dict per Token) and after (Token views of the sentence's columns).
+
+Usage:
+    python benchmarks/token_memory.py [num_sentences] [num_tokens]
+"""
+
+from typing import Dict, List
+from lum.odinson.doc import Sentence, TokensField
+import sys
+import tracemalloc
+
+ATTRIBUTES = ["raw", "word", "norm", "lemma", "tag", "chunk", "entity"]
+
+
+class DictToken:
+    """The previous Token implementation"""
+
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            self.__dict__[k] = v
+
+
+def dict_tokens(s: Sentence):
+    tokens: List[Dict[str, str]] = [dict() for _ in range(s.numTokens)]
+    for f in s.fields:
+        for i, label in enumerate(f.tokens):
+            tokens[i][f.name] = label
+    return [DictToken(**d) for d in tokens]
+
+
+def mk_sentence(i: int, num_tokens: int) -> Sentence:
+    fields = [
+        TokensField(name=name, tokens=[f"{name}-{i}-{j}" for j in range(num_tokens)])
+        for name in ATTRIBUTES
+    ]
+    return Sentence(numTokens=num_tokens, fields=fields)
+
+
+def measure(name: str, sentences, fn) -> None:
+    tracemalloc.start()
+    held = [fn(s) for s in sentences]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} {size / len(held):.0f} bytes/sentence")
+
+
+if __name__ == "__main__":
+    num_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    sentences = [mk_sentence(i, num_tokens) for i in range(num_sentences)]
+    print(f"{num_sentences} sentences x {num_tokens} tokens")
+    measure("before", sentences, dict_tokens)
+    measure("after", sentences, lambda s: s.tokens)
@@ -0,0 +1,43 @@
+"""Per-call latency of /api/numdocs against a local stub server,
+before (module-level requests.get) and after (pooled Transport).
+
+Usage:
+    python benchmarks/transport.py [num_calls]
+"""
+
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.tests.utils import StubOdinsonServer
+import requests
+import statistics
+import sys
+import time
+
+
+def timed(fn, n: int):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies) -> None:
+    ms = sorted(l * 1000 for l in latencies)
+    p99 = ms[int(0.99 * (len(ms) - 1))]
+    print(
+        f"{name:<10} mean={statistics.mean(ms):.3f}ms  p50={statistics.median(ms):.3f}ms  p99={p99:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    routes = {("GET", "/api/numdocs"): lambda req: (200, 42)}
+    with StubOdinsonServer(routes) as server:
+        endpoint = f"{server.address}/api/numdocs"
+        before = timed(lambda: requests.get(endpoint).json(), n)
+        api = OdinsonBaseAPI(server.address)
+        after = timed(lambda: api.numdocs, n)
+        api.close()
+    report("before", before)
+    report("after", after)
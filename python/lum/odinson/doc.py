@@ -2,12 +2,25 @@ from __future__ import annotations
 import dateutil
 from lum.odinson.typing import Tokens
 from enum import Enum
-from typing import Any, List, Literal, Optional, Sequence, Text, Tuple, Type, Union
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Text,
+    Tuple,
+    Type,
+    Union,
+)
 import abc
+import collections.abc as abc_collections
 from pydantic import BaseModel, ConfigDict
 import pydantic
 import gzip
 import json
+import os
 
 __all__ = ["Document", "AnyField"]
 
@@ -127,11 +140,42 @@ class Metadata:
 
 class Token:
     """Convenience class to represent a single token
-    and its attributes"""
+    and its attributes.
+
+    A Token is a view of one position in the token attribute lists (columns) of a Sentence,
+    so the attribute values themselves are never copied.
+    """
+
+    __slots__ = ("_columns", "_index", "_hash")
 
     def __init__(self, **kwargs):
-        for k, v in kwargs.items():
-            self.__dict__[k] = v
+        self._columns: Dict[Text, Sequence[Any]] = {k: [v] for k, v in kwargs.items()}
+        self._index: int = 0
+        self._hash: Optional[int] = None
+
+    @staticmethod
+    def view(columns: Dict[Text, Sequence[Any]], index: int) -> "Token":
+        """Creates the Token at position index of the provided columns (attribute name -> values)."""
+        tok = Token.__new__(Token)
+        tok._columns = columns
+        tok._index = index
+        tok._hash = None
+        return tok
+
+    def __getattr__(self, name: str) -> Any:
+        # only token attributes are looked up here
+        if name.startswith("__") or name in Token.__slots__:
+            raise AttributeError(name)
+        try:
+            return self._columns[name][self._index]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+
+    def to_dict(self) -> Dict[Text, Any]:
+        """The attributes of this Token"""
+        return {k: values[self._index] for k, values in self._columns.items()}
 
     def __len__(self):
         return len(self.raw)
@@ -139,8 +183,57 @@ class Token:
     def __str__(self):
         return self.raw
 
+    def __repr__(self):
+        attributes = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"Token({attributes})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Token):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
     def __hash__(self):
-        return hash(tuple(frozenset(sorted(self.__dict__.items()))))
+        if self._hash is None:
+            self._hash = hash(frozenset(self.to_dict().items()))
+        return self._hash
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[Text, Any]) -> None:
+        Token.__init__(self, **state)
+
+
+class TokenSequence(abc_collections.Sequence):
+    """The Tokens of a Sentence.
+    Token views are created on access, so holding a Sentence's tokens costs a single object.
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, columns: Dict[Text, Sequence[Any]], length: int):
+        self._columns = columns
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("token index out of range")
+        return Token.view(self._columns, index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, abc_collections.Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
 
 
 class Sentence(BaseModel):
@@ -149,33 +242,43 @@ class Sentence(BaseModel):
     fields: List[AnyField]
     model_config = ConfigDict(extra="allow")
 
-    def model_post_init(self, ctx) -> None:
-        """Easy access to fields"""
-        tokens = [dict([]) for _ in range(self.numTokens)]
-        graph = None
+    def __getattr__(self, name: str) -> Any:
+        """Easy access to fields.
+        Tokens and token attributes are materialized on first access and cached."""
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            pass
+        if name == "tokens":
+            # token attributes (shared by every Token of this Sentence)
+            columns = {
+                f.name: f.tokens for f in self.fields if isinstance(f, TokensField)
+            }
+            # create tokens
+            self.__dict__["tokens"] = TokenSequence(columns, self.numTokens)
+            return self.__dict__["tokens"]
         for f in self.fields:
-            key = f.name
-            # token attributes
-            if isinstance(f, TokensField):
-                # populate tokens
-                for i, label in enumerate(f.tokens):
-                    tokens[i][key] = label
-                self.__dict__[key] = f.tokens
-            # syntactic dependencies, semantic roles, etc.
-            elif isinstance(f, GraphField):
-                graph = f
-        # create tokens
-        self.__dict__["tokens"] = [Token(**d) for d in tokens]
-
-        # TODO: create graph
-        # if graph is not None:
-        #   edges = []
-        #   self.__dict__["edges"] =
-        #   key = "edges"
+            if isinstance(f, TokensField) and f.name == name:
+                self.__dict__[name] = f.tokens
+                return f.tokens
+        # TODO: create graph from GraphField (syntactic dependencies, semantic roles, etc.)
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
 
     def __getitem__(self, index: int) -> Token:
         return self.tokens[index]
 
+    def __eq__(self, other: Any) -> bool:
+        # NOTE: ignores cached views of the fields
+        if isinstance(other, Sentence):
+            return (
+                self.numTokens == other.numTokens
+                and self.fields == other.fields
+                and self.__pydantic_extra__ == other.__pydantic_extra__
+            )
+        return NotImplemented
+
     def __hash__(self):
         num_tokens = [self.numTokens]
         fields = [hash(f) for f in self.fields]
@@ -238,12 +341,12 @@ class Sentence(BaseModel):
         """Create an Odinson Sentence from a collection Tokens"""
         fields_dict = dict()
         for tok in tokens:
-            for k, v in tok.__dict__.items():
+            for k, v in tok.to_dict().items():
                 value = fields_dict.get(k, [])
                 value.append(v)
                 fields_dict[k] = value
-        num_tokens = list({len(values) for values in fields_dict.items()})
-        assert num_tokens == 1, "All token attributes must have the same length"
+        num_tokens = list({len(values) for values in fields_dict.values()})
+        assert len(num_tokens) == 1, "All token attributes must have the same length"
         fields = [TokensField(name=k, tokens=toks) for k, toks in fields_dict.items()]
         return Sentence(numTokens=num_tokens[0], fields=fields)
 
@@ -261,24 +364,39 @@ class Document(BaseModel):
         components = [hash(self.id)] + metadata + sentences
         return hash(tuple(components))
 
-    def model_post_init(self, ctx) -> None:
-        tokens = []
-        attributes = dict()
-        for s in self.sentences:
-            # append tokens
-            tokens.append(s.tokens)
-            for f in s.fields:
-                key = f.name
-                # token attributes
-                if isinstance(f, TokensField):
-                    values = attributes.get(key, [])
-                    # nested list
-                    values.append(s.__dict__[key])
-                    attributes[key] = values
-        for k, v in attributes.items():
-            self.__dict__[k] = v
-
-        self.__dict__["tokens"] = [s.tokens for s in self.sentences]
+    def __getattr__(self, name: str) -> Any:
+        """Easy access to token attributes (one nested list per sentence).
+        Views are materialized on first access and cached."""
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            pass
+        if name == "tokens":
+            self.__dict__["tokens"] = [s.tokens for s in self.sentences]
+            return self.__dict__["tokens"]
+        # nested list
+        values = [
+            f.tokens
+            for s in self.sentences
+            for f in s.fields
+            if isinstance(f, TokensField) and f.name == name
+        ]
+        if len(values) == 0:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        self.__dict__[name] = values
+        return values
+
+    def __eq__(self, other: Any) -> bool:
+        # NOTE: ignores cached views of the fields
+        if isinstance(other, Document):
+            return (
+                self.id == other.id
+                and self.metadata == other.metadata
+                and self.sentences == other.sentences
+            )
+        return NotImplemented
 
     def metadata_by_name(self, name: str) -> List[AnyField]:
         return [m for m in self.metadata if m.name == name]
@@ -300,12 +418,13 @@ class Document(BaseModel):
 
     @staticmethod
     def from_file(fp: Text) -> Document:
-        if fp.lower().endswith(".gz"):
-            with gzip.open(fp, "rb") as f:
-                return Document(**json.loads(f.read()))
-        else:
-            with open(fp, "r") as f:
-                return Document(**json.loads(f.read()))
+        """Loads a single Document from a (possibly gzipped) JSON file.
+        See lum.odinson.readers.read_documents for .jsonl files, archives and directories.
+        """
+        fp = os.fspath(fp)
+        opener = gzip.open if fp.lower().endswith(".gz") else open
+        with opener(fp, "rb") as f:
+            return Document.model_validate_json(f.read())
 
     def copy(
         self,
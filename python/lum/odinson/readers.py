@@ -0,0 +1,122 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Deque, Iterator, Optional, Text, Union, cast
+from lum.odinson.doc import Document
+import gzip
+import os
+import tarfile
+import zipfile
+
+__all__ = ["read_documents"]
+
+PathLike = Union[Text, "os.PathLike[str]"]
+
+# one serialized Document
+Record = bytes
+
+JSON_SUFFIXES = (".json", ".json.gz")
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".ndjson", ".ndjson.gz")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+ZIP_SUFFIXES = (".zip",)
+
+
+def _has_suffix(name: Text, suffixes) -> bool:
+    return name.lower().endswith(suffixes)
+
+
+def _maybe_gunzip(name: Text, f: IO[bytes]) -> IO[bytes]:
+    if _has_suffix(name, ".gz"):
+        return cast(IO[bytes], gzip.GzipFile(fileobj=f, mode="rb"))
+    return f
+
+
+def _stream_records(name: Text, f: IO[bytes]) -> Iterator[Record]:
+    """Yields the serialized Documents of a (possibly gzipped) .json or .jsonl stream"""
+    f = _maybe_gunzip(name, f)
+    if _has_suffix(name, JSONL_SUFFIXES):
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+    elif _has_suffix(name, JSON_SUFFIXES):
+        yield f.read()
+
+
+def _tar_records(fp: Text) -> Iterator[Record]:
+    # sequential access, so compressed archives are never seeked or fully decompressed
+    with tarfile.open(fp, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            f = archive.extractfile(member)
+            if f is not None:
+                yield from _stream_records(member.name, f)
+
+
+def _zip_records(fp: Text) -> Iterator[Record]:
+    with zipfile.ZipFile(fp) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as f:
+                yield from _stream_records(info.filename, f)
+
+
+def _records(path: PathLike) -> Iterator[Record]:
+    """Yields serialized Documents one at a time from a file, archive or directory"""
+    fp = os.fspath(path)
+    if os.path.isdir(fp):
+        for root, dirs, files in os.walk(fp):
+            dirs.sort()
+            for name in sorted(files):
+                yield from _records(os.path.join(root, name))
+    elif _has_suffix(fp, TAR_SUFFIXES):
+        yield from _tar_records(fp)
+    elif _has_suffix(fp, ZIP_SUFFIXES):
+        yield from _zip_records(fp)
+    elif _has_suffix(fp, JSON_SUFFIXES + JSONL_SUFFIXES):
+        with open(fp, "rb") as f:
+            yield from _stream_records(fp, f)
+
+
+def _decode(record: Record) -> Document:
+    return Document.model_validate_json(record)
+
+
+def read_documents(
+    path: PathLike,
+    # Number of processes used to decode documents (0 decodes in the calling process).
+    workers: int = 0,
+    # Max. number of documents being decoded at once (defaults to 2 * workers).
+    window: Optional[int] = None,
+) -> Iterator[Document]:
+    """Yields Documents one at a time from any of the following:
+    - a .json or .json.gz file (one Document)
+    - a .jsonl or .jsonl.gz file (one Document per line)
+    - a tar or zip archive of such files
+    - a directory (searched recursively) of such files and archives
+
+    Documents are yielded in the order they are read.  Only the documents in flight are held in memory,
+    so a corpus can be fed to OdinsonBaseAPI.bulk_index without loading it first.
+    """
+    records = _records(path)
+    if workers <= 0:
+        for record in records:
+            yield _decode(record)
+        return
+
+    window = window or 2 * workers
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for record in records:
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(_decode, record))
+            while len(pending) > 0:
+                yield pending.popleft().result()
+        finally:
+            # the consumer may stop early
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,430 @@
+from __future__ import annotations
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Text, Union
+from lum.odinson.doc import AnyField, Document, Sentence
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.frequency import (
+    FrequencyTable,
+    Histogram,
+    Order,
+    Scale,
+    collect_pages,
+    windows,
+)
+from lum.odinson.rest.pagination import cursor, score_docs, total_hits
+from lum.odinson.rest.requests import SimplePatternsRequest
+from lum.odinson.rest.serialization import decode, dumps, encode, loads
+from lum.odinson.rest.responses import (
+    BaseMention,
+    CorpusInfo,
+    GrammarResults,
+    RawGrammarResults,
+    RawMention,
+    RawResults,
+    RawScoreDoc,
+    Results,
+    ScoreDoc,
+)
+import asyncio
+import httpx
+import urllib.parse
+
+__all__ = ["AsyncOdinsonAPI"]
+
+
+class AsyncOdinsonAPI:
+    """asyncio counterpart of OdinsonBaseAPI.
+
+    All calls share one connection pool, so a single event loop can keep up to
+    `max_connections` requests in flight (additional requests wait for a free connection).
+    """
+
+    DEFAULT_MAX_CONNECTIONS: int = 200
+    # grammars can run for a long time, so only connecting is bounded by default
+    DEFAULT_TIMEOUT: httpx.Timeout = httpx.Timeout(
+        connect=10.0, read=None, write=None, pool=None
+    )
+
+    def __init__(
+        self,
+        address: Text,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        # Number of times to retry on connection errors.
+        retries: int = 3,
+    ):
+        self.address = address
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(retries=retries),
+        )
+
+    async def close(self) -> None:
+        """Releases any pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncOdinsonAPI":
+        return self
+
+    async def __aexit__(
+        self, exception_type, exception_value, exception_traceback
+    ) -> None:
+        await self.close()
+
+    @staticmethod
+    def _params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Drops unset query string parameters."""
+        return {k: v for (k, v) in params.items() if v is not None}
+
+    async def numdocs(self) -> int:
+        """Total number of documents (num. docs = num. sentences) in the corpus."""
+        res = await self.client.get(f"{self.address}/api/numdocs")
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return loads(res.content)
+
+    async def corpus(self) -> CorpusInfo:
+        """Provides a summary of the current index"""
+        res = await self.client.get(f"{self.address}/api/corpus")
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return decode(CorpusInfo, res.content)
+
+    async def term_freq(
+        self,
+        field: str,
+        group: Optional[str] = None,
+        filter: Optional[str] = None,
+        order: Order = "freq",
+        min: int = 0,
+        max: int = 9,
+        scale: Scale = "count",
+        reverse: bool = False,
+    ) -> FrequencyTable:
+        """See OdinsonBaseAPI.term_freq"""
+        params = OdinsonBaseAPI._term_freq_params(
+            field=field,
+            group=group,
+            filter=filter,
+            order=order,
+            min=min,
+            max=max,
+            scale=scale,
+            reverse=reverse,
+        )
+        res = await self.client.get(f"{self.address}/api/term-freq", params=params)
+        res.raise_for_status()
+        return FrequencyTable.from_json(res.content)
+
+    async def term_vocabulary(
+        self,
+        field: str,
+        group: Optional[str] = None,
+        filter: Optional[str] = None,
+        order: Order = "freq",
+        scale: Scale = "count",
+        reverse: bool = False,
+        page_size: int = 10_000,
+        workers: int = 4,
+    ) -> FrequencyTable:
+        """See OdinsonBaseAPI.term_vocabulary"""
+        tables: List[FrequencyTable] = []
+        start = 0
+        while True:
+            # one wave of windows at a time, since the number of terms is unknown
+            pages = await asyncio.gather(
+                *(
+                    self.term_freq(
+                        field=field,
+                        group=group,
+                        filter=filter,
+                        order=order,
+                        min=ranks.start,
+                        max=ranks.stop - 1,
+                        scale=scale,
+                        reverse=reverse,
+                    )
+                    for ranks in windows(start, page_size, workers)
+                )
+            )
+            last = collect_pages(pages, page_size)
+            if last is not None:
+                return FrequencyTable.concat(tables + [last])
+            tables.extend(pages)
+            start += workers * page_size
+
+    async def term_hist(
+        self,
+        field: str,
+        bins: Optional[int] = None,
+        equal_probability: bool = False,
+        x_log_scale: bool = False,
+    ) -> Histogram:
+        """See OdinsonBaseAPI.term_hist"""
+        params = {
+            "field": field,
+            "bins": bins,
+            "equalProbability": "true" if equal_probability else None,
+            "xLogScale": "true" if x_log_scale else None,
+        }
+        res = await self.client.get(
+            f"{self.address}/api/term-hist", params=AsyncOdinsonAPI._params(params)
+        )
+        res.raise_for_status()
+        return Histogram.from_json(res.content)
+
+    async def rule_freq(
+        self,
+        grammar: str,
+        allow_trigger_overlaps: bool = False,
+        order: Order = "freq",
+        min: int = 0,
+        max: Optional[int] = 0,
+        scale: Scale = "count",
+        reverse: bool = False,
+    ) -> FrequencyTable:
+        """See OdinsonBaseAPI.rule_freq"""
+        payload = OdinsonBaseAPI._rule_freq_payload(
+            grammar=grammar,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            order=order,
+            min=min,
+            max=max,
+            scale=scale,
+            reverse=reverse,
+        )
+        res = await self.client.post(
+            f"{self.address}/api/rule-freq",
+            content=dumps(payload),
+            headers=OdinsonBaseAPI._json_headers(),
+        )
+        res.raise_for_status()
+        return FrequencyTable.from_json(res.content)
+
+    async def rule_hist(
+        self,
+        grammar: str,
+        allow_trigger_overlaps: bool = False,
+        bins: Optional[int] = None,
+        equal_probability: bool = False,
+        x_log_scale: bool = False,
+    ) -> Histogram:
+        """See OdinsonBaseAPI.rule_hist"""
+        payload = OdinsonBaseAPI._rule_hist_payload(
+            grammar=grammar,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            bins=bins,
+            equal_probability=equal_probability,
+            x_log_scale=x_log_scale,
+        )
+        res = await self.client.post(
+            f"{self.address}/api/rule-hist",
+            content=dumps(payload),
+            headers=OdinsonBaseAPI._json_headers(),
+        )
+        res.raise_for_status()
+        return Histogram.from_json(res.content)
+
+    async def index(self, doc: Document, max_tokens: int = -1) -> bool:
+        """Indexes a single Document"""
+        endpoint = OdinsonBaseAPI._index_endpoint(self.address, max_tokens)
+        headers = {"Content-type": "application/json", "Accept": "text/plain"}
+        res = await self.client.post(
+            endpoint, content=encode(doc), headers=OdinsonBaseAPI._json_headers(headers)
+        )
+        return OdinsonBaseAPI.status_code_to_bool(res.status_code)
+
+    async def update(self, doc: Document, max_tokens: Optional[int] = None) -> bool:
+        """Updates an OdinsonDocument in the index, allowing for a specified maximum number of tokens per sentence."""
+        endpoint = OdinsonBaseAPI._update_endpoint(self.address, max_tokens)
+        res = await self.client.post(
+            endpoint, content=encode(doc), headers=OdinsonBaseAPI._json_headers()
+        )
+        return OdinsonBaseAPI.status_code_to_bool(res.status_code)
+
+    async def delete(self, doc_or_id: Union[Document, Text]) -> bool:
+        """Removes an OdinsonDocument from the index."""
+        doc_id: Text = doc_or_id if isinstance(doc_or_id, Text) else doc_or_id.id
+        endpoint = f"{self.address}/api/delete/document/{urllib.parse.quote(doc_id)}"
+        res = await self.client.delete(endpoint)
+        return OdinsonBaseAPI.status_code_to_bool(res.status_code)
+
+    async def sentence(self, sentence_id: int) -> Sentence:
+        """Retrieves an Odinson Sentence from the doc store."""
+        res = await self.client.get(f"{self.address}/api/sentence/{sentence_id}")
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return decode(Sentence, res.content)
+
+    async def document(self, document_id: str) -> Document:
+        """Retrieves an Odinson Document from the doc store."""
+        res = await self.client.get(f"{self.address}/api/document/{document_id}")
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return decode(Document, res.content)
+
+    async def metadata(self, id: Union[str, int]) -> List[AnyField]:
+        """Retrieves Odinson Document Metadata from the doc store."""
+        if isinstance(id, str):
+            endpoint = f"{self.address}/api/metadata/document/{id}"
+        else:
+            endpoint = f"{self.address}/api/metadata/sentence/{id}"
+        res = await self.client.get(endpoint)
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return OdinsonBaseAPI._decode_metadata(res.content)
+
+    async def execute_grammar(
+        self,
+        grammar: str,
+        metadata_query: Optional[str] = None,
+        max_docs: Optional[int] = 20,
+        allow_trigger_overlaps: bool = False,
+        raw: bool = False,
+    ) -> Union[GrammarResults, RawGrammarResults]:
+        """See OdinsonBaseAPI.execute_grammar"""
+        params = {
+            "metadataQuery": metadata_query,
+            "maxDocs": max_docs,
+            "allowTriggerOverlaps": allow_trigger_overlaps,
+        }
+        res = await self.client.post(
+            f"{self.address}/api/execute/grammar",
+            content=grammar,
+            params=AsyncOdinsonAPI._params(params),
+        )
+        OdinsonBaseAPI._raise_for_server_error(res)
+        return decode(GrammarResults, res.content) if not raw else loads(res.content)
+
+    async def iter_grammar(
+        self,
+        grammar: str,
+        metadata_query: Optional[str] = None,
+        max_docs: Optional[int] = None,
+        allow_trigger_overlaps: bool = False,
+        label: Optional[str] = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[BaseMention, RawMention]]:
+        """See OdinsonBaseAPI.iter_grammar"""
+        params = OdinsonBaseAPI._grammar_stream_params(
+            metadata_query=metadata_query,
+            max_docs=max_docs,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            label=label,
+        )
+        endpoint = f"{self.address}/api/execute/grammar/stream"
+        async with self.client.stream(
+            "POST", endpoint, content=grammar, params=params
+        ) as res:
+            if res.status_code != 200:
+                await res.aread()
+                OdinsonBaseAPI._raise_for_server_error(res)
+                raise Exception(f"{res.status_code}: {res.text}")
+            async for line in res.aiter_lines():
+                if line:
+                    yield OdinsonBaseAPI._decode_mention(line, raw=raw)
+
+    async def _search(
+        self,
+        odinson_query: str,
+        metadata_query: Optional[str] = None,
+        label: Optional[str] = None,
+        commit: bool = False,
+        prev_doc: Optional[int] = None,
+        prev_score: Optional[float] = None,
+        raw: bool = False,
+    ) -> Union[Results, RawResults]:
+        params = OdinsonBaseAPI._search_params(
+            odinson_query=odinson_query,
+            metadata_query=metadata_query,
+            label=label,
+            commit=commit,
+            prev_doc=prev_doc,
+            prev_score=prev_score,
+        )
+        res = await self.client.get(
+            f"{self.address}/api/execute/pattern", params=params
+        )
+        return OdinsonBaseAPI._decode_results(res, raw=raw)
+
+    async def search(
+        self,
+        odinson_query: str,
+        metadata_query: Optional[str] = None,
+        label: Optional[str] = None,
+        commit: bool = False,
+        prev_doc: Optional[int] = None,
+        prev_score: Optional[float] = None,
+        raw: bool = False,
+        stream: bool = False,
+    ) -> AsyncIterator[Union[ScoreDoc, RawScoreDoc]]:
+        """Yields every match for an Odinson pattern, paginating as needed
+        (or, if stream, from a single streaming request)."""
+        if stream:
+            if commit:
+                raise ValueError("commit is not supported when streaming")
+            params = OdinsonBaseAPI._search_params(
+                odinson_query=odinson_query,
+                metadata_query=metadata_query,
+                label=None,
+                commit=False,
+                prev_doc=prev_doc,
+                prev_score=prev_score,
+            )
+            endpoint = f"{self.address}/api/execute/pattern/stream"
+            async with self.client.stream("GET", endpoint, params=params) as res:
+                if res.status_code != 200:
+                    await res.aread()
+                    OdinsonBaseAPI._raise_for_server_error(res)
+                    return
+                async for line in res.aiter_lines():
+                    if line:
+                        yield OdinsonBaseAPI._decode_score_doc(line, raw=raw)
+            return
+        seen = 0
+        while True:
+            results = await self._search(
+                odinson_query=odinson_query,
+                metadata_query=metadata_query,
+                label=label,
+                commit=commit,
+                prev_doc=prev_doc,
+                prev_score=prev_score,
+                raw=raw,
+            )
+            hits = score_docs(results)
+            for sd in hits:
+                seen += 1
+                yield sd
+            if seen >= total_hits(results) or len(hits) == 0:
+                return
+            prev_doc, prev_score = cursor(hits[-1])
+
+    async def search_disjunction_of_patterns(
+        self,
+        patterns: List[str],
+        metadata_query: Optional[str] = None,
+        label: Optional[str] = None,
+        prev_doc: Optional[int] = None,
+        prev_score: Optional[float] = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[ScoreDoc, RawScoreDoc]]:
+        """Yields every match for a disjunction of Odinson patterns, paginating as needed."""
+        endpoint = f"{self.address}/api/execute/disjunction-of-patterns"
+        seen = 0
+        while True:
+            spr = SimplePatternsRequest(
+                patterns=patterns,
+                metadataQuery=metadata_query,
+                prevDoc=prev_doc,
+                prevScore=prev_score,
+            )
+            res = await self.client.post(
+                endpoint, content=encode(spr), headers=OdinsonBaseAPI._json_headers()
+            )
+            results = OdinsonBaseAPI._decode_results(res, raw=raw)
+            hits = score_docs(results)
+            for sd in hits:
+                seen += 1
+                yield sd
+            if seen >= total_hits(results) or len(hits) == 0:
+                return
+            prev_doc, prev_score = cursor(hits[-1])
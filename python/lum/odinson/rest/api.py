@@ -1,30 +1,207 @@
 from __future__ import annotations
-from typing import Any, Dict, Iterator, List, Literal, Optional, Text, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Text,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from lum.odinson.doc import AnyField, Document, Sentence
+from lum.odinson.rest.bulk import BulkIndexReport, DocOrPath, bulk_index, index_many
+from lum.odinson.rest.cache import LRUCache
+from lum.odinson.rest.frequency import (
+    MAX_RANK,
+    FrequencyTable,
+    Histogram,
+    Order,
+    Scale,
+    term_vocabulary,
+)
+from lum.odinson.rest.instrumentation import Instrumentation
+from lum.odinson.rest.pagination import paginate, score_docs
 from lum.odinson.rest.responses import (
+    BaseMention,
+    BulkIndexResponse,
     CorpusInfo,
     OdinsonErrors,
     ScoreDoc,
-    Statistic,
     GrammarResults,
     Results,
+    RawGrammarResults,
+    RawMention,
+    RawResults,
+    RawScoreDoc,
+)
+from lum.odinson.rest.requests import (
+    DocumentIdsRequest,
+    GrammarRequest,
+    SentenceIdsRequest,
+    SimplePatternsRequest,
+)
+from lum.odinson.rest.serialization import (
+    JSON_CONTENT_TYPE,
+    decode,
+    dumps,
+    encode,
+    loads,
 )
-from lum.odinson.rest.requests import GrammarRequest, SimplePatternsRequest
+from lum.odinson.rest.transport import Transport
 from pydantic import BaseModel
 from dataclasses import dataclass
 import pydantic
 import json
 import requests
+import time
 import urllib.parse
 
 __all__ = ["OdinsonBaseAPI"]
 
+T = TypeVar("T")
+
+# validates Document metadata returned by the doc store
+_METADATA = pydantic.TypeAdapter(List[AnyField])
+# validate the batched lookups (null marks an ID that was not found)
+_SENTENCES = pydantic.TypeAdapter(List[Optional[Sentence]])
+_DOCUMENTS = pydantic.TypeAdapter(List[Optional[Document]])
+_METADATA_MANY = pydantic.TypeAdapter(List[Optional[List[AnyField]]])
+
 # __all__ = ["Results", "Result", "Match", "Interval"]
 
 
 class OdinsonBaseAPI:
-    def __init__(self, address: Text):
+    # Max. number of IDs sent in a single batched lookup.
+    DEFAULT_CHUNK_SIZE: int = 1000
+
+    def __init__(
+        self,
+        address: Text,
+        transport: Optional[Transport] = None,
+        # Optional cache for sentence(), document() and metadata() lookups.
+        cache: Optional[LRUCache] = None,
+        # Records per-endpoint counts, sizes and timings (see lum.odinson.rest.instrumentation).
+        instrumentation: Optional[Instrumentation] = None,
+    ):
         self.address = address
+        # pooled connections shared by every endpoint
+        self.transport: Transport = transport or Transport()
+        if instrumentation is not None:
+            self.transport.instrumentation = instrumentation
+        self.cache: Optional[LRUCache] = cache
+        # endpoint -> (ETag, value) of summaries of the index (vocabularies, corpus info)
+        self._summaries: Dict[str, Tuple[str, Any]] = dict()
+
+    def _cached(self, key: Tuple[str, Union[str, int]], load: Callable[[], Any]) -> Any:
+        return load() if self.cache is None else self.cache.get_or_load(key, load)
+
+    def _invalidate(self, document_id: Text) -> None:
+        """Drops cached lookups that a write to the given document may have changed."""
+        if self.cache is None:
+            return
+        self.cache.invalidate(("document", document_id))
+        self.cache.invalidate(("metadata/document", document_id))
+        # NOTE: sentence IDs are Lucene document IDs, which are not stable across writes
+        self.cache.invalidate_where(
+            lambda key: key[0] in {"sentence", "metadata/sentence"}
+        )
+
+    def close(self) -> None:
+        """Releases any pooled connections."""
+        self.transport.close()
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        return self.transport.instrumentation
+
+    @staticmethod
+    def _raise_for_server_error(res: requests.Response) -> None:
+        """Raises requests.HTTPError for a 5xx response (ex. a 503 from a server still shedding
+        load once the transport's retries run out): unlike a 4xx, it says nothing about the
+        request itself, so it must not be mistaken for an empty result."""
+        if res.status_code >= 500:
+            res.raise_for_status()
+
+    def _decode(self, res: requests.Response, load: Callable[[bytes], T]) -> T:
+        """Decodes a response body, timing it if the transport is instrumented."""
+        OdinsonBaseAPI._raise_for_server_error(res)
+        instrumentation = self.transport.instrumentation
+        if instrumentation is None:
+            return load(res.content)
+        start = time.perf_counter()
+        value = load(res.content)
+        instrumentation.decoded(
+            res.request.method or "",
+            res.url,
+            time.perf_counter() - start,
+            value=value,
+        )
+        return value
+
+    def _decode_lines(
+        self, res: requests.Response, load: Callable[[bytes], T]
+    ) -> Iterator[T]:
+        """Decodes each line of an NDJSON stream.  If the transport is instrumented, the
+        decoding time and size of the stream are recorded once it ends."""
+        OdinsonBaseAPI._raise_for_server_error(res)
+        instrumentation = self.transport.instrumentation
+        if instrumentation is None:
+            for line in res.iter_lines():
+                if line:
+                    yield load(line)
+            return
+        decode_time, size = 0.0, 0
+        try:
+            for line in res.iter_lines():
+                size += len(line) + 1
+                if line:
+                    start = time.perf_counter()
+                    value = load(line)
+                    decode_time += time.perf_counter() - start
+                    yield value
+        finally:
+            instrumentation.decoded(
+                res.request.method or "", res.url, decode_time, bytes_received=size
+            )
+
+    def wait_until_ready(
+        self,
+        # Give up (with a TimeoutError) after this many seconds.
+        timeout: float = 120.0,
+        # Delay after the first failed probe, doubled after each failed probe.
+        initial_delay: float = 0.05,
+        # Upper bound on the delay between probes (and on the duration of each probe).
+        max_delay: float = 2.0,
+    ) -> float:
+        """Polls /api/healthcheck (with exponential backoff) until the service responds.
+        Returns the number of seconds waited."""
+        endpoint = f"{self.address}/api/healthcheck"
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = initial_delay
+        # probes are not retried by the transport, so the backoff (and the deadline) are ours
+        with Transport(pool_size=1, keep_alive=False, retries=0) as probe:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    res = probe.get(
+                        endpoint, timeout=max(min(max_delay, remaining), 0.01)
+                    )
+                    if res.status_code == 200:
+                        return time.monotonic() - start
+                except requests.RequestException:
+                    # not listening yet (or still starting)
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{self.address} was not ready after {timeout}s")
+                time.sleep(min(delay, remaining))
+                delay = min(2 * delay, max_delay)
 
     @staticmethod
     def status_code_to_bool(code: int) -> bool:
@@ -37,41 +214,166 @@ class OdinsonBaseAPI:
     def numdocs(self) -> int:
         """Total number of documents (num. docs = num. sentences) in the corpus."""
         endpoint = f"{self.address}/api/numdocs"
-        return requests.get(endpoint).json()
+        return self._decode(self.transport.get(endpoint), loads)
+
+    def _summary(self, endpoint: str, load: Callable[[bytes], Any]) -> Any:
+        """Retrieves a summary of the index, revalidating the copy received last time
+        (ETag/If-None-Match) rather than downloading and decoding it again.
+        The returned value is shared, so it should be treated as read-only."""
+        previous = self._summaries.get(endpoint)
+        headers = {"If-None-Match": previous[0]} if previous is not None else None
+        res = self.transport.get(endpoint, headers=headers)
+        if res.status_code == requests.codes.not_modified and previous is not None:
+            return previous[1]
+        value = self._decode(res, load)
+        etag = res.headers.get("ETag")
+        if self.status_code_to_bool(res.status_code) and etag is not None:
+            self._summaries[endpoint] = (etag, value)
+        return value
 
     @property
     def tags_vocabulary(self) -> List[str]:
         """Retrieves vocabulary of part-of-speech tags for the current index."""
         endpoint = f"{self.address}/api/tags-vocabulary"
-        return requests.get(endpoint).json()
+        return self._summary(endpoint, loads)
 
     @property
     def edge_vocabulary(self) -> List[str]:
         """Retrieves vocabulary of dependencies for the current index."""
         # FIXME: change this to edge-vocabulary
         endpoint = f"{self.address}/api/dependencies-vocabulary"
-        return requests.get(endpoint).json()
+        return self._summary(endpoint, loads)
 
     def corpus(self) -> CorpusInfo:
         """Provides a summary of the current index"""
         endpoint = f"{self.address}/api/corpus"
-        # return requests.get(endpoint).json()
-        return CorpusInfo(**requests.get(endpoint).json())
+        return self._summary(endpoint, lambda data: decode(CorpusInfo, data))
 
     # api/config
     def buildinfo(self) -> Dict[str, Union[str, List[str], bool]]:
         """Provides detailed build information about the currently running app."""
         endpoint = f"{self.address}/api/buildinfo"
-        return requests.get(endpoint).json()
+        return loads(self.transport.get(endpoint).content)
 
     # api/config
     def _config(self) -> Dict[str, Any]:
         """Provides detailed build information about the currently running app."""
         endpoint = f"{self.address}/api/config"
-        return requests.get(endpoint).json()
+        return loads(self.transport.get(endpoint).content)
 
-    def term_freq(self) -> List[Statistic]:
-        pass
+    def term_freq(
+        self,
+        # A token field such as word, lemma, or tag.
+        field: str,
+        # A second token field whose terms are paired with (and counted for) each term of `field`.
+        group: Optional[str] = None,
+        # A (Lucene) regular expression that terms must match.
+        filter: Optional[str] = None,
+        # The order in which to return results: "freq" (frequency order, default) or "alpha" (alphanumeric order).
+        order: Order = "freq",
+        # The smallest rank to return, with 0 (default) being the highest ranked.
+        min: int = 0,
+        # The highest rank to return, e.g. 9 (default).
+        max: int = 9,
+        # Scaling to apply to frequency counts. Choices are "count" (default), "log10", and "percent".
+        scale: Scale = "count",
+        # Whether to reverse the rank order, to select the 10 least frequent results, for example.
+        reverse: bool = False,
+    ) -> FrequencyTable:
+        """Frequencies of the terms of a field ranked `min` to `max` (inclusive), as columns.
+        A field missing from the index yields an empty table."""
+        endpoint = f"{self.address}/api/term-freq"
+        params = OdinsonBaseAPI._term_freq_params(
+            field=field,
+            group=group,
+            filter=filter,
+            order=order,
+            min=min,
+            max=max,
+            scale=scale,
+            reverse=reverse,
+        )
+        res = self.transport.get(endpoint, params=params)
+        res.raise_for_status()
+        return self._decode(res, FrequencyTable.from_json)
+
+    @staticmethod
+    def _term_freq_params(
+        field: str,
+        group: Optional[str],
+        filter: Optional[str],
+        order: str,
+        min: int,
+        max: int,
+        scale: str,
+        reverse: bool,
+    ) -> Dict[str, Any]:
+        """Query string parameters for /api/term-freq"""
+        params = {
+            "field": field,
+            "group": group,
+            "filter": filter,
+            "order": order,
+            "min": min,
+            "max": max,
+            "scale": scale,
+            # NOTE: Play expects lowercase booleans
+            "reverse": "true" if reverse else None,
+        }
+        return {k: v for (k, v) in params.items() if v is not None}
+
+    def term_vocabulary(
+        self,
+        field: str,
+        group: Optional[str] = None,
+        filter: Optional[str] = None,
+        order: Order = "freq",
+        scale: Scale = "count",
+        reverse: bool = False,
+        # Number of ranks requested at a time.
+        page_size: int = 10_000,
+        # Number of pages requested concurrently.
+        workers: int = 4,
+    ) -> FrequencyTable:
+        """Frequencies of every term of a field (see term_freq), as columns.
+        Windows of `page_size` ranks are requested `workers` at a time until one
+        comes back short."""
+        return term_vocabulary(
+            self,
+            field=field,
+            group=group,
+            filter=filter,
+            order=order,
+            scale=scale,
+            reverse=reverse,
+            page_size=page_size,
+            workers=workers,
+        )
+
+    def term_hist(
+        self,
+        # A token field such as word, lemma, or tag.
+        field: str,
+        # Number of bins (defaults to the Rice rule).
+        bins: Optional[int] = None,
+        # Whether to use variable-width bins of equal probability.
+        equal_probability: bool = False,
+        # Whether to log10-transform the counts of each term.
+        x_log_scale: bool = False,
+    ) -> Histogram:
+        """Histogram of the frequencies of the terms of a field, as columns."""
+        endpoint = f"{self.address}/api/term-hist"
+        params = {
+            "field": field,
+            "bins": bins,
+            "equalProbability": "true" if equal_probability else None,
+            "xLogScale": "true" if x_log_scale else None,
+        }
+        res = self.transport.get(
+            endpoint, params={k: v for (k, v) in params.items() if v is not None}
+        )
+        res.raise_for_status()
+        return self._decode(res, Histogram.from_json)
 
     def rule_freq(
         self,
@@ -80,41 +382,112 @@ class OdinsonBaseAPI:
         # Whether or not event arguments are permitted to overlap with the event's trigger. Defaults to false.
         allow_trigger_overlaps: bool = False,
         # The order in which to return results: "freq" (frequency order, default) or "alpha" (alphanumeric order).
-        order: Literal["freq", "alpha"] = "freq",
+        order: Order = "freq",
         # The smallest rank to return, with 0 (default) being the highest ranked.
         min: int = 0,
-        # The highest rank to return, e.g. 9 (default).
-        max: int = 0,
+        # The highest rank to return, e.g. 9, or None for every rule.
+        max: Optional[int] = 0,
         # Scaling to apply to frequency counts. Choices are "count" (default), "log10", and "percent".
-        scale: Literal["count", "log10", "percent"] = "count",
+        scale: Scale = "count",
         # Whether to reverse the rank order, to select the 10 lease frequent results, for example.
         reverse: bool = False,
-    ) -> List[Statistic]:
+    ) -> FrequencyTable:
+        """Number of mentions found by each rule of a grammar, as columns."""
+        payload = OdinsonBaseAPI._rule_freq_payload(
+            grammar=grammar,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            order=order,
+            min=min,
+            max=max,
+            scale=scale,
+            reverse=reverse,
+        )
+        endpoint = f"{self.address}/api/rule-freq"
+        res = self.transport.post(
+            endpoint, data=dumps(payload), headers=OdinsonBaseAPI._json_headers()
+        )
+        res.raise_for_status()
+        return self._decode(res, FrequencyTable.from_json)
+
+    def rule_hist(
+        self,
+        # An Odinson grammar.
+        grammar: str,
+        allow_trigger_overlaps: bool = False,
+        # Number of bins (defaults to the Rice rule).
+        bins: Optional[int] = None,
+        # Whether to use variable-width bins of equal probability.
+        equal_probability: bool = False,
+        # Whether to log10-transform the counts of each rule.
+        x_log_scale: bool = False,
+    ) -> Histogram:
+        """Histogram of the number of mentions found by each rule of a grammar, as columns."""
+        payload = OdinsonBaseAPI._rule_hist_payload(
+            grammar=grammar,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            bins=bins,
+            equal_probability=equal_probability,
+            x_log_scale=x_log_scale,
+        )
+        endpoint = f"{self.address}/api/rule-hist"
+        res = self.transport.post(
+            endpoint, data=dumps(payload), headers=OdinsonBaseAPI._json_headers()
+        )
+        res.raise_for_status()
+        return self._decode(res, Histogram.from_json)
+
+    @staticmethod
+    def _rule_hist_payload(
+        grammar: str,
+        allow_trigger_overlaps: bool,
+        bins: Optional[int],
+        equal_probability: bool,
+        x_log_scale: bool,
+    ) -> Dict[str, Any]:
         payload = {
+            "grammar": grammar,
+            "allowTriggerOverlaps": allow_trigger_overlaps,
+            "bins": bins,
+            "equalProbability": equal_probability,
+            "xLogScale": x_log_scale,
+            "pretty": False,
+        }
+        return {k: v for (k, v) in payload.items() if v is not None}
+
+    @staticmethod
+    def _rule_freq_payload(
+        grammar: str,
+        allow_trigger_overlaps: bool,
+        order: str,
+        min: int,
+        max: Optional[int],
+        scale: str,
+        reverse: bool,
+    ) -> Dict[str, Any]:
+        return {
             "grammar": grammar,
             "allowTriggerOverlaps": allow_trigger_overlaps,
             "order": order,
             "min": min,
-            "max": max,
+            "max": max if max is not None else MAX_RANK,
             "scale": scale,
             "reverse": reverse,
             "pretty": False,
         }
-        endpoint = f"{self.address}/api/rule-freq"
-        return requests.post(endpoint, json=payload).json()
 
     def _post_doc(
         self, endpoint: str, doc: Document, headers: Optional[Dict[str, str]] = None
     ) -> requests.Response:
-        return requests.post(
+        return self.transport.post(
             endpoint,
-            json=doc.dict(),
-            # NOTE: data takes str & .json() returns json str
-            # strange as it seems, this round trip is seems necessary for at least some files
-            # data=json.dumps(json.loads(doc.json())),
-            headers=headers,
+            data=encode(doc),
+            headers=OdinsonBaseAPI._json_headers(headers),
         )
 
+    @staticmethod
+    def _json_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        return {"Content-type": JSON_CONTENT_TYPE, **(headers or dict())}
+
     def _post_text(
         self, 
         endpoint: str, 
@@ -122,7 +495,7 @@ class OdinsonBaseAPI:
         params: Optional[Dict[str, Union[str,int]]] = None,
         headers: Optional[Dict[str, str]] = None
     ) -> requests.Response:
-        return requests.post(
+        return self.transport.post(
             endpoint,
             # NOTE: data takes str & .json() returns json str
             # json=text,
@@ -150,7 +523,7 @@ class OdinsonBaseAPI:
         if res.status_code == 200:
             return OdinsonBaseAPI.status_code_to_bool(res.status_code)
         else:
-            return False if not verbose else OdinsonErrors.model_validate(res.json())
+            return False if not verbose else decode(OdinsonErrors, res.content)
 
     def validate_grammar(
         self, grammar: str, verbose: bool = False
@@ -161,67 +534,119 @@ class OdinsonBaseAPI:
         if res.status_code == 200:
             return OdinsonBaseAPI.status_code_to_bool(res.status_code)
         else:
-            return False if not verbose else OdinsonErrors.model_validate(res.json())
+            return False if not verbose else decode(OdinsonErrors, res.content)
 
     def index(self, doc: Document, max_tokens: int = -1) -> bool:
         """Indexes a single Document"""
         # endpoint = f"{self.address}/api/index/document"
-        endpoint = (
-            f"{self.address}/api/index/document/maxTokensPerSentence/{max_tokens}"
-        )
+        endpoint = OdinsonBaseAPI._index_endpoint(self.address, max_tokens)
         # NOTE: data takes str & .json() returns json str
         headers = {"Content-type": "application/json", "Accept": "text/plain"}
         res = self._post_doc(endpoint=endpoint, doc=doc, headers=headers)
+        self._invalidate(doc.id)
         return OdinsonBaseAPI.status_code_to_bool(res.status_code)
 
+    def bulk_index(
+        self,
+        # Documents and/or paths to Odinson Document JSON files (optionally gzipped).
+        docs: Iterable[DocOrPath],
+        # Number of worker threads decoding, serializing and posting documents.
+        workers: int = 4,
+        # Max. number of documents pulled from `docs` but not yet indexed (defaults to 2 * workers).
+        max_in_flight: Optional[int] = None,
+        max_tokens: int = -1,
+    ) -> BulkIndexReport:
+        """Indexes many Documents concurrently.
+        File decoding, serialization and posting overlap across a bounded pool of workers.
+        Failures are collected in the report rather than stopping the run."""
+        return bulk_index(
+            self,
+            docs=docs,
+            workers=workers,
+            max_in_flight=max_in_flight,
+            max_tokens=max_tokens,
+        )
+
+    def index_many(
+        self,
+        # Documents and/or paths to Odinson Document JSON files (optionally gzipped).
+        docs: Iterable[DocOrPath],
+        # Number of documents sent per request.
+        batch_size: int = 1000,
+        max_tokens: int = -1,
+        # Whether to gzip each request body.
+        compress: bool = True,
+    ) -> BulkIndexResponse:
+        """Indexes (or replaces) many Documents, sending each batch as a single NDJSON request
+        that the server indexes with one writer (see /api/index/documents).
+        Returns the status of each document, in the order they were provided."""
+        return index_many(
+            self,
+            docs=docs,
+            batch_size=batch_size,
+            max_tokens=max_tokens,
+            compress=compress,
+        )
+
     def update(self, doc: Document, max_tokens: Optional[int] = None) -> bool:
         """Updates an OdinsonDocument in the index, allowing for a specified maximum number of tokens per sentence."""
         # f"{self.address}/api/update/document/{urllib.parse.quote(doc.id)}"
-        endpoint = (
-            f"{self.address}/api/update/document"
-            if not max_tokens
-            else f"{self.address}/api/update/document/maxTokensPerSentence/{max_tokens}"
-        )
+        endpoint = OdinsonBaseAPI._update_endpoint(self.address, max_tokens)
         res = self._post_doc(endpoint=endpoint, doc=doc)
+        self._invalidate(doc.id)
         return OdinsonBaseAPI.status_code_to_bool(res.status_code)
 
     def delete(self, doc_or_id: Union[Document, Text]) -> bool:
         """Removes an OdinsonDocument from the index."""
         doc_id: Text = doc_or_id if isinstance(doc_or_id, Text) else doc_or_id.id
         endpoint = f"{self.address}/api/delete/document/{urllib.parse.quote(doc_id)}"
-        res = requests.delete(endpoint)
+        res = self.transport.delete(endpoint)
+        self._invalidate(doc_id)
         return OdinsonBaseAPI.status_code_to_bool(res.status_code)
 
+    @staticmethod
+    def _index_endpoint(address: str, max_tokens: int) -> str:
+        return f"{address}/api/index/document/maxTokensPerSentence/{max_tokens}"
+
+    @staticmethod
+    def _update_endpoint(address: str, max_tokens: Optional[int]) -> str:
+        return (
+            f"{address}/api/update/document"
+            if not max_tokens
+            else f"{address}/api/update/document/maxTokensPerSentence/{max_tokens}"
+        )
+
     def sentence(self, sentence_id: int) -> Sentence:
         """Retrieves an Odinson Sentence from the doc store."""
         endpoint = f"{self.address}/api/sentence/{sentence_id}"
-        res = requests.get(endpoint)
-        return Sentence.model_validate(res.json())
+        load = lambda: self._decode(
+            self.transport.get(endpoint), lambda data: decode(Sentence, data)
+        )
+        return self._cached(("sentence", sentence_id), load)
 
     def document(self, document_id: str) -> Document:
         """Retrieves an Odinson Document from the doc store."""
         endpoint = f"{self.address}/api/document/{document_id}"
-        res = requests.get(endpoint)
-        return Document.model_validate(res.json())
+        load = lambda: self._decode(
+            self.transport.get(endpoint), lambda data: decode(Document, data)
+        )
+        return self._cached(("document", document_id), load)
 
     def metadata_for_sentence(self, sentence_id: str) -> List[AnyField]:
         """Retrieves Odinson Document Metadata from the doc store."""
         endpoint = f"{self.address}/api/metadata/sentence/{sentence_id}"
-        res = requests.get(endpoint)
-        doc = Document.model_validate(
-            {"id": "UNK", "metadata": res.json(), "sentences": []}
-        )
-        return doc.metadata
+        load = lambda: self._decode(self.transport.get(endpoint), self._decode_metadata)
+        return self._cached(("metadata/sentence", sentence_id), load)
 
     def metadata_for_document(self, document_id: str) -> List[AnyField]:
         """Retrieves Odinson Document Metadata from the doc store."""
         endpoint = f"{self.address}/api/metadata/document/{document_id}"
-        res = requests.get(endpoint)
-        # print(res.json())
-        doc = Document.model_validate(
-            {"id": document_id, "metadata": res.json(), "sentences": []}
-        )
-        return doc.metadata
+        load = lambda: self._decode(self.transport.get(endpoint), self._decode_metadata)
+        return self._cached(("metadata/document", document_id), load)
+
+    @staticmethod
+    def _decode_metadata(data: Union[bytes, str]) -> List[AnyField]:
+        return _METADATA.validate_json(data)
 
     def metadata(self, id: Union[str, int]) -> List[AnyField]:
         """Retrieves Odinson Document Metadata from the doc store."""
@@ -230,6 +655,106 @@ class OdinsonBaseAPI:
         elif isinstance(id, int):
             return self.metadata_for_sentence(id)
 
+    def _lookup_many(
+        self,
+        kind: str,
+        ids: Iterable[Union[str, int]],
+        load_chunk: Callable[[List[Any]], List[Any]],
+        chunk_size: int,
+    ) -> List[Any]:
+        """Looks up each distinct ID once (using the cache, if any), requesting
+        any misses in chunks of at most chunk_size IDs.  Returns one value per ID."""
+        ids = list(ids)
+        unique = list(dict.fromkeys(ids))
+
+        def load(missing: List[Any]) -> List[Any]:
+            values: List[Any] = []
+            for start in range(0, len(missing), chunk_size):
+                values.extend(load_chunk(missing[start : start + chunk_size]))
+            return values
+
+        if self.cache is None:
+            values = load(unique)
+        else:
+            values = self.cache.get_or_load_many(
+                [(kind, id) for id in unique],
+                lambda keys: load([id for (_, id) in keys]),
+            )
+        found = dict(zip(unique, values))
+        return [found[id] for id in ids]
+
+    def _post_ids(
+        self, endpoint: str, request: BaseModel, adapter: pydantic.TypeAdapter
+    ) -> List[Any]:
+        res = self.transport.post(
+            endpoint,
+            data=request.model_dump_json(exclude_none=True),
+            headers=OdinsonBaseAPI._json_headers(),
+        )
+        OdinsonBaseAPI._raise_for_server_error(res)
+        if not self.status_code_to_bool(res.status_code):
+            raise Exception(f"{res.status_code}: {res.text}")
+        return self._decode(res, adapter.validate_json)
+
+    def sentences(
+        self, sentence_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Optional[Sentence]]:
+        """Retrieves many Odinson Sentences from the doc store (None if not found).
+        Large lists of IDs are split into requests of at most chunk_size IDs."""
+        endpoint = f"{self.address}/api/sentences"
+        load_chunk = lambda ids: self._post_ids(
+            endpoint, SentenceIdsRequest(sentenceIds=ids), _SENTENCES
+        )
+        return self._lookup_many("sentence", sentence_ids, load_chunk, chunk_size)
+
+    def documents(
+        self, document_ids: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Optional[Document]]:
+        """Retrieves many Odinson Documents from the doc store (None if not found).
+        Large lists of IDs are split into requests of at most chunk_size IDs."""
+        endpoint = f"{self.address}/api/documents"
+        load_chunk = lambda ids: self._post_ids(
+            endpoint, DocumentIdsRequest(documentIds=ids), _DOCUMENTS
+        )
+        return self._lookup_many("document", document_ids, load_chunk, chunk_size)
+
+    def metadata_many(
+        self, ids: Iterable[Union[str, int]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Optional[List[AnyField]]]:
+        """Retrieves Odinson Document Metadata for many document IDs (str) and/or
+        sentence IDs (int) from the doc store (None for any ID not found).
+        Large lists of IDs are split into requests of at most chunk_size IDs."""
+        ids = list(ids)
+        by_document = lambda ids: self._post_ids(
+            f"{self.address}/api/metadata/documents",
+            DocumentIdsRequest(documentIds=ids),
+            _METADATA_MANY,
+        )
+        by_sentence = lambda ids: self._post_ids(
+            f"{self.address}/api/metadata/sentences",
+            SentenceIdsRequest(sentenceIds=ids),
+            _METADATA_MANY,
+        )
+        document_ids = [id for id in ids if isinstance(id, str)]
+        sentence_ids = [id for id in ids if not isinstance(id, str)]
+        found: Dict[Union[str, int], Optional[List[AnyField]]] = dict(
+            zip(
+                document_ids,
+                self._lookup_many(
+                    "metadata/document", document_ids, by_document, chunk_size
+                ),
+            )
+        )
+        found.update(
+            zip(
+                sentence_ids,
+                self._lookup_many(
+                    "metadata/sentence", sentence_ids, by_sentence, chunk_size
+                ),
+            )
+        )
+        return [found[id] for id in ids]
+
     # TODO: /api/parent/sentence/:sentenceId
     # TODO: /api/metadata/document/:odinsonDocId
     # TODO: /api/metadata/sentence/:sentenceId
@@ -250,21 +775,86 @@ class OdinsonBaseAPI:
         prev_doc: Optional[int] = None,
         # The score for the last result seen in the previous page of results.
         prev_score: Optional[float] = None,
-    ) -> Results:  # -> Iterator[S]:
+        # Whether to skip validation and return the JSON response as-is.
+        raw: bool = False,
+    ) -> Union[Results, RawResults]:
         endpoint = f"{self.address}/api/execute/pattern"
+        params = OdinsonBaseAPI._search_params(
+            odinson_query=odinson_query,
+            metadata_query=metadata_query,
+            label=label,
+            commit=commit,
+            prev_doc=prev_doc,
+            prev_score=prev_score,
+        )
+        res = self.transport.get(endpoint, params=params)
+        return self._decode(res, lambda _: OdinsonBaseAPI._decode_results(res, raw=raw))
+
+    def _stream(
+        self,
+        odinson_query: str,
+        metadata_query: Optional[str] = None,
+        prev_doc: Optional[int] = None,
+        prev_score: Optional[float] = None,
+        raw: bool = False,
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """Yields each hit as soon as its line of the NDJSON stream arrives."""
+        endpoint = f"{self.address}/api/execute/pattern/stream"
+        params = OdinsonBaseAPI._search_params(
+            odinson_query=odinson_query,
+            metadata_query=metadata_query,
+            label=None,
+            commit=False,
+            prev_doc=prev_doc,
+            prev_score=prev_score,
+        )
+        with self.transport.get(endpoint, params=params, stream=True) as res:
+            OdinsonBaseAPI._raise_for_server_error(res)
+            # NOTE: consistent with _search, other errors yield no results
+            if res.status_code != 200:
+                return
+            yield from self._decode_lines(
+                res, lambda line: OdinsonBaseAPI._decode_score_doc(line, raw=raw)
+            )
+
+    @staticmethod
+    def _decode_score_doc(
+        line: Union[bytes, str], raw: bool
+    ) -> Union[ScoreDoc, RawScoreDoc]:
+        return decode(ScoreDoc, line) if not raw else loads(line)
+
+    @staticmethod
+    def _decode_results(
+        res: requests.Response, raw: bool
+    ) -> Union[Results, RawResults]:
+        OdinsonBaseAPI._raise_for_server_error(res)
+        # NOTE: a rejected query (4xx) has no results
+        if res.status_code != 200:
+            empty = Results.empty()
+            return empty if not raw else empty.model_dump(by_alias=True)
+        return decode(Results, res.content) if not raw else loads(res.content)
+
+    @staticmethod
+    def _search_params(
+        odinson_query: str,
+        metadata_query: Optional[str],
+        label: Optional[str],
+        commit: bool,
+        prev_doc: Optional[int],
+        prev_score: Optional[float],
+    ) -> Dict[str, Any]:
+        """Query string parameters for /api/execute/pattern"""
         params = {
             "odinsonQuery": odinson_query,
             "metadataQuery": metadata_query,
             "label": label,
-            "commit": commit,
+            # NOTE: Play expects lowercase booleans
+            "commit": "true" if commit else None,
+            # NOTE: 0 is a valid cursor
             "prevDoc": prev_doc,
             "prevScore": prev_score,
         }
-        params = {k: v for (k, v) in params.items() if v}
-        # print(params)
-        res = requests.get(endpoint, params=params)
-        # print(res)
-        return Results.empty() if res.status_code != 200 else Results(**res.json())
+        return {k: v for (k, v) in params.items() if v is not None}
 
     def execute_grammar(
         self,
@@ -273,7 +863,9 @@ class OdinsonBaseAPI:
         metadata_query: Optional[str] = None,
         max_docs: Optional[int] = 20,
         allow_trigger_overlaps: bool = False,
-    ):
+        # Whether to skip validation and return the JSON response as-is.
+        raw: bool = False,
+    ) -> Union[GrammarResults, RawGrammarResults]:
         endpoint = f"{self.address}/api/execute/grammar"
         params = {
             "metadataQuery" : metadata_query,
@@ -283,7 +875,65 @@ class OdinsonBaseAPI:
         res = self._post_text(endpoint=endpoint, text=grammar, params=params)
         # return GrammarResults.empty() if res.status_code != 200 else GrammarResults(**res.json())
         # FIXME: check status code and return error or empty results?
-        return GrammarResults(**res.json())
+        return self._decode(
+            res, lambda data: decode(GrammarResults, data) if not raw else loads(data)
+        )
+
+    @staticmethod
+    def _grammar_stream_params(
+        metadata_query: Optional[str],
+        max_docs: Optional[int],
+        allow_trigger_overlaps: bool,
+        label: Optional[str],
+    ) -> Dict[str, Any]:
+        """Query string parameters for /api/execute/grammar/stream"""
+        params = {
+            "metadataQuery": metadata_query,
+            "maxDocs": max_docs,
+            # NOTE: Play expects lowercase booleans
+            "allowTriggerOverlaps": "true" if allow_trigger_overlaps else None,
+            "label": label,
+        }
+        return {k: v for (k, v) in params.items() if v is not None}
+
+    @staticmethod
+    def _decode_mention(
+        line: Union[bytes, str], raw: bool
+    ) -> Union[BaseMention, RawMention]:
+        return decode(BaseMention, line) if not raw else loads(line)
+
+    def iter_grammar(
+        self,
+        grammar: str,
+        # A query to filter Documents by their metadata before applying an Odinson pattern.
+        metadata_query: Optional[str] = None,
+        # The maximum number of sentences to execute the rules against (None for every sentence).
+        max_docs: Optional[int] = None,
+        allow_trigger_overlaps: bool = False,
+        # Only yield mentions with this label.
+        label: Optional[str] = None,
+        # Whether to skip validation and yield each mention as a plain dict (see RawMention).
+        raw: bool = False,
+    ) -> Iterator[Union[BaseMention, RawMention]]:
+        """Yields each mention found by the grammar as soon as the server extracts it
+        (see /api/execute/grammar/stream), so memory stays bounded on both ends
+        regardless of the size of the corpus."""
+        endpoint = f"{self.address}/api/execute/grammar/stream"
+        params = OdinsonBaseAPI._grammar_stream_params(
+            metadata_query=metadata_query,
+            max_docs=max_docs,
+            allow_trigger_overlaps=allow_trigger_overlaps,
+            label=label,
+        )
+        with self.transport.post(
+            endpoint, data=grammar, params=params, stream=True
+        ) as res:
+            OdinsonBaseAPI._raise_for_server_error(res)
+            if res.status_code != 200:
+                raise Exception(f"{res.status_code}: {res.text}")
+            yield from self._decode_lines(
+                res, lambda line: OdinsonBaseAPI._decode_mention(line, raw=raw)
+            )
 
     def search(
         self,
@@ -301,38 +951,57 @@ class OdinsonBaseAPI:
         prev_doc: Optional[int] = None,
         # The score for the last result seen in the previous page of results.
         prev_score: Optional[float] = None,
-    ) -> Iterator[ScoreDoc]:
-        endpoint = f"{self.address}/api/execute/pattern"
-        seen = 0
-        results: Results = self._search(
+        # Number of pages to request ahead of the consumer (0 disables prefetching).
+        prefetch: int = 0,
+        # Whether to skip validation and yield each hit as a plain dict (see RawScoreDoc).
+        raw: bool = False,
+        # Whether to receive every hit from a single streaming request (see /api/execute/pattern/stream)
+        # instead of requesting one page at a time.
+        stream: bool = False,
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        if stream:
+            if commit:
+                raise ValueError("commit is not supported when streaming")
+            yield from self._stream(
+                odinson_query=odinson_query,
+                metadata_query=metadata_query,
+                prev_doc=prev_doc,
+                prev_score=prev_score,
+                raw=raw,
+            )
+            return
+        fetch = lambda doc, score: self._search(
             odinson_query=odinson_query,
             metadata_query=metadata_query,
             label=label,
             commit=commit,
-            prev_doc=prev_doc,
+            prev_doc=doc,
+            prev_score=score,
+            raw=raw,
         )
-        total = results.total_hits
-        if total == 0:
-            return iter(())
-        last = results.score_docs[-1]
-        while seen < total:
-            for sd in results.score_docs:
-                seen += 1
-                last = sd
-                # print(f"{seen-1}/{total}")
-                # print(f"sd.document_id:\t{sd.document_id}")
-                # print(f"sd.sentence_id:\t{sd.sentence_id}\n")
-                # FIXME: should this be a Results() with a single doc?
-                yield sd
-            # paginate
-            results: Results = self._search(
-                odinson_query=odinson_query,
-                metadata_query=metadata_query,
-                label=label,
-                commit=commit,
-                prev_doc=last.sentence_id,
-            )
-            # print(f"total_hits:\t{results.total_hits}")
+        for results in paginate(fetch, prev_doc, prev_score, prefetch=prefetch):
+            # FIXME: should this be a Results() with a single doc?
+            yield from score_docs(results)
+
+    def _search_disjunction_of_patterns(
+        self,
+        patterns: List[str],
+        metadata_query: Optional[str] = None,
+        prev_doc: Optional[int] = None,
+        prev_score: Optional[float] = None,
+        raw: bool = False,
+    ) -> Union[Results, RawResults]:
+        endpoint = f"{self.address}/api/execute/disjunction-of-patterns"
+        spr = SimplePatternsRequest(
+            patterns=patterns,
+            metadataQuery=metadata_query,
+            prevDoc=prev_doc,
+            prevScore=prev_score,
+        )
+        res = self.transport.post(
+            endpoint, data=encode(spr), headers=OdinsonBaseAPI._json_headers()
+        )
+        return self._decode(res, lambda _: OdinsonBaseAPI._decode_results(res, raw=raw))
 
     def search_disjunction_of_patterns(
         self,
@@ -348,45 +1017,20 @@ class OdinsonBaseAPI:
         prev_doc: Optional[int] = None,
         # The score for the last result seen in the previous page of results.
         prev_score: Optional[float] = None,
-    ) -> Iterator[ScoreDoc]:
-        endpoint = f"{self.address}/api/execute/disjunction-of-patterns"
-
-        spr = SimplePatternsRequest(
+        # Number of pages to request ahead of the consumer (0 disables prefetching).
+        prefetch: int = 0,
+        # Whether to skip validation and yield each hit as a plain dict (see RawScoreDoc).
+        raw: bool = False,
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        fetch = lambda doc, score: self._search_disjunction_of_patterns(
             patterns=patterns,
-            metadataQuery=metadata_query,
-            prevDoc=prev_doc,
-            prevScore=prev_score,
+            metadata_query=metadata_query,
+            prev_doc=doc,
+            prev_score=score,
+            raw=raw,
         )
-        results: Results = Results(**requests.post(endpoint, json=spr.dict()).json())
-
-        seen = 0
-        total = results.total_hits
-        if total == 0:
-            return iter(())
-        last = results.score_docs[-1]
-        while seen < total:
-            for sd in results.score_docs:
-                seen += 1
-                last = sd
-                # print(f"{seen-1}/{total}")
-                # print(f"sd.document_id:\t{sd.document_id}")
-                # print(f"sd.sentence_id:\t{sd.sentence_id}\n")
-                # FIXME: should this be a Results() with a single doc?
-                yield sd
-            # paginate
-            nspr = SimplePatternsRequest(
-                patterns=patterns,
-                metadata_query=metadata_query,
-                label=label,
-                prev_doc=last.sentence_id,
-            )
-            results: Results = Results(
-                **requests.post(
-                    endpoint,
-                    json=nspr.dict(),
-                ).json()
-            )
-            # print(f"total_hits:\t{results.total_hits}")
+        for results in paginate(fetch, prev_doc, prev_score, prefetch=prefetch):
+            yield from score_docs(results)
 
     # TODO: add rewrite method
     # for any token that matches the pattern, replace its entry in field <field> with <label>
@@ -0,0 +1,206 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+from lum.odinson.doc import Document
+from lum.odinson.rest.responses import BulkIndexResponse, DocumentStatus
+from lum.odinson.rest.serialization import decode, encode
+from pydantic import BaseModel
+import pydantic
+import gzip
+import itertools
+import os
+import time
+
+if TYPE_CHECKING:
+    from lum.odinson.rest.api import OdinsonBaseAPI
+
+__all__ = ["BulkIndexFailure", "BulkIndexReport", "DocOrPath"]
+
+DocOrPath = Union[Document, Text, "os.PathLike[str]"]
+
+
+class BulkIndexFailure(BaseModel):
+    # Document ID or file path
+    item: str = pydantic.Field(description="The Document ID or path that failed.")
+    error: str = pydantic.Field(description="A description of the failure.")
+
+
+class BulkIndexReport(BaseModel):
+    num_docs: int = pydantic.Field(
+        default=0, description="Number of documents successfully indexed."
+    )
+    num_sentences: int = pydantic.Field(
+        default=0, description="Number of sentences successfully indexed."
+    )
+    num_bytes: int = pydantic.Field(
+        default=0, description="Number of (serialized) bytes successfully posted."
+    )
+    elapsed: float = pydantic.Field(
+        default=0.0, description="Wall time of the run (in seconds)."
+    )
+    failures: List[BulkIndexFailure] = pydantic.Field(default_factory=list)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.num_docs / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def sentences_per_second(self) -> float:
+        return self.num_sentences / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.num_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.num_docs} docs ({self.docs_per_second:.1f} docs/s), "
+            f"{self.num_sentences} sentences ({self.sentences_per_second:.1f} sentences/s), "
+            f"{self.num_bytes} bytes ({self.bytes_per_second:.1f} bytes/s), "
+            f"{len(self.failures)} failures in {self.elapsed:.2f}s"
+        )
+
+
+def _describe(item: DocOrPath) -> str:
+    return item.id if isinstance(item, Document) else os.fspath(item)
+
+
+def _index_one(
+    api: "OdinsonBaseAPI", item: DocOrPath, max_tokens: int
+) -> Tuple[int, int]:
+    """Decodes, serializes and posts a single document.
+    Returns the number of sentences and bytes sent."""
+    doc = item if isinstance(item, Document) else Document.from_file(os.fspath(item))
+    body: bytes = encode(doc)
+    endpoint = api._index_endpoint(api.address, max_tokens)
+    headers = {"Content-type": "application/json", "Accept": "text/plain"}
+    res = api.transport.post(endpoint, data=body, headers=headers)
+    api._invalidate(doc.id)
+    if not api.status_code_to_bool(res.status_code):
+        raise Exception(f"{res.status_code}: {res.text}")
+    return len(doc.sentences), len(body)
+
+
+def bulk_index(
+    api: "OdinsonBaseAPI",
+    docs: Iterable[DocOrPath],
+    workers: int = 4,
+    max_in_flight: Optional[int] = None,
+    max_tokens: int = -1,
+) -> BulkIndexReport:
+    """Indexes documents using a bounded pool of workers.  See OdinsonBaseAPI.bulk_index"""
+    max_in_flight = max_in_flight or 2 * workers
+    report = BulkIndexReport()
+    start = time.perf_counter()
+    pending: Dict[Future, DocOrPath] = dict()
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            item = pending.pop(future)
+            try:
+                num_sentences, num_bytes = future.result()
+                report.num_docs += 1
+                report.num_sentences += num_sentences
+                report.num_bytes += num_bytes
+            except Exception as e:
+                report.failures.append(
+                    BulkIndexFailure(item=_describe(item), error=str(e))
+                )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in docs:
+            # backpressure: never pull more than max_in_flight docs from the input
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(_index_one, api, item, max_tokens)] = item
+        done, _ = wait(pending)
+        collect(done)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _batches(docs: Iterable[DocOrPath], batch_size: int) -> Iterator[List[DocOrPath]]:
+    it = iter(docs)
+    while True:
+        batch = list(itertools.islice(it, batch_size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def _ndjson(docs: List[Document]) -> bytes:
+    return b"\n".join(encode(doc) for doc in docs) + b"\n"
+
+
+def _post_batch(
+    api: "OdinsonBaseAPI", endpoint: str, docs: List[Document], compress: bool
+) -> List[DocumentStatus]:
+    """Posts docs as a single NDJSON body.  Returns the status of each document."""
+    body = _ndjson(docs)
+    headers = {"Content-type": "application/x-ndjson", "Accept": "application/json"}
+    res = api.transport.post(
+        endpoint,
+        data=gzip.compress(body, compresslevel=1) if compress else body,
+        headers=headers,
+    )
+    for doc in docs:
+        api._invalidate(doc.id)
+    if api.status_code_to_bool(res.status_code):
+        return decode(BulkIndexResponse, res.content).results
+    error = f"{res.status_code}: {res.text}"
+    return [
+        DocumentStatus(line=i + 1, id=doc.id, indexed=False, error=error)
+        for (i, doc) in enumerate(docs)
+    ]
+
+
+def index_many(
+    api: "OdinsonBaseAPI",
+    docs: Iterable[DocOrPath],
+    batch_size: int = 1000,
+    max_tokens: int = -1,
+    compress: bool = True,
+) -> BulkIndexResponse:
+    """Indexes documents in batches of NDJSON.  See OdinsonBaseAPI.index_many"""
+    endpoint = f"{api.address}/api/index/documents/maxTokensPerSentence/{max_tokens}"
+    response = BulkIndexResponse()
+    # number of documents in previous batches
+    offset = 0
+    for batch in _batches(docs, batch_size):
+        decoded: List[Document] = []
+        # position (in docs) of each decoded document
+        positions: List[int] = []
+        for i, item in enumerate(batch, start=offset + 1):
+            try:
+                decoded.append(
+                    item
+                    if isinstance(item, Document)
+                    else Document.from_file(os.fspath(item))
+                )
+                positions.append(i)
+            except Exception as e:
+                response.results.append(
+                    DocumentStatus(line=i, id=None, indexed=False, error=str(e))
+                )
+        statuses = _post_batch(api, endpoint, decoded, compress) if decoded else []
+        # lines of the body -> positions in docs
+        for status in statuses:
+            response.results.append(
+                status.model_copy(update={"line": positions[status.line - 1]})
+            )
+        offset += len(batch)
+    response.results.sort(key=lambda status: status.line)
+    response.num_indexed = sum(1 for status in response.results if status.indexed)
+    response.num_failed = len(response.results) - response.num_indexed
+    return response
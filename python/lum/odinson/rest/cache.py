@@ -0,0 +1,167 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Tuple, TypeVar
+from pydantic import BaseModel
+import pydantic
+import threading
+import time
+
+__all__ = ["CacheStats", "LRUCache"]
+
+V = TypeVar("V")
+
+# marks a missing entry (None is a valid value)
+_MISSING = object()
+
+
+class CacheStats(BaseModel):
+    hits: int = pydantic.Field(
+        default=0, description="Number of lookups found in the cache."
+    )
+    misses: int = pydantic.Field(
+        default=0,
+        description="Number of lookups not found in the cache (including expired entries).",
+    )
+    evictions: int = pydantic.Field(
+        default=0, description="Number of entries dropped to make room for new entries."
+    )
+    expirations: int = pydantic.Field(
+        default=0,
+        description="Number of entries dropped because they outlived the TTL.",
+    )
+    invalidations: int = pydantic.Field(
+        default=0,
+        description="Number of entries dropped because of writes to the index.",
+    )
+    size: int = pydantic.Field(default=0, description="Current number of entries.")
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class LRUCache:
+    """Thread-safe cache bounded by size (least recently used entries are evicted first)
+    and, optionally, by age.
+
+    Cached values are shared, so they should be treated as read-only.
+    """
+
+    DEFAULT_MAXSIZE: int = 1024
+
+    def __init__(
+        self,
+        # Max. number of entries.
+        maxsize: int = DEFAULT_MAXSIZE,
+        # Max. age of an entry (in seconds).  None means entries never expire.
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, but was {maxsize}")
+        self.maxsize: int = maxsize
+        self.ttl: Optional[float] = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (expiration time, value)
+        self._entries: OrderedDict[Hashable, Tuple[Optional[float], Any]] = (
+            OrderedDict()
+        )
+        self._stats = CacheStats()
+        # bumped by every invalidation, so that loads racing a write are not cached
+        self._generation: int = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def get_or_load(self, key: Hashable, load: Callable[[], V]) -> V:
+        """Returns the cached value for key, calling load() (outside of the lock) on a miss."""
+        with self._lock:
+            value = self._lookup(key)
+            generation = self._generation
+        if value is _MISSING:
+            value = load()
+            with self._lock:
+                stale = generation != self._generation
+            if not stale:
+                self.put(key, value)
+        return value
+
+    def get_or_load_many(
+        self, keys: Sequence[Hashable], load: Callable[[List[Hashable]], List[V]]
+    ) -> List[V]:
+        """Returns the cached value for each key, calling load(missing keys) (once and outside
+        of the lock) for any misses.  load must return one value per missing key."""
+        with self._lock:
+            values = [self._lookup(key) for key in keys]
+            generation = self._generation
+        missing = [key for key, value in zip(keys, values) if value is _MISSING]
+        if len(missing) == 0:
+            return values
+        loaded = dict(zip(missing, load(missing)))
+        with self._lock:
+            stale = generation != self._generation
+        if not stale:
+            for key, value in loaded.items():
+                self.put(key, value)
+        return [
+            loaded[key] if value is _MISSING else value
+            for key, value in zip(keys, values)
+        ]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, _MISSING) is not _MISSING:
+                self._stats.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drops every entry whose key satisfies the predicate"""
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._stats.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of the hit/miss/eviction counters"""
+        with self._lock:
+            return self._stats.model_copy(update={"size": len(self._entries)})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        # NOTE: expects the lock to be held
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return _MISSING
+        expires, value = entry
+        if expires is not None and self.clock() >= expires:
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
@@ -1,14 +1,44 @@
 from lum.odinson.rest.api import OdinsonBaseAPI
-from contextlib import closing
-from typing import List, Optional
+from lum.odinson.rest.cache import LRUCache
+from lum.odinson.rest.transport import Transport
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+from pydantic import BaseModel
+import pydantic
+import queue
 import socket
 import docker
 import tempfile
+import threading
 import shutil
 import uuid
 import time
 
-__all__ = ["DockerBasedOdinsonAPI"]
+__all__ = ["DockerBasedOdinsonAPI", "DockerOdinsonPool", "StartupMetrics"]
+
+
+class StartupMetrics(BaseModel):
+    container_start: Optional[float] = pydantic.Field(
+        default=None,
+        description="Seconds taken to create and start the container.",
+    )
+    jvm_ready: Optional[float] = pydantic.Field(
+        default=None,
+        description="Seconds from starting the container until /api/healthcheck responds.",
+    )
+    first_query: Optional[float] = pydantic.Field(
+        default=None,
+        description="Seconds taken by the first query (which opens the index).",
+    )
+
+    @property
+    def total(self) -> float:
+        return sum(
+            t
+            for t in [self.container_start, self.jvm_ready, self.first_query]
+            if t is not None
+        )
 
 
 class DockerBasedOdinsonAPI(OdinsonBaseAPI):
@@ -32,12 +62,18 @@ class DockerBasedOdinsonAPI(OdinsonBaseAPI):
         self,
         local_path: Optional[str] = None,
         image_name: str = DEFAULT_IMAGE,
-        container_name: Optional[str] = f"odinson-{uuid.uuid4()}",
+        container_name: Optional[str] = None,
         local_port: Optional[int] = None,
         keep_alive: bool = False,
         max_mem_gb: int = 2,
         file_encoding: str = "UTF-8",
         token_attributes: Optional[List[str]] = None,
+        transport: Optional[Transport] = None,
+        cache: Optional[LRUCache] = None,
+        # Whether to wait for the service to respond before returning (see wait_until_ready).
+        wait: bool = True,
+        # Max. number of seconds to wait for the service.
+        startup_timeout: float = 120.0,
     ):
         self.client = docker.from_env()
         self.temp_dir = tempfile.mkdtemp()
@@ -50,23 +86,27 @@ class DockerBasedOdinsonAPI(OdinsonBaseAPI):
         self.image_name: str = image_name
         self.local_port: int = local_port or DockerBasedOdinsonAPI.get_unused_port()
         self.keep_alive: bool = keep_alive
-        self.container_name: str = container_name
+        self.container_name: str = container_name or f"odinson-{uuid.uuid4()}"
+        self.startup = StartupMetrics()
         # if we're connecting to an existing service,
         # we need to alter some of our attributes...
         if self.is_running():
             self.container = self.client.containers.get(self.container_name)
             self.keep_alive = True
-            self.local_path: str = [
+            self.local_path = [
                 entry.get("Source")
                 for entry in self.container.attrs.get("Mounts", [])
                 if entry.get("Destination", "???")
                 == DockerBasedOdinsonAPI.ODINSON_INTERNAL_DATA_PATH
             ][0]
-            self.image_name: str = self.container.image.tags[0]
-            self.local_port: int = self.client.api.port(
-                self.container_name, DockerBasedOdinsonAPI.ODINSON_INTERNAL_PORT
-            )[0]["HostPort"]
+            self.image_name = self.container.image.tags[0]
+            self.local_port = int(
+                self.client.api.port(
+                    self.container_name, DockerBasedOdinsonAPI.ODINSON_INTERNAL_PORT
+                )[0]["HostPort"]
+            )
         else:
+            start = time.perf_counter()
             self.container = self.client.containers.run(
                 self.image_name,
                 name=self.container_name,
@@ -86,7 +126,37 @@ class DockerBasedOdinsonAPI(OdinsonBaseAPI):
                     "ODINSON_TOKEN_ATTRIBUTES": ",".join(self.token_attributes),
                 },
             )
-        super().__init__(address=f"http://127.0.0.1:{self.local_port}")
+            self.startup.container_start = time.perf_counter() - start
+        super().__init__(
+            address=f"http://127.0.0.1:{self.local_port}",
+            transport=transport,
+            cache=cache,
+        )
+        if wait:
+            try:
+                self.wait_until_ready(timeout=startup_timeout)
+            except Exception:
+                # don't leave a container behind
+                self.close()
+                raise
+
+    def wait_until_ready(
+        self,
+        timeout: float = 120.0,
+        initial_delay: float = 0.05,
+        max_delay: float = 2.0,
+    ) -> float:
+        """Polls /api/healthcheck (with exponential backoff) until the service responds, then
+        runs a first query to open the index.  Records both in `startup`."""
+        waited = super().wait_until_ready(
+            timeout=timeout, initial_delay=initial_delay, max_delay=max_delay
+        )
+        if self.startup.jvm_ready is None:
+            self.startup.jvm_ready = waited
+            start = time.perf_counter()
+            self.numdocs
+            self.startup.first_query = time.perf_counter() - start
+        return waited
 
     # def __enter__(self):
     #     return self
@@ -121,20 +191,123 @@ class DockerBasedOdinsonAPI(OdinsonBaseAPI):
         except Exception as e:
             return False
 
-    def close(self) -> bool:
+    def close(self) -> None:
         """Terminates docker container for odinson REST API service"""
+        if hasattr(self, "transport"):
+            self.transport.close()
         if self.is_running():
             try:
                 # print(f"Killing docker container {container_id} for Odinson REST API")
                 self.container.kill()
                 # self.container.remove()
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
-                return True
             except Exception as e:
                 print(f"Failed to kill {self.container_name}")
                 # print(e)
-                return False
 
     def __del__(self):
         if self.is_running() and not self.keep_alive:
             self.close()
+
+
+class DockerOdinsonPool:
+    """Keeps `size` containers (each with a fresh, empty index) started and ready, so that
+    acquiring an engine takes no longer than taking one from a queue.
+
+    Engines are not reused: each acquired engine is replaced by a new container in the
+    background, and closing the engine removes its container and index.
+
+    with DockerOdinsonPool(size=2) as pool:
+        with pool.engine() as engine:
+            engine.index(doc)
+    """
+
+    def __init__(
+        self,
+        # Number of containers kept ready.
+        size: int = 2,
+        # Max. number of seconds to wait for each container to be ready.
+        startup_timeout: float = 120.0,
+        # Passed to each DockerBasedOdinsonAPI (ex. image_name, max_mem_gb, token_attributes).
+        **engine_kwargs: Any,
+    ):
+        if "local_path" in engine_kwargs or "container_name" in engine_kwargs:
+            raise ValueError("each container of a pool gets its own index and name")
+        self.size: int = size
+        self.startup_timeout: float = startup_timeout
+        self.engine_kwargs: Dict[str, Any] = engine_kwargs
+        # startup metrics of every container started by this pool (in order of readiness)
+        self.startup_metrics: List[StartupMetrics] = []
+        # engines ready to be acquired (or the errors of containers that failed to start)
+        self._ready: "queue.Queue[Union[DockerBasedOdinsonAPI, Exception]]" = (
+            queue.Queue()
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._starter = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="odinson-pool"
+        )
+        for _ in range(size):
+            self._replenish()
+
+    def _start(self) -> None:
+        try:
+            engine = DockerBasedOdinsonAPI(
+                wait=True, startup_timeout=self.startup_timeout, **self.engine_kwargs
+            )
+        except Exception as e:
+            self._ready.put(e)
+            return
+        with self._lock:
+            self.startup_metrics.append(engine.startup)
+            if self._closed:
+                engine.close()
+                return
+        self._ready.put(engine)
+
+    def _replenish(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._starter.submit(self._start)
+
+    def acquire(self, timeout: Optional[float] = None) -> DockerBasedOdinsonAPI:
+        """Takes a ready engine (waiting up to `timeout` seconds for one), starting its
+        replacement in the background.  Close the engine once done with it."""
+        try:
+            engine = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no engine was ready after {timeout}s")
+        self._replenish()
+        if isinstance(engine, Exception):
+            raise engine
+        return engine
+
+    @contextmanager
+    def engine(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[DockerBasedOdinsonAPI]:
+        """Acquires an engine for the duration of a with block."""
+        engine = self.acquire(timeout=timeout)
+        try:
+            yield engine
+        finally:
+            engine.close()
+
+    def close(self) -> None:
+        """Stops starting containers and closes every engine that was not acquired."""
+        with self._lock:
+            self._closed = True
+        self._starter.shutdown(wait=True)
+        while True:
+            try:
+                engine = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(engine, Exception):
+                engine.close()
+
+    def __enter__(self) -> "DockerOdinsonPool":
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.close()
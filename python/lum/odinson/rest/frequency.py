@@ -0,0 +1,226 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+)
+from lum.odinson.rest.serialization import loads
+from types import ModuleType
+import importlib
+
+np: Optional[ModuleType]
+try:
+    np = importlib.import_module("numpy")
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    import numpy
+    import pandas
+    from lum.odinson.rest.api import OdinsonBaseAPI
+
+__all__ = ["FrequencyTable", "Histogram", "term_vocabulary"]
+
+# Frequency tables with hundreds of thousands of terms are decoded into columns (terms, groups,
+# frequencies) rather than one object per row.  Columns are NumPy arrays when numpy is installed
+# (see the `frequency` extra) and lists otherwise.
+
+Column = Union["numpy.ndarray", List[Any]]
+
+Order = Literal["freq", "alpha"]
+Scale = Literal["count", "log10", "percent"]
+
+# The largest rank the server accepts (ranks are inclusive Ints).
+MAX_RANK: int = 2**31 - 2
+
+
+def _column(values: List[Any], dtype: Any) -> Column:
+    return np.asarray(values, dtype=dtype) if np is not None else values
+
+
+def _concat(columns: Sequence[Column], dtype: Any) -> Column:
+    if np is not None:
+        return np.concatenate(columns) if columns else np.asarray([], dtype=dtype)
+    return [value for column in columns for value in column]
+
+
+def _rows(data: Any) -> List[Dict[str, Any]]:
+    """The rows of a frequency table or histogram.
+
+    NOTE: /api/rule-freq, /api/rule-hist and /api/term-hist wrap their rows in a second array,
+    and a field missing from the index yields an empty object.
+    """
+    if isinstance(data, dict):
+        return []
+    if len(data) == 1 and isinstance(data[0], list):
+        return data[0]
+    return data
+
+
+@dataclass
+class FrequencyTable:
+    """A frequency table in columnar form: row i is (terms[i], groups[i], frequencies[i])."""
+
+    # Terms of a token field (ex. lemma) or rule names.
+    terms: Column
+    # The term of the grouping field (ex. tag) paired with each term, if the table is grouped.
+    groups: Optional[Column]
+    # The number of occurrences of each term (potentially scaled).
+    frequencies: Column
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @staticmethod
+    def from_rows(rows: List[Dict[str, Any]]) -> FrequencyTable:
+        grouped = any("group" in row for row in rows)
+        return FrequencyTable(
+            terms=_column([row["term"] for row in rows], object),
+            groups=(
+                _column([row.get("group") for row in rows], object) if grouped else None
+            ),
+            frequencies=_column([row["frequency"] for row in rows], float),
+        )
+
+    @staticmethod
+    def from_json(data: Union[bytes, str]) -> FrequencyTable:
+        return FrequencyTable.from_rows(_rows(loads(data)))
+
+    @staticmethod
+    def concat(tables: Sequence[FrequencyTable]) -> FrequencyTable:
+        """Stacks the rows of each table (in order)."""
+        grouped = any(table.groups is not None for table in tables)
+        return FrequencyTable(
+            terms=_concat([table.terms for table in tables], object),
+            groups=(
+                _concat(
+                    [
+                        (
+                            table.groups
+                            if table.groups is not None
+                            else _column([None] * len(table), object)
+                        )
+                        for table in tables
+                    ],
+                    object,
+                )
+                if grouped
+                else None
+            ),
+            frequencies=_concat([table.frequencies for table in tables], float),
+        )
+
+    def to_dataframe(self) -> "pandas.DataFrame":
+        """The table as a pandas DataFrame (requires pandas)."""
+        import pandas
+
+        columns = {"term": self.terms, "frequency": self.frequencies}
+        if self.groups is not None:
+            columns["group"] = self.groups
+        return pandas.DataFrame(columns)
+
+
+@dataclass
+class Histogram:
+    """Histogram bins in columnar form: bin i spans [lower[i], lower[i] + widths[i])."""
+
+    # The (inclusive) lower bound of each bin.
+    lower: Column
+    # The width of each bin.
+    widths: Column
+    # The number of values in each bin (or their density, if bins have equal probability).
+    heights: Column
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    @staticmethod
+    def from_rows(rows: List[Dict[str, Any]]) -> Histogram:
+        return Histogram(
+            lower=_column([row["x"] for row in rows], float),
+            widths=_column([row["w"] for row in rows], float),
+            heights=_column([row["y"] for row in rows], float),
+        )
+
+    @staticmethod
+    def from_json(data: Union[bytes, str]) -> Histogram:
+        return Histogram.from_rows(_rows(loads(data)))
+
+    def to_dataframe(self) -> "pandas.DataFrame":
+        """The bins as a pandas DataFrame (requires pandas)."""
+        import pandas
+
+        return pandas.DataFrame(
+            {"lower": self.lower, "width": self.widths, "height": self.heights}
+        )
+
+
+def num_terms(table: FrequencyTable) -> int:
+    """Number of distinct terms (a grouped table has a row per pair of term and group)."""
+    return len(table) if table.groups is None else len(set(table.terms))
+
+
+def windows(start: int, page_size: int, count: int) -> List[range]:
+    """`count` consecutive windows of `page_size` ranks, beginning at rank `start`."""
+    return [
+        range(lo, lo + page_size)
+        for lo in range(start, start + count * page_size, page_size)
+    ]
+
+
+def collect_pages(
+    pages: Iterable[FrequencyTable], page_size: int
+) -> Optional[FrequencyTable]:
+    """Stacks pages up to (and including) the first short one, or None if every page is full."""
+    seen: List[FrequencyTable] = []
+    for page in pages:
+        seen.append(page)
+        if num_terms(page) < page_size:
+            return FrequencyTable.concat(seen)
+    return None
+
+
+def term_vocabulary(
+    api: OdinsonBaseAPI,
+    field: str,
+    group: Optional[str] = None,
+    filter: Optional[str] = None,
+    order: Order = "freq",
+    scale: Scale = "count",
+    reverse: bool = False,
+    page_size: int = 10_000,
+    workers: int = 4,
+) -> FrequencyTable:
+    """Every term of a field.  See OdinsonBaseAPI.term_vocabulary"""
+
+    def fetch(ranks: range) -> FrequencyTable:
+        return api.term_freq(
+            field=field,
+            group=group,
+            filter=filter,
+            order=order,
+            min=ranks.start,
+            max=ranks.stop - 1,
+            scale=scale,
+            reverse=reverse,
+        )
+
+    tables: List[FrequencyTable] = []
+    start = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # one wave of windows at a time, since the number of terms is unknown
+            pages = list(pool.map(fetch, windows(start, page_size, workers)))
+            last = collect_pages(pages, page_size)
+            if last is not None:
+                return FrequencyTable.concat(tables + [last])
+            tables.extend(pages)
+            start += workers * page_size
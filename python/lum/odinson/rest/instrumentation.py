@@ -0,0 +1,310 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Text, Tuple, Union
+import bisect
+import re
+import threading
+import urllib.parse
+
+__all__ = [
+    "DecodeEvent",
+    "EndpointStats",
+    "Instrumentation",
+    "RequestEvent",
+    "TimeHistogram",
+]
+
+# Where the time of a call goes:
+#   time_to_headers  connection setup (or reuse) + the server's work, until the response headers
+#   server_duration  the query time reported by the server (Results/GrammarResults.duration)
+#   wall_time        the whole request, including the transfer of the body
+#   decode_time      parsing and validating the body (pydantic)
+# Streamed responses (stream=True) are timed until their headers arrive; their size and decoding
+# time are reported once the stream ends.
+
+# Upper bounds (in seconds) of the buckets of each histogram.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# routes whose last segment is a parameter (see conf/routes)
+_PARAMETERIZED = re.compile(
+    r"(/api/(?:document|sentence|parent/sentence|metadata/document|metadata/sentence"
+    r"|delete/document|(?:index|update)/documents?/maxTokensPerSentence))/[^/]+$"
+)
+
+
+def endpoint_of(url: Text) -> str:
+    """The route of a URL, with its parameter replaced (ex. /api/sentence/:id), so that
+    endpoints don't multiply with IDs."""
+    return _PARAMETERIZED.sub(r"\1/:id", urllib.parse.urlsplit(url).path)
+
+
+def _server_duration(value: Any) -> Optional[float]:
+    """The query time reported in a decoded response, if any."""
+    duration = (
+        value.get("duration")
+        if isinstance(value, dict)
+        else getattr(value, "duration", None)
+    )
+    return float(duration) if isinstance(duration, (int, float)) else None
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """A response (or a failure to get one) from the server."""
+
+    method: str
+    endpoint: str
+    # None if no response was received (ex. the connection was refused)
+    status: Optional[int]
+    bytes_sent: int
+    bytes_received: int
+    time_to_headers: float
+    wall_time: float
+
+
+@dataclass(frozen=True)
+class DecodeEvent:
+    """The decoding (and validation) of a response body."""
+
+    method: str
+    endpoint: str
+    decode_time: float
+    server_duration: Optional[float]
+    # size of a streamed body (other bodies are counted by their RequestEvent)
+    bytes_received: int = 0
+
+
+Event = Union[RequestEvent, DecodeEvent]
+
+
+class TimeHistogram:
+    """Counts of observations (in seconds) per bucket, along with their count and sum."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds: List[float] = sorted(bounds)
+        # the last bucket is +Inf
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count of observations <= le) for each bucket, as in Prometheus."""
+        total, buckets = 0, []
+        for bound, count in zip(self.bounds + [float("inf")], self.counts):
+            total += count
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return buckets
+
+
+@dataclass
+class EndpointStats:
+    """Counters and histograms of one (method, endpoint)."""
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+    # status -> number of responses
+    responses: Dict[int, int] = field(default_factory=dict)
+    # number of requests that received no response
+    errors: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    time_to_headers: TimeHistogram = field(init=False)
+    wall_time: TimeHistogram = field(init=False)
+    server_duration: TimeHistogram = field(init=False)
+    decode_time: TimeHistogram = field(init=False)
+
+    def __post_init__(self):
+        self.time_to_headers = TimeHistogram(self.buckets)
+        self.wall_time = TimeHistogram(self.buckets)
+        self.server_duration = TimeHistogram(self.buckets)
+        self.decode_time = TimeHistogram(self.buckets)
+
+    @property
+    def requests(self) -> int:
+        return sum(self.responses.values()) + self.errors
+
+
+# (name, description) of each exported metric
+_COUNTERS = [
+    (
+        "requests_total",
+        "Requests sent (status is empty when no response was received).",
+    ),
+    ("sent_bytes_total", "Size of the request bodies."),
+    ("received_bytes_total", "Size of the response bodies."),
+]
+_HISTOGRAMS = [
+    ("time_to_headers", "Seconds until the response headers (connection + server)."),
+    ("wall_time", "Seconds of the whole request, including the transfer of the body."),
+    ("server_duration", "Query time reported by the server (seconds)."),
+    ("decode_time", "Seconds spent parsing and validating response bodies."),
+]
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for (name, value) in labels.items()
+    )
+    return ",".join(f'{name}="{value}"' for (name, value) in escaped)
+
+
+class Instrumentation:
+    """Per-endpoint counts, sizes and timings of the calls made through a Transport.
+
+    Pass one to OdinsonBaseAPI(instrumentation=...) (or Transport(instrumentation=...)).
+    Without it, calls take no measurements at all.  Hooks are called with each RequestEvent and
+    DecodeEvent (on the calling thread), and to_prometheus() exports every endpoint in the
+    Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        hooks: Sequence[Callable[[Event], None]] = (),
+        # Upper bounds (in seconds) of the buckets of each histogram.
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.hooks: List[Callable[[Event], None]] = list(hooks)
+        self.buckets: Sequence[float] = buckets
+        # (method, endpoint) -> stats
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = dict()
+        self.lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[Event], None]) -> None:
+        self.hooks.append(hook)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints.clear()
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        # NOTE: called with the lock held
+        key = (method, endpoint)
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats(buckets=self.buckets)
+        return stats
+
+    def _emit(self, event: Event) -> None:
+        for hook in self.hooks:
+            hook(event)
+
+    def requested(
+        self,
+        method: str,
+        url: Text,
+        status: Optional[int],
+        bytes_sent: int,
+        bytes_received: int,
+        time_to_headers: float,
+        wall_time: float,
+    ) -> None:
+        """Records a request (status is None if no response was received)."""
+        event = RequestEvent(
+            method=method,
+            endpoint=endpoint_of(url),
+            status=status,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+            time_to_headers=time_to_headers,
+            wall_time=wall_time,
+        )
+        with self.lock:
+            stats = self._stats(method, event.endpoint)
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.responses[status] = stats.responses.get(status, 0) + 1
+                stats.time_to_headers.observe(time_to_headers)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.wall_time.observe(wall_time)
+        self._emit(event)
+
+    def decoded(
+        self,
+        method: str,
+        url: Text,
+        decode_time: float,
+        # The decoded response (its duration, if any, is recorded as the server's query time).
+        value: Any = None,
+        bytes_received: int = 0,
+    ) -> None:
+        """Records the decoding of a response body."""
+        event = DecodeEvent(
+            method=method,
+            endpoint=endpoint_of(url),
+            decode_time=decode_time,
+            server_duration=_server_duration(value),
+            bytes_received=bytes_received,
+        )
+        with self.lock:
+            stats = self._stats(method, event.endpoint)
+            stats.decode_time.observe(decode_time)
+            if event.server_duration is not None:
+                stats.server_duration.observe(event.server_duration)
+            stats.bytes_received += bytes_received
+        self._emit(event)
+
+    def to_prometheus(self, prefix: str = "odinson_client") -> str:
+        """Every endpoint's counters and histograms in the Prometheus text format (0.0.4)."""
+        lines: List[str] = []
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            for name, description in _COUNTERS:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (method, endpoint), stats in endpoints:
+                    labels = _labels(endpoint=endpoint, method=method)
+                    if name == "requests_total":
+                        counts = [
+                            (str(s), n) for (s, n) in sorted(stats.responses.items())
+                        ]
+                        if stats.errors:
+                            counts.append(("", stats.errors))
+                        for status, count in counts:
+                            status_label = _labels(status=status)
+                            lines.append(
+                                f"{prefix}_{name}{{{labels},{status_label}}} {count}"
+                            )
+                    else:
+                        value = (
+                            stats.bytes_sent
+                            if name == "sent_bytes_total"
+                            else stats.bytes_received
+                        )
+                        lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+            for name, description in _HISTOGRAMS:
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (method, endpoint), stats in endpoints:
+                    histogram: TimeHistogram = getattr(stats, name)
+                    if histogram.count == 0:
+                        continue
+                    labels = _labels(endpoint=endpoint, method=method)
+                    for le, count in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
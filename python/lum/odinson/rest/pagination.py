@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from lum.odinson.rest.responses import RawResults, RawScoreDoc, Results, ScoreDoc
+import queue
+import threading
+
+__all__ = ["paginate", "score_docs", "total_hits", "cursor"]
+
+# validated or raw results
+Page = Union[Results, RawResults]
+
+# fetches the page following the (prevDoc, prevScore) cursor
+PageFetcher = Callable[[Optional[int], Optional[float]], Page]
+
+# marks the end of the pages produced by a prefetching thread
+_DONE = object()
+
+
+def score_docs(page: Page) -> List[Union[ScoreDoc, RawScoreDoc]]:
+    """The hits of a page"""
+    return page["scoreDocs"] if isinstance(page, dict) else page.score_docs
+
+
+def total_hits(page: Page) -> int:
+    return page["totalHits"] if isinstance(page, dict) else page.total_hits
+
+
+def cursor(score_doc: Union[ScoreDoc, RawScoreDoc]) -> Tuple[int, float]:
+    """The (prevDoc, prevScore) cursor for the page following this hit"""
+    if isinstance(score_doc, dict):
+        return score_doc["sentenceId"], score_doc["score"]
+    return score_doc.sentence_id, score_doc.score
+
+
+def _pages(
+    fetch: PageFetcher, prev_doc: Optional[int], prev_score: Optional[float]
+) -> Iterator[Page]:
+    """Follows the prevDoc/prevScore cursor one page at a time."""
+    seen = 0
+    while True:
+        results = fetch(prev_doc, prev_score)
+        yield results
+        hits = score_docs(results)
+        seen += len(hits)
+        if seen >= total_hits(results) or len(hits) == 0:
+            return
+        # the cursor for the next page is the last hit of this page
+        prev_doc, prev_score = cursor(hits[-1])
+
+
+def paginate(
+    fetch: PageFetcher,
+    prev_doc: Optional[int] = None,
+    prev_score: Optional[float] = None,
+    # Number of pages to request ahead of the consumer (0 disables prefetching).
+    prefetch: int = 0,
+) -> Iterator[Page]:
+    """Yields successive pages of (validated or raw) results.
+
+    When prefetch > 0, a background thread keeps walking the cursor while the caller
+    consumes the current page, buffering at most `prefetch` pages.  Each request still
+    waits for the page before it, since its cursor is that page's last hit.
+    """
+    if prefetch <= 0:
+        yield from _pages(fetch, prev_doc, prev_score)
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for page in _pages(fetch, prev_doc, prev_score):
+                if not put(page):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # the consumer may stop early
+        stop.set()
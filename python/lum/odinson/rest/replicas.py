@@ -0,0 +1,386 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Text,
+    TypeVar,
+    Union,
+)
+from lum.odinson.doc import AnyField, Document, Sentence
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.bulk import BulkIndexReport, DocOrPath
+from lum.odinson.rest.frequency import FrequencyTable
+from lum.odinson.rest.responses import (
+    BaseMention,
+    BulkIndexResponse,
+    CorpusInfo,
+    GrammarResults,
+    RawGrammarResults,
+    RawMention,
+    RawScoreDoc,
+    ScoreDoc,
+)
+from lum.odinson.rest.transport import Transport
+from pydantic import BaseModel
+import pydantic
+import random
+import requests
+import threading
+import time
+
+__all__ = ["ReplicaStats", "ReplicatedOdinsonAPI"]
+
+T = TypeVar("T")
+
+Strategy = Literal["least_outstanding", "latency"]
+
+
+def _is_failure(error: BaseException) -> bool:
+    """Whether an error is the replica's (it can't be reached or it failed with a 5xx) rather
+    than the call's (ex. an invalid query, or a response that doesn't validate)."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(error, requests.RequestException)
+
+
+class ReplicaStats(BaseModel):
+    address: str
+    healthy: bool = pydantic.Field(
+        description="Whether the replica currently receives reads."
+    )
+    outstanding: int = pydantic.Field(description="Number of calls in progress.")
+    latency: Optional[float] = pydantic.Field(
+        default=None,
+        description="Moving average of the duration of its calls (in seconds).",
+    )
+    num_calls: int = 0
+    num_failures: int = 0
+
+
+class Replica:
+    """An OdinsonBaseAPI for one replica along with the load and health of that replica."""
+
+    # weight of the latest call in the moving average of latencies
+    LATENCY_ALPHA: float = 0.3
+
+    def __init__(self, api: OdinsonBaseAPI):
+        self.api = api
+        self.outstanding: int = 0
+        self.latency: Optional[float] = None
+        self.num_calls: int = 0
+        self.num_failures: int = 0
+        # failures since the last successful call
+        self.consecutive_failures: int = 0
+        # ejected replicas receive no reads until this time (and a successful healthcheck)
+        self.ejected_until: Optional[float] = None
+        self.lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until is None
+
+    def available(self, now: float) -> bool:
+        """Whether the replica may receive reads (it is healthy or its ejection has ended)."""
+        until = self.ejected_until
+        return until is None or until <= now
+
+    def started(self) -> None:
+        with self.lock:
+            self.outstanding += 1
+
+    def succeeded(self, elapsed: float) -> None:
+        with self.lock:
+            self.outstanding -= 1
+            self.num_calls += 1
+            self.readmit()
+            self.latency = (
+                elapsed
+                if self.latency is None
+                else self.LATENCY_ALPHA * elapsed
+                + (1 - self.LATENCY_ALPHA) * self.latency
+            )
+
+    def failed(self, max_failures: int, eject_for: float) -> None:
+        with self.lock:
+            self.outstanding -= 1
+            self.num_calls += 1
+            self.num_failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= max_failures:
+                self.eject(eject_for)
+
+    def eject(self, eject_for: float) -> None:
+        self.ejected_until = time.monotonic() + eject_for
+
+    def readmit(self) -> None:
+        self.ejected_until = None
+        self.consecutive_failures = 0
+
+    @property
+    def stats(self) -> ReplicaStats:
+        return ReplicaStats(
+            address=self.api.address,
+            healthy=self.healthy,
+            outstanding=self.outstanding,
+            latency=self.latency,
+            num_calls=self.num_calls,
+            num_failures=self.num_failures,
+        )
+
+
+class ReplicatedOdinsonAPI:
+    """Spreads reads across replicas of the same index and sends writes to a primary.
+
+    Each read goes to the healthy replica with the fewest calls in progress (ties go to the
+    fastest), or, with strategy="latency", to a replica picked at random with odds inversely
+    proportional to its latency.  Paginated searches are pinned to a single replica, so that
+    their prevDoc cursors refer to the same index.
+
+    A replica is ejected after `max_failures` consecutive failed calls (or a failed
+    healthcheck).  Only errors of the replica count as failures: connection errors and 5xx
+    responses (other errors, ex. an invalid query, are raised right away).  Once `eject_for`
+    seconds have passed, an ejected replica receives reads again, and it is re-admitted as soon
+    as a call succeeds or its /api/healthcheck responds.  Healthchecks run every
+    `health_interval` seconds in the background (see check_health).
+    """
+
+    def __init__(
+        self,
+        # Address of the service that receives writes.
+        primary: Text,
+        # Addresses of the services that receive reads (may include the primary).
+        replicas: Sequence[Text],
+        strategy: Strategy = "least_outstanding",
+        # Number of consecutive failures after which a replica is ejected.
+        max_failures: int = 3,
+        # Min. number of seconds an ejected replica receives no reads.
+        eject_for: float = 30.0,
+        # Seconds between healthchecks of every replica (None disables the background checks).
+        health_interval: Optional[float] = 5.0,
+        # Max. seconds a healthcheck may take.
+        health_timeout: float = 1.0,
+        # Number of other replicas a failed read (other than a search) is retried on.
+        retries: int = 1,
+        # Passed to each OdinsonBaseAPI (ex. transport).
+        **kwargs: Any,
+    ):
+        if len(replicas) == 0:
+            raise ValueError("at least one replica is required")
+        self.primary = OdinsonBaseAPI(primary, **kwargs)
+        self.replicas: List[Replica] = [
+            Replica(OdinsonBaseAPI(address, **kwargs)) for address in replicas
+        ]
+        self.strategy: Strategy = strategy
+        self.max_failures: int = max_failures
+        self.eject_for: float = eject_for
+        self.health_timeout: float = health_timeout
+        self.retries: int = retries
+        # healthchecks are not retried by the transport
+        self._probe = Transport(pool_size=len(replicas), keep_alive=False, retries=0)
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+        if health_interval is not None:
+            self._checker = threading.Thread(
+                target=self._check_periodically,
+                args=(health_interval,),
+                name="odinson-replica-health",
+                daemon=True,
+            )
+            self._checker.start()
+
+    def close(self) -> None:
+        """Stops the healthchecks and releases every pooled connection."""
+        self._stop.set()
+        if self._checker is not None:
+            self._checker.join()
+        self._probe.close()
+        self.primary.close()
+        for replica in self.replicas:
+            replica.api.close()
+
+    def __enter__(self) -> ReplicatedOdinsonAPI:
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> List[ReplicaStats]:
+        return [replica.stats for replica in self.replicas]
+
+    # health
+
+    def _healthcheck(self, replica: Replica) -> bool:
+        try:
+            res = self._probe.get(
+                f"{replica.api.address}/api/healthcheck", timeout=self.health_timeout
+            )
+            return res.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def check_health(self) -> None:
+        """Probes /api/healthcheck of every replica: replicas that fail are ejected, and ejected
+        replicas that respond (once `eject_for` seconds have passed) are re-admitted."""
+        now = time.monotonic()
+        for replica in self.replicas:
+            ok = self._healthcheck(replica)
+            with replica.lock:
+                if not ok:
+                    if replica.healthy:
+                        replica.eject(self.eject_for)
+                elif not replica.healthy and replica.available(now):
+                    replica.readmit()
+
+    def _check_periodically(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.check_health()
+
+    # balancing
+
+    def _choose(self, exclude: Iterable[Replica] = ()) -> Replica:
+        excluded = set(map(id, exclude))
+        candidates = [r for r in self.replicas if id(r) not in excluded]
+        now = time.monotonic()
+        # when every replica is ejected, reads are still attempted
+        healthy = [r for r in candidates if r.available(now)] or candidates
+        if self.strategy == "latency":
+            measured = [r.latency for r in healthy if r.latency is not None]
+            # unmeasured replicas are assumed to be as fast as the fastest
+            fastest = min(measured) if measured else 1.0
+            weights = [
+                1.0 / max(r.latency if r.latency is not None else fastest, 1e-6)
+                for r in healthy
+            ]
+            return random.choices(healthy, weights=weights)[0]
+        return min(
+            healthy,
+            key=lambda r: (r.outstanding, r.latency if r.latency is not None else 0.0),
+        )
+
+    def _read(self, call: Callable[[OdinsonBaseAPI], T]) -> T:
+        """Runs a read on the chosen replica, retrying on others if the replica fails."""
+        tried: List[Replica] = []
+        while True:
+            replica = self._choose(exclude=tried)
+            tried.append(replica)
+            replica.started()
+            start = time.perf_counter()
+            try:
+                res = call(replica.api)
+            except Exception as e:
+                if not _is_failure(e):
+                    # the replica responded: any other replica would respond the same
+                    replica.succeeded(time.perf_counter() - start)
+                    raise
+                replica.failed(self.max_failures, self.eject_for)
+                if len(tried) > self.retries or len(tried) == len(self.replicas):
+                    raise
+                continue
+            replica.succeeded(time.perf_counter() - start)
+            return res
+
+    def _pinned(self, call: Callable[[OdinsonBaseAPI], Iterator[T]]) -> Iterator[T]:
+        """Runs a paginated (or streamed) read on a single replica."""
+        replica = self._choose()
+        replica.started()
+        start = time.perf_counter()
+        try:
+            yield from call(replica.api)
+        except GeneratorExit:
+            replica.succeeded(time.perf_counter() - start)
+            raise
+        except Exception as e:
+            if _is_failure(e):
+                replica.failed(self.max_failures, self.eject_for)
+            else:
+                replica.succeeded(time.perf_counter() - start)
+            raise
+        replica.succeeded(time.perf_counter() - start)
+
+    # writes
+
+    def index(self, doc: Document, max_tokens: int = -1) -> bool:
+        return self.primary.index(doc, max_tokens=max_tokens)
+
+    def bulk_index(self, docs: Iterable[DocOrPath], **kwargs: Any) -> BulkIndexReport:
+        """See OdinsonBaseAPI.bulk_index"""
+        return self.primary.bulk_index(docs, **kwargs)
+
+    def index_many(self, docs: Iterable[DocOrPath], **kwargs: Any) -> BulkIndexResponse:
+        """See OdinsonBaseAPI.index_many"""
+        return self.primary.index_many(docs, **kwargs)
+
+    def update(self, doc: Document, max_tokens: Optional[int] = None) -> bool:
+        return self.primary.update(doc, max_tokens=max_tokens)
+
+    def delete(self, doc_or_id: Union[Document, Text]) -> bool:
+        return self.primary.delete(doc_or_id)
+
+    # reads
+
+    def __len__(self) -> int:
+        return self.numdocs
+
+    @property
+    def numdocs(self) -> int:
+        return self._read(lambda api: api.numdocs)
+
+    def corpus(self) -> CorpusInfo:
+        return self._read(lambda api: api.corpus())
+
+    def sentence(self, sentence_id: int) -> Sentence:
+        return self._read(lambda api: api.sentence(sentence_id))
+
+    def document(self, document_id: str) -> Document:
+        return self._read(lambda api: api.document(document_id))
+
+    def metadata(self, id: Union[str, int]) -> List[AnyField]:
+        return self._read(lambda api: api.metadata(id))
+
+    def sentences(self, sentence_ids: Sequence[int]) -> List[Optional[Sentence]]:
+        return self._read(lambda api: api.sentences(sentence_ids))
+
+    def documents(self, document_ids: Sequence[str]) -> List[Optional[Document]]:
+        return self._read(lambda api: api.documents(document_ids))
+
+    def rule_freq(self, grammar: str, **kwargs: Any) -> FrequencyTable:
+        """See OdinsonBaseAPI.rule_freq"""
+        return self._read(lambda api: api.rule_freq(grammar, **kwargs))
+
+    def term_freq(self, field: str, **kwargs: Any) -> FrequencyTable:
+        """See OdinsonBaseAPI.term_freq"""
+        return self._read(lambda api: api.term_freq(field, **kwargs))
+
+    def execute_grammar(
+        self, grammar: str, **kwargs: Any
+    ) -> Union[GrammarResults, RawGrammarResults]:
+        """See OdinsonBaseAPI.execute_grammar"""
+        return self._read(lambda api: api.execute_grammar(grammar, **kwargs))
+
+    def search(
+        self, odinson_query: str, **kwargs: Any
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """See OdinsonBaseAPI.search.  Every page comes from the same replica."""
+        return self._pinned(lambda api: api.search(odinson_query, **kwargs))
+
+    def search_disjunction_of_patterns(
+        self, patterns: List[str], **kwargs: Any
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """See OdinsonBaseAPI.search_disjunction_of_patterns.  Every page comes from the same
+        replica."""
+        return self._pinned(
+            lambda api: api.search_disjunction_of_patterns(patterns, **kwargs)
+        )
+
+    def iter_grammar(
+        self, grammar: str, **kwargs: Any
+    ) -> Iterator[Union[BaseMention, RawMention]]:
+        """See OdinsonBaseAPI.iter_grammar"""
+        return self._pinned(lambda api: api.iter_grammar(grammar, **kwargs))
@@ -3,7 +3,12 @@ import typing
 from pydantic import BaseModel, ConfigDict
 
 
-__all__ = ["GrammarRequest", "SimplePatternsRequest"]
+__all__ = [
+    "DocumentIdsRequest",
+    "GrammarRequest",
+    "SentenceIdsRequest",
+    "SimplePatternsRequest",
+]
 
 
 class GrammarRequest(BaseModel):
@@ -45,3 +50,37 @@ class SimplePatternsRequest(BaseModel):
 
     def json(self, **kwargs):
         return self.model_dump_json(**kwargs)
+
+
+class SentenceIdsRequest(BaseModel):
+    sentenceIds: list[int]
+    pretty: typing.Optional[bool] = None
+
+    def model_dump(self, by_alias=True, **kwargs):
+        return super().model_dump(by_alias=by_alias, **kwargs)
+
+    def model_dump_json(self, by_alias=True, **kwargs):
+        return super().model_dump_json(by_alias=by_alias, **kwargs)
+
+    def dict(self, **kwargs):
+        return self.model_dump(**kwargs)
+
+    def json(self, **kwargs):
+        return self.model_dump_json(**kwargs)
+
+
+class DocumentIdsRequest(BaseModel):
+    documentIds: list[str]
+    pretty: typing.Optional[bool] = None
+
+    def model_dump(self, by_alias=True, **kwargs):
+        return super().model_dump(by_alias=by_alias, **kwargs)
+
+    def model_dump_json(self, by_alias=True, **kwargs):
+        return super().model_dump_json(by_alias=by_alias, **kwargs)
+
+    def dict(self, **kwargs):
+        return self.model_dump(**kwargs)
+
+    def json(self, **kwargs):
+        return self.model_dump_json(**kwargs)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import Dict, Iterable, List, Optional, Text, Union
 from lum.odinson.doc import Document, Sentence
-from pydantic import BaseModel, ConfigDict, model_validator
+from typing_extensions import Annotated, TypedDict
+from pydantic import BaseModel, ConfigDict, PlainValidator, field_validator
 from dataclasses import dataclass
 import pydantic
 import json
@@ -9,7 +10,20 @@ import requests
 import typing
 
 
-__all__ = ["CorpusInfo", "OdinsonErrors", "ScoreDoc", "Statistic", "Results"]
+__all__ = [
+    "BaseMention",
+    "BulkIndexResponse",
+    "CorpusInfo",
+    "DocumentStatus",
+    "OdinsonErrors",
+    "ScoreDoc",
+    "Statistic",
+    "Results",
+    "RawScoreDoc",
+    "RawResults",
+    "RawMention",
+    "RawGrammarResults",
+]
 
 # OdinsonMatch = Union["NamedCapture", "GraphTraversalMatch"]
 
@@ -26,6 +40,27 @@ class OdinsonErrors(BaseModel):
     errors: List[str]
 
 
+class DocumentStatus(BaseModel):
+    #   The (1-based) position of the document in the request.
+    line: int
+    #   The document's ID (if it could be parsed).
+    id: Optional[str] = None
+    indexed: bool
+    #   Why the document was not indexed.
+    error: Optional[str] = None
+
+
+class BulkIndexResponse(BaseModel):
+    num_indexed: int = pydantic.Field(alias="numIndexed", default=0)
+    num_failed: int = pydantic.Field(alias="numFailed", default=0)
+    results: List[DocumentStatus] = pydantic.Field(default_factory=list)
+    model_config = ConfigDict(populate_by_name=True)
+
+    @property
+    def failures(self) -> List[DocumentStatus]:
+        return [status for status in self.results if not status.indexed]
+
+
 class CorpusInfo(BaseModel):
     num_docs: int = pydantic.Field(alias="numDocs")
     corpus: str
@@ -50,8 +85,8 @@ class Statistic(BaseModel):
 
 class NamedCapture(BaseModel):
     name: str
-    label: str
-    match: Union[BaseMatch, EventMatch, NamedCaptureMatch] = pydantic.Field(
+    label: Optional[str] = None
+    match: AnyMatch = pydantic.Field(
         description="Match for capture"
         #alias="capturedMatch"
     )
@@ -68,7 +103,7 @@ class BaseMatch(BaseModel):
 
 
 class EventMatch(BaseMatch):
-    trigger: Union[EventMatch, NamedCaptureMatch, BaseMatch]
+    trigger: AnyMatch
     named_captures: List[NamedCapture] = pydantic.Field(alias="namedCaptures")
 
 
@@ -79,6 +114,27 @@ class NamedCaptureMatch(BaseMatch):
     named_captures: List[NamedCapture] = pydantic.Field(alias="namedCaptures")
 
 
+def _validate_match(value: typing.Any) -> BaseMatch:
+    """Picks the kind of match from the keys present rather than trying each kind in turn"""
+    if isinstance(value, BaseMatch):
+        return value
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a match object, but found {type(value).__name__}")
+    if "namedCaptures" in value and value["namedCaptures"] is None:
+        # the REST API uses null for events without arguments
+        value = dict(value, namedCaptures=[])
+    if "trigger" in value:
+        return EventMatch.model_validate(value)
+    elif "namedCaptures" in value:
+        return NamedCaptureMatch.model_validate(value)
+    return BaseMatch.model_validate(value)
+
+
+AnyMatch = Annotated[
+    Union[EventMatch, NamedCaptureMatch, BaseMatch], PlainValidator(_validate_match)
+]
+
+
 class ScoreDoc(BaseModel):
     sentence_id: int = pydantic.Field(
         alias="sentenceId", description="The internal ID for this Odinson Document."
@@ -93,7 +149,7 @@ class ScoreDoc(BaseModel):
         description="The index of this sentence in the parent document (0-based).",
     )
     words: List[str] = pydantic.Field(description="Tokens for the document (sentence).")
-    matches: List[Union[BaseMatch, EventMatch, NamedCaptureMatch]] = pydantic.Field(
+    matches: List[AnyMatch] = pydantic.Field(
         description="The list of matching spans for this document."
     )
 
@@ -113,7 +169,9 @@ class ScoreDoc(BaseModel):
 
 
 class BaseMention(BaseModel):
-    label: str = pydantic.Field(description="The label for this Mention")
+    label: str = pydantic.Field(
+        default="???", description="The label for this Mention"
+    )
     sentence_id: int = pydantic.Field(
         alias="sentenceId", description="The internal ID for this Odinson Document."
     )
@@ -129,18 +187,17 @@ class BaseMention(BaseModel):
     found_by: str = pydantic.Field(
         alias="foundBy", description="The name of the rule that produced this match."
     )
-    match: List[Union[EventMatch, NamedCaptureMatch, BaseMatch]] = pydantic.Field(
+    match: List[AnyMatch] = pydantic.Field(
         description="The Mention representing the match."
     )
 
-    @model_validator(mode='before')
+    # NOTE: validating the label alone (rather than the whole mention) keeps JSON validation in pydantic-core
+    @field_validator("label", mode="before")
     @classmethod
-    def validate(cls, data: typing.Any) -> typing.Any:
-        if isinstance(data, dict):
-            res = data.get("label", None)
-            if (res is None) or (isinstance(res, str) and len(res) == 0):
-              data["label"] = "???"
-        return data
+    def validate_label(cls, label: typing.Any) -> typing.Any:
+        if (label is None) or (isinstance(label, str) and len(label) == 0):
+            return "???"
+        return label
 
 
 class GrammarResults(BaseModel):
@@ -180,6 +237,64 @@ class Results(BaseModel):
         alias="scoreDocs", description="The matches"
     )
 
+    @staticmethod
+    def empty() -> Results:
+        """Results without any matches"""
+        return Results(odinsonQuery="", duration=0.0, totalHits=0, scoreDocs=[])
+
+
+# Unvalidated ("raw") results, exactly as returned by the REST API.
+# These skip pydantic validation entirely (see raw=True in OdinsonBaseAPI.search, etc.)
+
+
+class RawMatch(TypedDict, total=False):
+    start: int
+    end: int
+    text: str
+    trigger: RawMatch
+    namedCaptures: Optional[List[RawNamedCapture]]
+
+
+class RawNamedCapture(TypedDict):
+    name: str
+    label: Optional[str]
+    match: RawMatch
+
+
+class RawScoreDoc(TypedDict):
+    sentenceId: int
+    score: float
+    documentId: str
+    sentenceIndex: int
+    words: List[str]
+    matches: List[RawMatch]
+
+
+class RawResults(TypedDict):
+    odinsonQuery: str
+    metadataQuery: Optional[str]
+    duration: float
+    totalHits: int
+    scoreDocs: List[RawScoreDoc]
+
+
+class RawMention(TypedDict, total=False):
+    label: Optional[str]
+    sentenceId: int
+    documentId: str
+    sentenceIndex: int
+    words: List[str]
+    foundBy: str
+    trigger: RawMatch
+    match: List[RawMatch]
+
+
+class RawGrammarResults(TypedDict, total=False):
+    metadataQuery: Optional[str]
+    duration: float
+    allowTriggerOverlaps: bool
+    mentions: List[RawMention]
+
 
 #     # The name of the rule which matched this Mention.
 #     foundBy: Text
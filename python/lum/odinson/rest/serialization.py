@@ -0,0 +1,46 @@
+from __future__ import annotations
+from types import ModuleType
+from typing import Any, Optional, Type, TypeVar, Union
+from pydantic import BaseModel
+import importlib
+import json
+
+orjson: Optional[ModuleType]
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:
+    orjson = None
+
+__all__ = ["JSON_CONTENT_TYPE", "decode", "dumps", "encode", "loads"]
+
+# Models are encoded straight to bytes (pydantic's serializer) and validated straight from the raw response
+# (pydantic's parser), so large payloads are never materialized as intermediate Python dicts.
+# Plain JSON (counts, vocabularies, statistics, etc.) uses orjson when it is installed (see the `fast` extra).
+
+M = TypeVar("M", bound=BaseModel)
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def encode(model: BaseModel) -> bytes:
+    """Serializes a model (using its aliases) to JSON bytes"""
+    return model.model_dump_json(by_alias=True).encode("utf-8")
+
+
+def decode(model_type: Type[M], data: Union[bytes, str]) -> M:
+    """Validates a model directly from JSON"""
+    return model_type.model_validate_json(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serializes plain data to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parses plain JSON"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,339 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Text,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from lum.odinson.doc import Document
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.frequency import MAX_RANK, FrequencyTable, Order, Scale
+from lum.odinson.rest.pagination import cursor
+from lum.odinson.rest.responses import (
+    CorpusInfo,
+    GrammarResults,
+    RawGrammarResults,
+    RawScoreDoc,
+    ScoreDoc,
+)
+import hashlib
+import heapq
+import math
+
+__all__ = ["ShardCursors", "ShardedOdinsonAPI"]
+
+T = TypeVar("T")
+
+# a hit and the index of the shard it came from
+ShardHit = Tuple[int, Union[ScoreDoc, RawScoreDoc]]
+
+
+def _score(score_doc: Union[ScoreDoc, RawScoreDoc]) -> float:
+    return cursor(score_doc)[1]
+
+
+def _union(lists: Sequence[Sequence[str]]) -> List[str]:
+    """Distinct items of each list (in order of first appearance)."""
+    return list(dict.fromkeys(item for items in lists for item in items))
+
+
+class ShardCursors:
+    """The (prevDoc, prevScore) cursor of each shard, i.e., its last hit that was yielded.
+
+    Sentence IDs are only unique within a shard, so a sharded search resumes from one cursor
+    per shard rather than from a single (prevDoc, prevScore).  Pass the same ShardCursors to a
+    later search to continue where the previous one stopped.
+    """
+
+    def __init__(self, num_shards: int):
+        self.positions: List[Optional[Tuple[int, float]]] = [None] * num_shards
+
+    def advance(self, shard: int, score_doc: Union[ScoreDoc, RawScoreDoc]) -> None:
+        self.positions[shard] = cursor(score_doc)
+
+    def __getitem__(self, shard: int) -> Tuple[Optional[int], Optional[float]]:
+        position = self.positions[shard]
+        return position if position is not None else (None, None)
+
+
+class ShardedOdinsonAPI:
+    """Fans out calls to several Odinson services, each holding one shard of the corpus.
+
+    Writes are routed to a single shard by hashing the document ID.  Searches and grammars run
+    against every shard concurrently: hits are merged into a single stream ordered by score
+    (ties are broken by shard and then by sentence ID), and counts are summed.
+
+    NOTE: sentence IDs are only unique within a shard; use the document ID and sentence index
+    to identify a hit across shards.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[OdinsonBaseAPI],
+        # Number of shards called concurrently (defaults to every shard).
+        workers: Optional[int] = None,
+    ):
+        if len(shards) == 0:
+            raise ValueError("at least one shard is required")
+        self.shards: List[OdinsonBaseAPI] = list(shards)
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers or len(self.shards), thread_name_prefix="odinson-shard"
+        )
+
+    @staticmethod
+    def from_addresses(addresses: Sequence[Text], **kwargs: Any) -> ShardedOdinsonAPI:
+        """One OdinsonBaseAPI (created with kwargs) per address."""
+        return ShardedOdinsonAPI(
+            [OdinsonBaseAPI(address, **kwargs) for address in addresses]
+        )
+
+    def close(self) -> None:
+        """Releases the pooled connections of every shard."""
+        self.pool.shutdown(wait=True)
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self) -> ShardedOdinsonAPI:
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.close()
+
+    def _each(self, call: Callable[[OdinsonBaseAPI], T]) -> List[T]:
+        """Calls every shard concurrently (results are in shard order)."""
+        return list(self.pool.map(call, self.shards))
+
+    # writes
+
+    def shard_for(self, document_id: Text) -> int:
+        """The shard holding a document.
+        NOTE: a stable hash, unlike hash(), which changes across processes."""
+        digest = hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % len(self.shards)
+
+    def _shard(self, doc_or_id: Union[Document, Text]) -> OdinsonBaseAPI:
+        document_id = doc_or_id if isinstance(doc_or_id, Text) else doc_or_id.id
+        return self.shards[self.shard_for(document_id)]
+
+    def index(self, doc: Document, max_tokens: int = -1) -> bool:
+        """Indexes a Document on the shard that holds its ID"""
+        return self._shard(doc).index(doc, max_tokens=max_tokens)
+
+    def update(self, doc: Document, max_tokens: Optional[int] = None) -> bool:
+        """Updates a Document on the shard that holds its ID"""
+        return self._shard(doc).update(doc, max_tokens=max_tokens)
+
+    def delete(self, doc_or_id: Union[Document, Text]) -> bool:
+        """Removes a Document from the shard that holds its ID"""
+        return self._shard(doc_or_id).delete(doc_or_id)
+
+    def document(self, document_id: str) -> Document:
+        """Retrieves a Document from the shard that holds its ID"""
+        return self._shard(document_id).document(document_id)
+
+    # summaries
+
+    def __len__(self) -> int:
+        return self.numdocs
+
+    @property
+    def numdocs(self) -> int:
+        """Total number of documents (num. docs = num. sentences) across every shard."""
+        return sum(self._each(lambda shard: shard.numdocs))
+
+    @property
+    def tags_vocabulary(self) -> List[str]:
+        """Part-of-speech tags found in any shard."""
+        return sorted(_union(self._each(lambda shard: shard.tags_vocabulary)))
+
+    @property
+    def edge_vocabulary(self) -> List[str]:
+        """Dependencies found in any shard."""
+        return sorted(_union(self._each(lambda shard: shard.edge_vocabulary)))
+
+    def corpus(self) -> CorpusInfo:
+        """Provides a summary of every shard (sizes are summed and fields are merged)"""
+        infos = self._each(lambda shard: shard.corpus())
+        return CorpusInfo(
+            numDocs=sum(info.num_docs for info in infos),
+            corpus=",".join(_union([[info.corpus] for info in infos])),
+            # the same relation may occur in several shards
+            distinctDependencyRelations=len(self.edge_vocabulary),
+            tokenFields=_union([info.token_fields for info in infos]),
+            docFields=_union([info.doc_fields for info in infos]),
+            storedFields=_union([info.stored_fields for info in infos]),
+        )
+
+    def rule_freq(
+        self,
+        grammar: str,
+        allow_trigger_overlaps: bool = False,
+        order: Order = "freq",
+        min: int = 0,
+        max: Optional[int] = 0,
+        scale: Scale = "count",
+        reverse: bool = False,
+    ) -> FrequencyTable:
+        """See OdinsonBaseAPI.rule_freq.  The counts of every shard are summed before ranking."""
+        tables = self._each(
+            lambda shard: shard.rule_freq(
+                grammar,
+                allow_trigger_overlaps=allow_trigger_overlaps,
+                order="alpha",
+                min=0,
+                max=None,
+            )
+        )
+        counts: Dict[str, float] = dict()
+        for table in tables:
+            for term, freq in zip(table.terms, table.frequencies):
+                counts[term] = counts.get(term, 0.0) + float(freq)
+        # same order as /api/rule-freq
+        if order == "alpha":
+            ranked = sorted(counts.items())
+        else:
+            ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        if reverse:
+            ranked.reverse()
+        total = sum(counts.values())
+        ranked = ranked[min : (max if max is not None else MAX_RANK) + 1]
+        if scale == "log10":
+            ranked = [(term, math.log10(freq)) for (term, freq) in ranked]
+        elif scale == "percent":
+            ranked = [(term, freq / total) for (term, freq) in ranked]
+        return FrequencyTable.from_rows(
+            [{"term": term, "frequency": freq} for (term, freq) in ranked]
+        )
+
+    # searches
+
+    def _merge(
+        self,
+        search: Callable[
+            [OdinsonBaseAPI, Optional[int], Optional[float]],
+            Iterator[Union[ScoreDoc, RawScoreDoc]],
+        ],
+        cursors: Optional[ShardCursors],
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """Merges the hits of every shard (each already ordered by score) by score."""
+        positions = cursors or ShardCursors(len(self.shards))
+
+        def hits(i: int) -> Generator[Union[ScoreDoc, RawScoreDoc], None, None]:
+            # NOTE: closing this generator also closes the shard's
+            yield from search(self.shards[i], *positions[i])
+
+        streams = [hits(i) for i in range(len(self.shards))]
+
+        def tagged(i: int, first: Optional[Any]) -> Iterator[ShardHit]:
+            if first is None:
+                return
+            yield (i, first)
+            for score_doc in streams[i]:
+                yield (i, score_doc)
+
+        try:
+            # the first page of every shard is requested concurrently
+            firsts = list(self.pool.map(lambda s: next(s, None), streams))
+            merged = heapq.merge(
+                *[tagged(i, first) for (i, first) in enumerate(firsts)],
+                key=lambda hit: (-_score(hit[1]), hit[0], cursor(hit[1])[0]),
+            )
+            for i, score_doc in merged:
+                positions.advance(i, score_doc)
+                yield score_doc
+        finally:
+            # stops any prefetching
+            for stream in streams:
+                stream.close()
+
+    def search(
+        self,
+        odinson_query: str,
+        metadata_query: Optional[str] = None,
+        # Resume from (and keep updating) the cursor of each shard.
+        cursors: Optional[ShardCursors] = None,
+        # Number of pages each shard requests ahead of the merge (at least 1, so that shards
+        # are searched concurrently).
+        prefetch: int = 1,
+        raw: bool = False,
+        stream: bool = False,
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """See OdinsonBaseAPI.search.  Hits of every shard are merged by score."""
+        return self._merge(
+            lambda shard, prev_doc, prev_score: shard.search(
+                odinson_query=odinson_query,
+                metadata_query=metadata_query,
+                prev_doc=prev_doc,
+                prev_score=prev_score,
+                prefetch=prefetch,
+                raw=raw,
+                stream=stream,
+            ),
+            cursors,
+        )
+
+    def search_disjunction_of_patterns(
+        self,
+        patterns: List[str],
+        metadata_query: Optional[str] = None,
+        cursors: Optional[ShardCursors] = None,
+        prefetch: int = 1,
+        raw: bool = False,
+    ) -> Iterator[Union[ScoreDoc, RawScoreDoc]]:
+        """See OdinsonBaseAPI.search_disjunction_of_patterns.  Hits of every shard are merged
+        by score."""
+        return self._merge(
+            lambda shard, prev_doc, prev_score: shard.search_disjunction_of_patterns(
+                patterns=patterns,
+                metadata_query=metadata_query,
+                prev_doc=prev_doc,
+                prev_score=prev_score,
+                prefetch=prefetch,
+                raw=raw,
+            ),
+            cursors,
+        )
+
+    def execute_grammar(
+        self,
+        grammar: str,
+        metadata_query: Optional[str] = None,
+        # The maximum number of sentences to execute the rules against (per shard).
+        max_docs: Optional[int] = 20,
+        allow_trigger_overlaps: bool = False,
+        raw: bool = False,
+    ) -> Union[GrammarResults, RawGrammarResults]:
+        """See OdinsonBaseAPI.execute_grammar.  The mentions of every shard are concatenated
+        (in shard order) and the duration is that of the slowest shard."""
+        results = self._each(
+            lambda shard: shard.execute_grammar(
+                grammar,
+                metadata_query=metadata_query,
+                max_docs=max_docs,
+                allow_trigger_overlaps=allow_trigger_overlaps,
+                raw=raw,
+            )
+        )
+        if raw:
+            raw_results = cast(List[RawGrammarResults], results)
+            merged = RawGrammarResults(**raw_results[0])
+            merged["duration"] = max(res.get("duration", 0.0) for res in raw_results)
+            merged["mentions"] = [m for res in raw_results for m in res["mentions"]]
+            return merged
+        validated = cast(List[GrammarResults], results)
+        return validated[0].model_copy(
+            update={
+                "duration": max(res.duration for res in validated),
+                "mentions": [m for res in validated for m in res.mentions],
+            }
+        )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Any, Optional, Text, Tuple, Union
+from lum.odinson.rest.instrumentation import Instrumentation
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests
+import time
+
+__all__ = ["Transport"]
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+def _body_size(body: Any) -> int:
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0
+
+
+class _Retry(Retry):
+    """Also retries non-idempotent methods (ex. POST) that the server shed with a 503: a shed
+    request was rejected before any work was done, so resending it is safe."""
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        if self.status_forcelist and status_code in self.status_forcelist:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class Transport:
+    """Pooled, keep-alive HTTP transport shared by every endpoint of an OdinsonBaseAPI.
+
+    Connections to the Odinson REST service are reused across calls instead of
+    paying a TCP handshake per request.
+    """
+
+    DEFAULT_POOL_SIZE: int = 10
+    # (connect, read) in seconds.  Grammars can run for a long time, so reads are unbounded by default.
+    DEFAULT_TIMEOUT: Timeout = (10.0, None)
+    DEFAULT_RETRIES: int = 3
+    DEFAULT_BACKOFF_FACTOR: float = 0.1
+
+    def __init__(
+        self,
+        # Max. number of connections kept open per host.
+        pool_size: int = DEFAULT_POOL_SIZE,
+        # Whether or not connections should be reused across calls.
+        keep_alive: bool = True,
+        # Default timeout applied to every call (may be overridden per call).
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        # Number of times to retry on connection errors (ex. a reset of a stale pooled connection)
+        # and on 503s from a server shedding load.
+        retries: int = DEFAULT_RETRIES,
+        # Sleep for {backoff factor} * (2 ** ({number of previous retries})) seconds between retries.
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        # Records the count, size and timing of every call (see lum.odinson.rest.instrumentation).
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.pool_size: int = pool_size
+        self.keep_alive: bool = keep_alive
+        self.timeout: Timeout = timeout
+        self.retries: int = retries
+        self.backoff_factor: float = backoff_factor
+        self.instrumentation: Optional[Instrumentation] = instrumentation
+        self.session: requests.Session = Transport.mk_session(
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            retries=retries,
+            backoff_factor=backoff_factor,
+        )
+
+    @staticmethod
+    def mk_session(
+        pool_size: int, keep_alive: bool, retries: int, backoff_factor: float
+    ) -> requests.Session:
+        session = requests.Session()
+        # NOTE: read errors are only retried for idempotent methods (urllib3 default),
+        # but connection errors and 503s (after the server's Retry-After) are retried for every
+        # method.
+        retry = _Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            status_forcelist=[503],
+            respect_retry_after_header=True,
+            backoff_factor=backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def request(
+        self, method: Text, url: Text, timeout: Timeout = None, **kwargs: Any
+    ) -> requests.Response:
+        """Sends a request using a pooled connection."""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self.session.request(
+                method, url, timeout=timeout or self.timeout, **kwargs
+            )
+        return self._instrumented(
+            instrumentation, method, url, timeout=timeout, **kwargs
+        )
+
+    def _instrumented(
+        self,
+        instrumentation: Instrumentation,
+        method: Text,
+        url: Text,
+        timeout: Timeout = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            res = self.session.request(
+                method, url, timeout=timeout or self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            elapsed = time.perf_counter() - start
+            instrumentation.requested(
+                method, url, None, 0, 0, time_to_headers=elapsed, wall_time=elapsed
+            )
+            raise
+        # NOTE: the body of a streamed response is read (and counted) later
+        streamed = kwargs.get("stream", False)
+        instrumentation.requested(
+            method,
+            url,
+            res.status_code,
+            bytes_sent=_body_size(res.request.body),
+            bytes_received=0 if streamed else len(res.content),
+            time_to_headers=res.elapsed.total_seconds(),
+            wall_time=time.perf_counter() - start,
+        )
+        return res
+
+    def get(self, url: Text, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: Text, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: Text, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self.close()
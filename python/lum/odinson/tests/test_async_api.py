@@ -0,0 +1,113 @@
+from lum.odinson.rest.aio import AsyncOdinsonAPI
+from .utils import (
+    StubOdinsonServer,
+    mk_paged_search_route,
+    mk_streaming_grammar_route,
+    mk_streaming_search_route,
+    mk_term_freq_route,
+)
+import asyncio
+import httpx
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestAsyncOdinsonAPI(unittest.TestCase):
+    def test_concurrent_requests(self):
+        """AsyncOdinsonAPI should keep many requests in flight on one event loop."""
+        routes = {("GET", "/api/numdocs"): lambda req: (200, 42)}
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                return await asyncio.gather(*[api.numdocs() for _ in range(100)])
+
+        with StubOdinsonServer(routes) as server:
+            counts = asyncio.run(run(server.address))
+        self.assertEqual(counts, [42] * 100)
+
+    def test_search_paginates(self):
+        """AsyncOdinsonAPI.search should yield every hit across pages."""
+        route = mk_paged_search_route(total=25, page_size=10)
+        routes = {("GET", "/api/execute/pattern"): route}
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                return [sd async for sd in api.search("[lemma=pie]")]
+
+        with StubOdinsonServer(routes) as server:
+            hits = asyncio.run(run(server.address))
+        self.assertEqual([sd.sentence_id for sd in hits], list(range(25)))
+        self.assertTrue(all("prevScore" in p for p in route.requested[1:]))
+
+    def test_search_stream(self):
+        """AsyncOdinsonAPI.search(stream=True) should yield every hit from a single request."""
+        route = mk_streaming_search_route(total=25)
+        routes = {("GET", "/api/execute/pattern/stream"): route}
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                return [sd async for sd in api.search("[lemma=pie]", stream=True)]
+
+        with StubOdinsonServer(routes) as server:
+            hits = asyncio.run(run(server.address))
+        self.assertEqual([sd.sentence_id for sd in hits], list(range(25)))
+        self.assertEqual(len(route.requested), 1)
+
+    def test_iter_grammar(self):
+        """AsyncOdinsonAPI.iter_grammar should yield every mention from a single request."""
+        route = mk_streaming_grammar_route(total=25)
+        routes = {("POST", "/api/execute/grammar/stream"): route}
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                return [m async for m in api.iter_grammar("rules: []", max_docs=100)]
+
+        with StubOdinsonServer(routes) as server:
+            mentions = asyncio.run(run(server.address))
+        self.assertEqual([m.sentence_id for m in mentions], list(range(25)))
+        self.assertEqual(route.requested[0][0], {"maxDocs": ["100"]})
+
+    def test_term_vocabulary(self):
+        """AsyncOdinsonAPI.term_vocabulary should page through every term in rank order."""
+        route = mk_term_freq_route(total=10)
+        routes = {("GET", "/api/term-freq"): route}
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                return await api.term_vocabulary("word", page_size=4, workers=2)
+
+        with StubOdinsonServer(routes) as server:
+            table = asyncio.run(run(server.address))
+        self.assertEqual(list(table.terms), [f"term{i}" for i in range(10)])
+        self.assertEqual(len(route.requested), 4)
+
+    def test_unavailable_raises(self):
+        """AsyncOdinsonAPI lookups should raise an HTTP error for a 503 rather than decode it."""
+        unavailable = lambda req: (503, b"", {"Retry-After": "1"})
+        routes = {
+            ("GET", "/api/numdocs"): unavailable,
+            ("GET", "/api/corpus"): unavailable,
+            ("GET", "/api/sentence/1"): unavailable,
+            ("GET", "/api/document/doc-1"): unavailable,
+            ("GET", "/api/metadata/document/doc-1"): unavailable,
+            ("GET", "/api/metadata/sentence/1"): unavailable,
+        }
+
+        async def run(address):
+            async with AsyncOdinsonAPI(address) as api:
+                calls = [
+                    api.numdocs(),
+                    api.corpus(),
+                    api.sentence(1),
+                    api.document("doc-1"),
+                    api.metadata("doc-1"),
+                    api.metadata(1),
+                ]
+                return await asyncio.gather(*calls, return_exceptions=True)
+
+        with StubOdinsonServer(routes) as server:
+            errors = asyncio.run(run(server.address))
+        self.assertEqual(len(errors), 6)
+        for error in errors:
+            self.assertIsInstance(error, httpx.HTTPStatusError)
+            self.assertEqual(error.response.status_code, 503)
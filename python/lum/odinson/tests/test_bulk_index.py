@@ -0,0 +1,77 @@
+from lum import odinson  # import Document as odinson.Document
+from lum.odinson.rest.api import OdinsonBaseAPI
+from .utils import TEST_DOC_PATH, StubOdinsonServer
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestBulkIndex(unittest.TestCase):
+    def test_bulk_index(self):
+        """OdinsonBaseAPI.bulk_index() should index docs and paths, collecting failures without stopping."""
+        received = []
+
+        def index_route(req):
+            doc = json.loads(req.rfile.read(int(req.headers["Content-Length"])))
+            received.append(doc["id"])
+            return (400, b"bad doc") if doc["id"] == "bad" else (200, b"")
+
+        routes = {("POST", "/api/index/document/maxTokensPerSentence/-1"): index_route}
+        doc = odinson.Document.from_file(TEST_DOC_PATH)
+        docs = [doc.copy(id=f"doc-{i}") for i in range(20)] + [doc.copy(id="bad")]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "doc.json.gz")
+            with gzip.open(path, "wt") as out:
+                out.write(doc.copy(id="from-file").json())
+            with StubOdinsonServer(routes) as server:
+                api = OdinsonBaseAPI(server.address)
+                report = api.bulk_index(docs + [path], workers=4, max_in_flight=3)
+                api.close()
+        self.assertEqual(report.num_docs, 21)
+        self.assertEqual(report.num_sentences, 21 * len(doc.sentences))
+        self.assertEqual([f.item for f in report.failures], ["bad"])
+        self.assertIn("from-file", received)
+        self.assertTrue(report.docs_per_second > 0)
+
+    def test_index_many(self):
+        """OdinsonBaseAPI.index_many() should post batches of NDJSON and report the status of each document in order."""
+        bodies = []
+
+        def index_route(req):
+            body = gzip.decompress(req.rfile.read(int(req.headers["Content-Length"])))
+            bodies.append(body)
+            results = []
+            for i, line in enumerate(body.splitlines()):
+                doc_id = json.loads(line)["id"]
+                ok = doc_id != "bad"
+                results.append(
+                    {"line": i + 1, "id": doc_id, "indexed": ok}
+                    if ok
+                    else {"line": i + 1, "id": doc_id, "indexed": False, "error": "bad"}
+                )
+            indexed = sum(1 for r in results if r["indexed"])
+            return 200, {
+                "numIndexed": indexed,
+                "numFailed": len(results) - indexed,
+                "results": results,
+            }
+
+        routes = {("POST", "/api/index/documents/maxTokensPerSentence/-1"): index_route}
+        doc = odinson.Document.from_file(TEST_DOC_PATH)
+        docs = [doc.copy(id=f"doc-{i}") for i in range(5)]
+        docs = docs[:2] + [doc.copy(id="bad"), "missing.json"] + docs[2:]
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            res = api.index_many(docs, batch_size=3)
+            api.close()
+        # the missing file is never sent
+        self.assertEqual(len(bodies), 3)
+        self.assertEqual([len(body.splitlines()) for body in bodies], [3, 2, 1])
+        self.assertEqual([r.line for r in res.results], list(range(1, 8)))
+        self.assertEqual(res.num_indexed, 5)
+        self.assertEqual([r.line for r in res.failures], [3, 4])
+        self.assertEqual(res.results[2].id, "bad")
+        self.assertEqual(res.results[5].id, "doc-3")
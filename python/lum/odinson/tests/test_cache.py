@@ -0,0 +1,136 @@
+import json
+from lum.odinson.doc import Document
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.cache import LRUCache
+from .utils import TEST_DOC_PATH, StubOdinsonServer, odinson_json
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestLRUCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """LRUCache should evict the least recently used entry when full."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses, stats.evictions), (2, 1, 1))
+        self.assertEqual(stats.size, 2)
+
+    def test_ttl(self):
+        """LRUCache should expire entries older than the TTL."""
+        clock = FakeClock()
+        cache = LRUCache(maxsize=10, ttl=5.0, clock=clock)
+        cache.put("a", 1)
+        clock.now = 4.9
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 5.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_api_cache(self):
+        """OdinsonBaseAPI should serve repeated lookups from its cache and invalidate them on writes."""
+        calls = []
+
+        def document(req):
+            calls.append(req.path)
+            return 200, odinson_json
+
+        def update(req):
+            req.rfile.read(int(req.headers["Content-Length"]))
+            return 200, ""
+
+        routes = {
+            ("GET", "/api/document/tp-pies"): document,
+            ("GET", "/api/sentence/0"): lambda req: (200, odinson_json["sentences"][0]),
+            ("POST", "/api/update/document"): update,
+        }
+        doc = Document.from_file(TEST_DOC_PATH)
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address, cache=LRUCache(maxsize=10))
+            for _ in range(3):
+                self.assertEqual(api.document("tp-pies"), doc)
+                api.sentence(0)
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(api.update(doc))
+            self.assertEqual(api.document("tp-pies"), doc)
+            self.assertEqual(len(calls), 2)
+            api.close()
+        stats = api.cache.stats
+        self.assertEqual((stats.hits, stats.misses), (4, 3))
+        # the cached document and sentence
+        self.assertEqual(stats.invalidations, 2)
+
+    def test_batched_lookups(self):
+        """OdinsonBaseAPI.sentences should chunk, deduplicate and cache batched lookups."""
+        requested = []
+
+        def sentences(req):
+            ids = json.loads(req.rfile.read(int(req.headers["Content-Length"])))[
+                "sentenceIds"
+            ]
+            requested.append(ids)
+            sentence = odinson_json["sentences"][0]
+            return 200, [sentence if i < 10 else None for i in ids]
+
+        def metadata(req):
+            ids = json.loads(req.rfile.read(int(req.headers["Content-Length"])))[
+                "documentIds"
+            ]
+            requested.append(ids)
+            return 200, [odinson_json["metadata"] for _ in ids]
+
+        routes = {
+            ("POST", "/api/sentences"): sentences,
+            ("POST", "/api/metadata/documents"): metadata,
+        }
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address, cache=LRUCache(maxsize=100))
+            results = api.sentences([3, 1, 3, 12, 2], chunk_size=2)
+            # one result per ID (in order), None for IDs that were not found
+            self.assertEqual(len(results), 5)
+            self.assertIs(results[0], results[2])
+            self.assertIsNone(results[3])
+            self.assertEqual(requested, [[3, 1], [12, 2]])
+            # only the misses are requested
+            self.assertEqual(len(api.sentences([1, 4, 2])), 3)
+            self.assertEqual(requested[-1], [4])
+            # metadata by document ID
+            metadata = api.metadata_many(["tp-pies"])
+            self.assertEqual(len(metadata[0]), len(odinson_json["metadata"]))
+            api.close()
+
+    def test_summaries_revalidate(self):
+        """OdinsonBaseAPI should revalidate vocabularies with If-None-Match."""
+        requested = []
+        etag = {"value": '"v1"'}
+
+        def vocabulary(req):
+            requested.append(req.headers.get("If-None-Match"))
+            if req.headers.get("If-None-Match") == etag["value"]:
+                return 304, b"", {"ETag": etag["value"]}
+            return 200, ["nsubj", "dobj"], {"ETag": etag["value"]}
+
+        routes = {("GET", "/api/dependencies-vocabulary"): vocabulary}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            first = api.edge_vocabulary
+            self.assertIs(api.edge_vocabulary, first)
+            # the index changed
+            etag["value"] = '"v2"'
+            self.assertEqual(api.edge_vocabulary, first)
+            self.assertIsNot(api.edge_vocabulary, first)
+            api.close()
+        self.assertEqual(requested, [None, '"v1"', '"v1"', '"v2"'])
@@ -1,5 +1,5 @@
 from lum import odinson  # import Document as odinson.Document
-from lum.odinson.rest.docker import DockerBasedOdinsonAPI
+from lum.odinson.rest.docker import DockerBasedOdinsonAPI, DockerOdinsonPool
 from .utils import TEST_DOC_PATH
 import json
 import os
@@ -22,19 +22,10 @@ class TestDockerAPI(unittest.TestCase):
         """
         self.test_doc = odinson.Document.from_file(TEST_DOC_PATH)
         self.indexdir = tempfile.TemporaryDirectory()
+        # waits until the service is ready
         self.engine = DockerBasedOdinsonAPI(
             local_path=self.indexdir.name, keep_alive=False
         )
-        MAX_WAIT = 5
-        STEP = 0.5
-        ELAPSED = 0
-        while ELAPSED < MAX_WAIT:
-            try:
-                len(self.engine)
-            except:
-                pass
-            time.sleep(STEP)
-            ELAPSED += STEP
 
     def tearDown(self):
         """special method called after each test.
@@ -75,3 +66,23 @@ class TestDockerAPI(unittest.TestCase):
             actual == 0,
             f"index {self.indexdir.name} should not contain any docs after indexing and deleting the same doc.  Instead found {actual}",
         )
+
+    def test_startup_metrics(self):
+        """DockerBasedOdinsonAPI should record how long the service took to start."""
+        startup = self.engine.startup
+        self.assertIsNotNone(startup.container_start)
+        self.assertIsNotNone(startup.jvm_ready)
+        self.assertIsNotNone(startup.first_query)
+
+
+class TestDockerOdinsonPool(unittest.TestCase):
+    def test_acquire(self):
+        """DockerOdinsonPool should hand out ready engines with empty indices."""
+        with DockerOdinsonPool(size=1) as pool:
+            with pool.engine(timeout=120) as engine:
+                self.assertEqual(len(engine), 0)
+                engine.index(odinson.Document.from_file(TEST_DOC_PATH))
+            # the replacement has a fresh index
+            with pool.engine(timeout=120) as engine:
+                self.assertEqual(len(engine), 0)
+            self.assertGreaterEqual(len(pool.startup_metrics), 2)
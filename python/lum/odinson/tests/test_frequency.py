@@ -0,0 +1,90 @@
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.frequency import FrequencyTable, Histogram
+from .utils import StubOdinsonServer, mk_term_freq_route
+import json
+import numpy as np
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestFrequency(unittest.TestCase):
+    def test_columns(self):
+        """Frequency tables and histograms should decode into columns."""
+        table = FrequencyTable.from_json(
+            json.dumps(
+                [
+                    {"term": "NN", "group": "pies", "frequency": 3},
+                    {"term": "NN", "group": "cake", "frequency": 1},
+                    {"term": "VB", "group": "eats", "frequency": 2},
+                ]
+            )
+        )
+        self.assertEqual(list(table.terms), ["NN", "NN", "VB"])
+        self.assertEqual(list(table.groups), ["pies", "cake", "eats"])
+        np.testing.assert_array_equal(table.frequencies, [3.0, 1.0, 2.0])
+        # rule-freq and *-hist wrap their rows in a second array
+        table = FrequencyTable.from_json(
+            json.dumps([[{"term": "nouns", "frequency": 5}]])
+        )
+        self.assertIsNone(table.groups)
+        self.assertEqual(list(table.terms), ["nouns"])
+        hist = Histogram.from_json(
+            json.dumps([[{"w": 2, "x": 1, "y": 7}, {"w": 2, "x": 3, "y": 1}]])
+        )
+        np.testing.assert_array_equal(hist.lower, [1.0, 3.0])
+        np.testing.assert_array_equal(hist.heights, [7.0, 1.0])
+        # a field missing from the index
+        self.assertEqual(len(FrequencyTable.from_json("{}")), 0)
+
+    def test_frequency_endpoints(self):
+        """OdinsonBaseAPI should send frequency requests and return columns."""
+        posted = []
+
+        def rule_freq(req):
+            posted.append(
+                json.loads(req.rfile.read(int(req.headers["Content-Length"])))
+            )
+            return 200, [[{"term": "nouns", "frequency": 5.0}]]
+
+        def rule_hist(req):
+            posted.append(
+                json.loads(req.rfile.read(int(req.headers["Content-Length"])))
+            )
+            return 200, [[{"w": 1.0, "x": 5.0, "y": 1.0}]]
+
+        routes = {
+            ("GET", "/api/term-freq"): mk_term_freq_route(total=3),
+            ("GET", "/api/term-hist"): lambda req: (200, [[{"w": 1, "x": 1, "y": 3}]]),
+            ("POST", "/api/rule-freq"): rule_freq,
+            ("POST", "/api/rule-hist"): rule_hist,
+        }
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            table = api.term_freq("word")
+            hist = api.term_hist("word", bins=1)
+            rules = api.rule_freq("rules: []", max=None)
+            rule_hist = api.rule_hist("rules: []", bins=4)
+            api.close()
+        self.assertEqual(list(table.terms), ["term0", "term1", "term2"])
+        self.assertEqual(list(hist.heights), [3.0])
+        self.assertEqual(list(rules.terms), ["nouns"])
+        self.assertEqual(list(rule_hist.lower), [5.0])
+        # max=None asks for every rule
+        self.assertEqual(posted[0]["max"], 2**31 - 2)
+        self.assertEqual(posted[1]["bins"], 4)
+
+    def test_term_vocabulary(self):
+        """OdinsonBaseAPI.term_vocabulary should page through every term in rank order."""
+        route = mk_term_freq_route(total=22)
+        routes = {("GET", "/api/term-freq"): route}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            table = api.term_vocabulary("word", page_size=4, workers=3)
+            api.close()
+        self.assertEqual(list(table.terms), [f"term{i}" for i in range(22)])
+        np.testing.assert_array_equal(table.frequencies, np.arange(22, 0, -1))
+        # two waves of 3 windows (the 7th window is never requested)
+        self.assertEqual(len(route.requested), 6)
+        self.assertEqual(
+            sorted(int(p["min"][0]) for p in route.requested), [0, 4, 8, 12, 16, 20]
+        )
@@ -0,0 +1,104 @@
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.instrumentation import (
+    DecodeEvent,
+    Instrumentation,
+    RequestEvent,
+    endpoint_of,
+)
+from lum.odinson.rest.transport import Transport
+from .utils import StubOdinsonServer, mk_paged_search_route, mk_streaming_search_route
+import socket
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestInstrumentation(unittest.TestCase):
+    def test_endpoint_of(self):
+        """endpoint_of should replace the parameter of a route."""
+        self.assertEqual(
+            endpoint_of("http://host:9000/api/sentence/12"), "/api/sentence/:id"
+        )
+        self.assertEqual(
+            endpoint_of("http://host/odinson/api/metadata/document/doc-1"),
+            "/odinson/api/metadata/document/:id",
+        )
+        self.assertEqual(
+            endpoint_of("http://host:9000/api/execute/pattern?odinsonQuery=x"),
+            "/api/execute/pattern",
+        )
+
+    def test_disabled(self):
+        """OdinsonBaseAPI should take no measurements without an Instrumentation."""
+        routes = {("GET", "/api/numdocs"): lambda req: (200, 3)}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            self.assertIsNone(api.instrumentation)
+            self.assertEqual(api.numdocs, 3)
+            api.close()
+
+    def test_records_each_endpoint(self):
+        """Instrumentation should record counts, sizes and timings per endpoint."""
+        events = []
+        instrumentation = Instrumentation(hooks=[events.append])
+        routes = {
+            ("GET", "/api/numdocs"): lambda req: (200, 3),
+            ("GET", "/api/execute/pattern"): mk_paged_search_route(5, page_size=2),
+            ("GET", "/api/execute/pattern/stream"): mk_streaming_search_route(4),
+        }
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address, instrumentation=instrumentation)
+            self.assertEqual(api.numdocs, 3)
+            self.assertEqual(len(list(api.search("[lemma=pie]"))), 5)
+            self.assertEqual(len(list(api.search("[lemma=pie]", stream=True))), 4)
+            api.close()
+        pages = instrumentation.endpoints[("GET", "/api/execute/pattern")]
+        self.assertEqual(pages.responses, {200: 3})
+        self.assertEqual(pages.wall_time.count, 3)
+        self.assertEqual(pages.decode_time.count, 3)
+        # reported by the server
+        self.assertEqual(pages.server_duration.count, 3)
+        self.assertAlmostEqual(pages.server_duration.sum, 0.03)
+        numdocs = instrumentation.endpoints[("GET", "/api/numdocs")]
+        self.assertEqual(numdocs.bytes_received, 1)
+        self.assertEqual(numdocs.server_duration.count, 0)
+        stream = instrumentation.endpoints[("GET", "/api/execute/pattern/stream")]
+        self.assertEqual(stream.requests, 1)
+        self.assertGreater(stream.bytes_received, 0)
+        self.assertEqual(
+            [type(e) for e in events],
+            [RequestEvent, DecodeEvent] * 5,
+        )
+
+    def test_prometheus(self):
+        """Instrumentation.to_prometheus should export counters and histograms."""
+        instrumentation = Instrumentation()
+        routes = {("GET", "/api/numdocs"): lambda req: (200, 3)}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address, instrumentation=instrumentation)
+            api.numdocs
+            api.numdocs
+            api.close()
+        # nothing listens on a port that was just released
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        refused = OdinsonBaseAPI(
+            f"http://127.0.0.1:{port}",
+            transport=Transport(retries=0, instrumentation=instrumentation),
+        )
+        with self.assertRaises(Exception):
+            refused.numdocs
+        refused.close()
+        text = instrumentation.to_prometheus()
+        labels = 'endpoint="/api/numdocs",method="GET"'
+        self.assertIn("# TYPE odinson_client_requests_total counter", text)
+        self.assertIn(f'odinson_client_requests_total{{{labels},status="200"}} 2', text)
+        self.assertIn(f'odinson_client_requests_total{{{labels},status=""}} 1', text)
+        self.assertIn("# TYPE odinson_client_wall_time_seconds histogram", text)
+        self.assertIn(
+            f'odinson_client_wall_time_seconds_bucket{{{labels},le="+Inf"}} 3', text
+        )
+        self.assertIn(f"odinson_client_decode_time_seconds_count{{{labels}}} 2", text)
+        self.assertIn(f"odinson_client_received_bytes_total{{{labels}}} 2", text)
+        # no server durations were reported
+        self.assertNotIn("odinson_client_server_duration_seconds_count", text)
@@ -1,4 +1,5 @@
 from lum import odinson  # import Document as odinson.Document
+from lum.odinson.doc import Sentence, Token
 from .utils import TEST_DOC_PATH
 import json
 import os
@@ -16,6 +17,40 @@ class TestOdinsonSentence(unittest.TestCase):
             len(s.lemma) > 0, f"s.lemma should not be empty, but returned {s.lemma}"
         )
 
+    def test_lazy_tokens(self):
+        """odinson.Sentence should only materialize tokens on first access."""
+        od = odinson.Document.from_file(TEST_DOC_PATH)
+        s = od.sentences[0]
+        self.assertNotIn("tokens", s.__dict__)
+        self.assertEqual(len(s.tokens), s.numTokens)
+        self.assertIs(s.tokens, s.tokens, "tokens should be cached after first access")
+        self.assertEqual(s.tokens[0].lemma, s.lemma[0])
+        self.assertEqual(s, odinson.Document.from_file(TEST_DOC_PATH).sentences[0])
+        self.assertRaises(AttributeError, getattr, s, "not_a_field")
+
+    def test_token_view(self):
+        """odinson.Token should read its attributes from the columns of its odinson.Sentence."""
+        od = odinson.Document.from_file(TEST_DOC_PATH)
+        s = od.sentences[0]
+        tok = s.tokens[1]
+        self.assertEqual(tok.lemma, s.lemma[1])
+        self.assertEqual(s.tokens[-1].raw, s.raw[-1])
+        self.assertFalse(
+            hasattr(tok, "__dict__"), "Token should not have a per-token dict"
+        )
+        same = Token(**tok.to_dict())
+        self.assertEqual(tok, same)
+        self.assertEqual(hash(tok), hash(same))
+        self.assertRaises(AttributeError, getattr, tok, "not_a_field")
+
+    def test_from_tokens(self):
+        """Sentence.from_tokens() should recover the token attributes of a sentence."""
+        od = odinson.Document.from_file(TEST_DOC_PATH)
+        s = od.sentences[0]
+        s2 = Sentence.from_tokens(list(s.tokens))
+        self.assertEqual(s2.numTokens, s.numTokens)
+        self.assertEqual(s2.lemma, s.lemma)
+
     def test_copy_empty_fields(self):
         """odinson.Sentence.copy() should fail if fields are empty."""
         od = odinson.Document.from_file(TEST_DOC_PATH)
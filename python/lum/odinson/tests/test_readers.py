@@ -0,0 +1,62 @@
+from lum.odinson.doc import Document
+from lum.odinson.readers import read_documents
+from .utils import TEST_DOC_PATH, odinson_json
+import gzip
+import json
+import os
+import tarfile
+import tempfile
+import unittest
+
+
+def mk_doc_json(doc_id: str) -> str:
+    return json.dumps(dict(odinson_json, id=doc_id))
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestReaders(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, "corpus")
+        os.makedirs(os.path.join(self.corpus, "nested"))
+        with open(os.path.join(self.corpus, "a.jsonl"), "w") as f:
+            f.write("\n".join(mk_doc_json(f"a{i}") for i in range(3)) + "\n\n")
+        with gzip.open(os.path.join(self.corpus, "b.jsonl.gz"), "wt") as f:
+            f.write("\n".join(mk_doc_json(f"b{i}") for i in range(2)))
+        with gzip.open(os.path.join(self.corpus, "nested", "c.json.gz"), "wt") as f:
+            f.write(mk_doc_json("c"))
+        # ignored
+        with open(os.path.join(self.corpus, "README.md"), "w") as f:
+            f.write("not a document")
+        self.archive = os.path.join(self.tmp.name, "corpus.tar.gz")
+        with tarfile.open(self.archive, "w:gz") as tar:
+            tar.add(self.corpus, arcname="corpus")
+        self.expected = ["a0", "a1", "a2", "b0", "b1", "c"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_from_file(self):
+        """Document.from_file() should load a (gzipped) Document."""
+        doc = Document.from_file(os.path.join(self.corpus, "nested", "c.json.gz"))
+        self.assertEqual(doc.id, "c")
+        self.assertEqual(doc.sentences, Document.from_file(TEST_DOC_PATH).sentences)
+
+    def test_read_directory(self):
+        """read_documents() should yield every Document under a directory in order."""
+        ids = [doc.id for doc in read_documents(self.corpus)]
+        self.assertEqual(ids, self.expected)
+
+    def test_read_tar(self):
+        """read_documents() should yield every Document in a tar archive."""
+        ids = sorted(doc.id for doc in read_documents(self.archive))
+        self.assertEqual(ids, self.expected)
+
+    def test_read_in_process_pool(self):
+        """read_documents() should yield the same Documents when decoding in a process pool."""
+        docs = list(read_documents(self.corpus, workers=2, window=2))
+        self.assertEqual([doc.id for doc in docs], self.expected)
+        self.assertEqual(docs, list(read_documents(self.corpus)))
+        # stopping early should not hang
+        first = next(iter(read_documents(self.corpus, workers=2)))
+        self.assertEqual(first.id, "a0")
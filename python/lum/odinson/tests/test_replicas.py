@@ -0,0 +1,179 @@
+from contextlib import ExitStack
+from lum.odinson.doc import Document
+from lum.odinson.rest.replicas import ReplicatedOdinsonAPI
+from .utils import TEST_DOC_PATH, StubOdinsonServer, mk_paged_search_route
+import json
+import pydantic
+import threading
+import time
+import unittest
+
+
+def mk_services(*routes):
+    """Starts a stub server for each service's routes"""
+    stack = ExitStack()
+    servers = [stack.enter_context(StubOdinsonServer(r)) for r in routes]
+    return stack, [server.address for server in servers]
+
+
+def mk_numdocs_route(numdocs, healthy):
+    def route(req):
+        return (200, numdocs) if healthy.is_set() else (503, b"")
+
+    return route
+
+
+def mk_healthcheck_route(healthy):
+    def route(req):
+        return (200, "") if healthy.is_set() else (503, "")
+
+    return route
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestReplicatedOdinsonAPI(unittest.TestCase):
+    def test_least_outstanding(self):
+        """ReplicatedOdinsonAPI should send a read to the replica with the fewest calls in progress."""
+        received, release = threading.Event(), threading.Event()
+
+        def slow_numdocs(req):
+            received.set()
+            release.wait(timeout=5)
+            return 200, 1
+
+        stack, addresses = mk_services(
+            {("GET", "/api/numdocs"): slow_numdocs},
+            {("GET", "/api/numdocs"): lambda req: (200, 2)},
+        )
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0], addresses, health_interval=None
+        ) as api:
+            results = []
+            slow = threading.Thread(target=lambda: results.append(api.numdocs))
+            slow.start()
+            received.wait(timeout=5)
+            self.assertEqual(api.numdocs, 2)
+            release.set()
+            slow.join()
+            self.assertEqual(results, [1])
+            self.assertEqual([s.num_calls for s in api.stats], [1, 1])
+            self.assertEqual([s.outstanding for s in api.stats], [0, 0])
+
+    def test_ejection(self):
+        """ReplicatedOdinsonAPI should eject a failing replica and re-admit it once healthy."""
+        healthy = [threading.Event(), threading.Event()]
+        healthy[1].set()
+        routes = [
+            {
+                ("GET", "/api/numdocs"): mk_numdocs_route(i + 1, healthy[i]),
+                ("GET", "/api/healthcheck"): mk_healthcheck_route(healthy[i]),
+            }
+            for i in range(2)
+        ]
+        stack, addresses = mk_services(*routes)
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0],
+            addresses,
+            max_failures=1,
+            eject_for=0.5,
+            health_interval=None,
+        ) as api:
+            # retried on the other replica
+            self.assertEqual(api.numdocs, 2)
+            self.assertEqual([s.healthy for s in api.stats], [False, True])
+            self.assertEqual(api.numdocs, 2)
+            self.assertEqual([s.num_failures for s in api.stats], [1, 0])
+            # still failing its healthcheck
+            api.check_health()
+            self.assertEqual([s.healthy for s in api.stats], [False, True])
+            time.sleep(0.5)
+            healthy[0].set()
+            healthy[1].clear()
+            api.check_health()
+            self.assertEqual([s.healthy for s in api.stats], [True, False])
+            self.assertEqual(api.numdocs, 1)
+
+    def test_readmitted_after_success(self):
+        """ReplicatedOdinsonAPI should try an ejected replica again once `eject_for` has
+        passed, and re-admit it when a call succeeds."""
+        healthy = [threading.Event(), threading.Event()]
+        healthy[1].set()
+        routes = [
+            {("GET", "/api/numdocs"): mk_numdocs_route(i + 1, healthy[i])}
+            for i in range(2)
+        ]
+        stack, addresses = mk_services(*routes)
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0],
+            addresses,
+            max_failures=1,
+            eject_for=0.2,
+            health_interval=None,
+        ) as api:
+            self.assertEqual(api.numdocs, 2)
+            self.assertEqual([s.healthy for s in api.stats], [False, True])
+            healthy[0].set()
+            time.sleep(0.2)
+            # unmeasured, so it counts as the fastest
+            self.assertEqual(api.numdocs, 1)
+            self.assertEqual([s.healthy for s in api.stats], [True, True])
+
+    def test_call_errors_are_not_failures(self):
+        """ReplicatedOdinsonAPI should raise a call's own errors (ex. a response that doesn't
+        validate) without retrying them or ejecting the replica."""
+        requested = [[], []]
+
+        def mk_sentence_route(i):
+            def route(req):
+                requested[i].append(req.path)
+                return 200, {"numTokens": "many"}
+
+            return route
+
+        stack, addresses = mk_services(
+            *[{("GET", "/api/sentence/1"): mk_sentence_route(i)} for i in range(2)]
+        )
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0], addresses, max_failures=1, health_interval=None
+        ) as api:
+            for _ in range(3):
+                with self.assertRaises(pydantic.ValidationError):
+                    api.sentence(1)
+            self.assertEqual([s.healthy for s in api.stats], [True, True])
+            self.assertEqual([s.num_failures for s in api.stats], [0, 0])
+        # each call went to a single replica
+        self.assertEqual(sum(len(paths) for paths in requested), 3)
+
+    def test_search_is_pinned(self):
+        """ReplicatedOdinsonAPI should request every page of a search from the same replica."""
+        stack, addresses = mk_services(
+            {("GET", "/api/execute/pattern"): mk_paged_search_route(5, page_size=2)},
+            {("GET", "/api/execute/pattern"): mk_paged_search_route(3, page_size=2)},
+        )
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0], addresses, health_interval=None
+        ) as api:
+            first = api.search("[lemma=pie]")
+            hits = [next(first)]
+            # the first replica is busy with the pending search
+            self.assertEqual(len(list(api.search("[lemma=pie]"))), 3)
+            hits.extend(first)
+        self.assertEqual([sd.score for sd in hits], [5.0, 4.0, 3.0, 2.0, 1.0])
+
+    def test_writes_go_to_primary(self):
+        """ReplicatedOdinsonAPI should index documents on the primary only."""
+        indexed = []
+
+        def index_route(req):
+            body = req.rfile.read(int(req.headers["Content-Length"]))
+            indexed.append(json.loads(body)["id"])
+            return 200, ""
+
+        endpoint = "/api/index/document/maxTokensPerSentence/-1"
+        stack, addresses = mk_services({("POST", endpoint): index_route}, {})
+        doc = Document.from_file(TEST_DOC_PATH)
+        with stack, ReplicatedOdinsonAPI(
+            addresses[0], addresses[1:], health_interval=None
+        ) as api:
+            self.assertTrue(api.index(doc))
+        self.assertEqual(indexed, [doc.id])
@@ -0,0 +1,55 @@
+from lum.odinson.rest.responses import (
+    BaseMatch,
+    EventMatch,
+    NamedCaptureMatch,
+    ScoreDoc,
+)
+from .utils import mk_score_doc
+import json
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestResponses(unittest.TestCase):
+    def test_match_discriminator(self):
+        """Matches should be validated as the kind of match indicated by their keys."""
+        trigger = {"start": 1, "end": 2, "text": "eats"}
+        capture = {
+            "name": "theme",
+            "label": None,
+            "match": {"start": 2, "end": 3, "text": "pies", "namedCaptures": []},
+        }
+        sd = dict(
+            mk_score_doc(0),
+            matches=[
+                {"start": 0, "end": 1, "text": "Gonzo"},
+                # events without arguments use null
+                {
+                    "start": 0,
+                    "end": 2,
+                    "text": "Gonzo eats",
+                    "trigger": trigger,
+                    "namedCaptures": None,
+                },
+                {
+                    "start": 0,
+                    "end": 3,
+                    "text": "Gonzo eats pies",
+                    "trigger": trigger,
+                    "namedCaptures": [capture],
+                },
+            ],
+        )
+        for validated in [
+            ScoreDoc.model_validate(sd),
+            ScoreDoc.model_validate_json(json.dumps(sd)),
+        ]:
+            kinds = [type(m) for m in validated.matches]
+            self.assertEqual(kinds, [BaseMatch, EventMatch, EventMatch])
+            self.assertEqual(validated.matches[1].named_captures, [])
+            self.assertIsInstance(
+                validated.matches[2].named_captures[0].match, NamedCaptureMatch
+            )
+            self.assertEqual(
+                list(validated.spans()), ["Gonzo", "Gonzo eats", "Gonzo eats pies"]
+            )
@@ -0,0 +1,122 @@
+from lum.odinson.rest.api import OdinsonBaseAPI
+from .utils import (
+    StubOdinsonServer,
+    mk_paged_search_route,
+    mk_score_doc,
+    mk_streaming_grammar_route,
+    mk_streaming_search_route,
+)
+import json
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestSearch(unittest.TestCase):
+    def test_search_threads_cursor(self):
+        """OdinsonBaseAPI.search() should page using both prevDoc and prevScore."""
+        route = mk_paged_search_route(total=45, page_size=20)
+        with StubOdinsonServer({("GET", "/api/execute/pattern"): route}) as server:
+            api = OdinsonBaseAPI(server.address)
+            hits = list(api.search("[lemma=pie]"))
+            api.close()
+        self.assertEqual([sd.sentence_id for sd in hits], list(range(45)))
+        self.assertEqual(len(route.requested), 3)
+        self.assertEqual(route.requested[1]["prevDoc"], ["19"])
+        self.assertEqual(route.requested[1]["prevScore"], ["26.0"])
+
+    def test_search_with_prefetch(self):
+        """OdinsonBaseAPI.search(prefetch=n) should yield the same hits as without prefetching."""
+        route = mk_paged_search_route(total=95, page_size=10)
+        with StubOdinsonServer({("GET", "/api/execute/pattern"): route}) as server:
+            api = OdinsonBaseAPI(server.address)
+            expected = [sd.sentence_id for sd in api.search("[lemma=pie]")]
+            for depth in [1, 3]:
+                actual = [
+                    sd.sentence_id for sd in api.search("[lemma=pie]", prefetch=depth)
+                ]
+                self.assertEqual(actual, expected)
+            # stopping early should not hang
+            first = next(iter(api.search("[lemma=pie]", prefetch=2)))
+            self.assertEqual(first.sentence_id, 0)
+            api.close()
+
+    def test_search_disjunction_of_patterns_threads_cursor(self):
+        """OdinsonBaseAPI.search_disjunction_of_patterns() should page using prevDoc, prevScore and metadataQuery."""
+        bodies = []
+
+        def route(req):
+            body = json.loads(req.rfile.read(int(req.headers["Content-Length"])))
+            bodies.append(body)
+            start = body["prevDoc"] + 1 if body.get("prevDoc") is not None else 0
+            ids = range(start, min(start + 10, 15))
+            return 200, {
+                "odinsonQuery": "",
+                "duration": 0.01,
+                "totalHits": 15,
+                "scoreDocs": [mk_score_doc(i) for i in ids],
+            }
+
+        routes = {("POST", "/api/execute/disjunction-of-patterns"): route}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            hits = list(
+                api.search_disjunction_of_patterns(
+                    ["[lemma=pie]", "[lemma=cake]"], metadata_query="year > 1990"
+                )
+            )
+            api.close()
+        self.assertEqual(len(hits), 15)
+        self.assertEqual(bodies[1]["prevDoc"], 9)
+        self.assertEqual(bodies[1]["prevScore"], 1.0)
+        self.assertEqual(bodies[1]["metadataQuery"], "year > 1990")
+
+    def test_search_raw(self):
+        """OdinsonBaseAPI.search(raw=True) should yield unvalidated hits for the same matches."""
+        route = mk_paged_search_route(total=25, page_size=10)
+        with StubOdinsonServer({("GET", "/api/execute/pattern"): route}) as server:
+            api = OdinsonBaseAPI(server.address)
+            validated = list(api.search("[lemma=pie]"))
+            raw = list(api.search("[lemma=pie]", raw=True, prefetch=1))
+            api.close()
+        self.assertTrue(all(isinstance(sd, dict) for sd in raw))
+        self.assertEqual(raw, [sd.model_dump(by_alias=True) for sd in validated])
+        self.assertEqual(route.requested[-1]["prevDoc"], ["19"])
+
+    def test_search_stream(self):
+        """OdinsonBaseAPI.search(stream=True) should yield every hit from a single streaming request."""
+        paged = mk_paged_search_route(total=45, page_size=20)
+        streamed = mk_streaming_search_route(total=45)
+        routes = {
+            ("GET", "/api/execute/pattern"): paged,
+            ("GET", "/api/execute/pattern/stream"): streamed,
+        }
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            expected = list(api.search("[lemma=pie]"))
+            hits = list(api.search("[lemma=pie]", stream=True))
+            raw = list(api.search("[lemma=pie]", stream=True, raw=True, prev_doc=39))
+            with self.assertRaises(ValueError):
+                next(api.search("[lemma=pie]", stream=True, commit=True))
+            api.close()
+        self.assertEqual(hits, expected)
+        self.assertEqual(len(streamed.requested), 2)
+        self.assertEqual([sd["sentenceId"] for sd in raw], list(range(40, 45)))
+
+    def test_iter_grammar(self):
+        """OdinsonBaseAPI.iter_grammar() should yield every mention from a single streaming request."""
+        route = mk_streaming_grammar_route(total=30)
+        routes = {("POST", "/api/execute/grammar/stream"): route}
+        grammar = "rules: []"
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            mentions = list(api.iter_grammar(grammar, label="Noun"))
+            raw = list(api.iter_grammar(grammar, raw=True, allow_trigger_overlaps=True))
+            api.address = f"{server.address}/missing"
+            with self.assertRaises(Exception):
+                next(api.iter_grammar(grammar))
+            api.close()
+        self.assertEqual([m.sentence_id for m in mentions], list(range(30)))
+        self.assertEqual(mentions[0].found_by, "nouns")
+        self.assertEqual([m["sentenceId"] for m in raw], list(range(30)))
+        self.assertEqual(route.requested[0], ({"label": ["Noun"]}, grammar))
+        self.assertEqual(route.requested[1][0], {"allowTriggerOverlaps": ["true"]})
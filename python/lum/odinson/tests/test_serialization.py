@@ -0,0 +1,71 @@
+from lum.odinson.doc import Document
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.responses import GrammarResults
+from lum.odinson.rest.serialization import decode, dumps, encode, loads
+from .utils import TEST_DOC_PATH, StubOdinsonServer, odinson_json
+import json
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestSerialization(unittest.TestCase):
+    def test_document_round_trip(self):
+        """encode() should produce the same JSON as the original Odinson Document."""
+        doc = Document.from_file(TEST_DOC_PATH)
+        data = encode(doc)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(json.loads(data), odinson_json)
+        self.assertEqual(decode(Document, data), doc)
+
+    def test_plain_json(self):
+        """dumps() and loads() should round trip plain data."""
+        data = {"grammar": "rules: []", "min": 0, "reverse": False}
+        self.assertEqual(loads(dumps(data)), data)
+
+    def test_grammar_results(self):
+        """decode() should validate GrammarResults from raw bytes."""
+        data = {
+            "duration": 0.1,
+            "allowTriggerOverlaps": False,
+            "mentions": [
+                {
+                    "label": "",
+                    "sentenceId": 1,
+                    "documentId": "d",
+                    "sentenceIndex": 0,
+                    "words": ["a", "b"],
+                    "foundBy": "r",
+                    "match": [{"start": 0, "end": 1, "text": "a"}],
+                }
+            ],
+        }
+        gr = decode(GrammarResults, json.dumps(data).encode())
+        self.assertEqual(gr, GrammarResults(**data))
+        # empty labels are replaced
+        self.assertEqual(gr.mentions[0].label, "???")
+
+    def test_requests_and_responses(self):
+        """OdinsonBaseAPI should post encoded Documents and validate responses from raw bytes."""
+        received = []
+
+        def index(req):
+            body = req.rfile.read(int(req.headers["Content-Length"]))
+            received.append((req.headers["Content-type"], body))
+            return (200, "")
+
+        routes = {
+            ("POST", "/api/index/document/maxTokensPerSentence/-1"): index,
+            ("GET", "/api/document/tp-pies"): lambda req: (200, odinson_json),
+            ("GET", "/api/metadata/document/tp-pies"): lambda req: (
+                200,
+                odinson_json["metadata"],
+            ),
+        }
+        doc = Document.from_file(TEST_DOC_PATH)
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            self.assertTrue(api.index(doc))
+            self.assertEqual(received, [("application/json", encode(doc))])
+            self.assertEqual(api.document("tp-pies"), doc)
+            self.assertEqual(api.metadata("tp-pies"), doc.metadata)
+            api.close()
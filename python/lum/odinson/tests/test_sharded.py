@@ -0,0 +1,140 @@
+from contextlib import ExitStack
+from lum.odinson.doc import Document
+from lum.odinson.rest.sharded import ShardCursors, ShardedOdinsonAPI
+from .utils import (
+    TEST_DOC_PATH,
+    StubOdinsonServer,
+    mk_mention,
+    mk_paged_search_route,
+)
+import json
+import unittest
+
+
+def mk_shards(*routes):
+    """Starts a stub server for each shard's routes"""
+    stack = ExitStack()
+    servers = [stack.enter_context(StubOdinsonServer(r)) for r in routes]
+    return stack, [server.address for server in servers]
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestShardedOdinsonAPI(unittest.TestCase):
+    def test_search_merges_by_score(self):
+        """ShardedOdinsonAPI.search should merge the hits of every shard by score."""
+        # scores 5..1 and 3..1
+        a = {("GET", "/api/execute/pattern"): mk_paged_search_route(5, page_size=2)}
+        b = {("GET", "/api/execute/pattern"): mk_paged_search_route(3, page_size=2)}
+        stack, addresses = mk_shards(a, b)
+        with stack, ShardedOdinsonAPI.from_addresses(addresses) as api:
+            cursors = ShardCursors(2)
+            hits = api.search("[lemma=pie]", cursors=cursors)
+            first = [next(hits) for _ in range(3)]
+            hits.close()
+            # resumes each shard from its own cursor
+            rest = list(api.search("[lemma=pie]", cursors=cursors))
+        self.assertEqual([sd.score for sd in first], [5.0, 4.0, 3.0])
+        self.assertEqual(cursors.positions[1], (2, 1.0))
+        self.assertEqual([sd.score for sd in rest], [3.0, 2.0, 2.0, 1.0, 1.0])
+        # ties are broken by shard
+        self.assertEqual([sd.sentence_id for sd in rest], [0, 3, 1, 4, 2])
+
+    def test_writes_are_routed(self):
+        """ShardedOdinsonAPI should index a document on a single shard (by ID)."""
+        indexed = [[], []]
+
+        def mk_index_route(shard):
+            def route(req):
+                body = req.rfile.read(int(req.headers["Content-Length"]))
+                indexed[shard].append(json.loads(body)["id"])
+                return 200, ""
+
+            return route
+
+        endpoint = "/api/index/document/maxTokensPerSentence/-1"
+        stack, addresses = mk_shards(
+            {("POST", endpoint): mk_index_route(0)},
+            {("POST", endpoint): mk_index_route(1)},
+        )
+        doc = Document.from_file(TEST_DOC_PATH)
+        with stack, ShardedOdinsonAPI.from_addresses(addresses) as api:
+            for _ in range(3):
+                self.assertTrue(api.index(doc))
+            shard = api.shard_for(doc.id)
+        self.assertEqual(indexed[shard], [doc.id] * 3)
+        self.assertEqual(indexed[1 - shard], [])
+
+    def test_aggregates(self):
+        """ShardedOdinsonAPI should sum counts across shards."""
+
+        def shard_routes(numdocs, rule_freqs, mentions):
+            def post(body):
+                def route(req):
+                    req.rfile.read(int(req.headers["Content-Length"]))
+                    return 200, body
+
+                return route
+
+            grammar_results = {
+                "duration": float(numdocs),
+                "allowTriggerOverlaps": False,
+                "mentions": mentions,
+            }
+            return {
+                ("GET", "/api/numdocs"): lambda req: (200, numdocs),
+                ("POST", "/api/rule-freq"): post(
+                    [[{"term": t, "frequency": f} for (t, f) in rule_freqs]]
+                ),
+                ("POST", "/api/execute/grammar"): post(grammar_results),
+            }
+
+        stack, addresses = mk_shards(
+            shard_routes(10, [("nouns", 3), ("verbs", 1)], [mk_mention(0)]),
+            shard_routes(32, [("adjs", 4), ("nouns", 2)], [mk_mention(1)]),
+        )
+        with stack, ShardedOdinsonAPI.from_addresses(addresses) as api:
+            numdocs = api.numdocs
+            rules = api.rule_freq("rules: []", max=None)
+            results = api.execute_grammar("rules: []")
+        self.assertEqual(numdocs, 42)
+        self.assertEqual(list(rules.terms), ["nouns", "adjs", "verbs"])
+        self.assertEqual(list(rules.frequencies), [5.0, 4.0, 1.0])
+        self.assertEqual([m.sentence_id for m in results.mentions], [0, 1])
+        self.assertEqual(results.duration, 32.0)
+
+    def test_summaries(self):
+        """ShardedOdinsonAPI should merge the vocabularies and corpus info of every shard."""
+
+        def shard_routes(name, numdocs, tags, edges, token_fields):
+            return {
+                ("GET", "/api/tags-vocabulary"): lambda req: (200, tags),
+                ("GET", "/api/dependencies-vocabulary"): lambda req: (200, edges),
+                ("GET", "/api/corpus"): lambda req: (
+                    200,
+                    {
+                        "numDocs": numdocs,
+                        "corpus": name,
+                        "distinctDependencyRelations": len(edges),
+                        "tokenFields": token_fields,
+                        "docFields": ["id"],
+                        "storedFields": ["raw"],
+                    },
+                ),
+            }
+
+        stack, addresses = mk_shards(
+            shard_routes("a", 10, ["NN", "VB"], ["nsubj", "dobj"], ["raw", "lemma"]),
+            shard_routes("b", 32, ["JJ", "NN"], ["amod", "nsubj"], ["raw", "tag"]),
+        )
+        with stack, ShardedOdinsonAPI.from_addresses(addresses) as api:
+            tags = api.tags_vocabulary
+            edges = api.edge_vocabulary
+            info = api.corpus()
+        self.assertEqual(tags, ["JJ", "NN", "VB"])
+        self.assertEqual(edges, ["amod", "dobj", "nsubj"])
+        self.assertEqual(info.num_docs, 42)
+        self.assertEqual(info.corpus, "a,b")
+        # shared relations are counted once
+        self.assertEqual(info.distinct_dependency_relations, 3)
+        self.assertEqual(info.token_fields, ["raw", "lemma", "tag"])
+        self.assertEqual(info.doc_fields, ["id"])
@@ -0,0 +1,122 @@
+from lum.odinson.rest.api import OdinsonBaseAPI
+from lum.odinson.rest.transport import Transport
+from .utils import StubOdinsonServer, mk_paged_search_route
+import requests
+import unittest
+
+
+# see https://docs.python.org/3/library/unittest.html#basic-example
+class TestTransport(unittest.TestCase):
+    def test_connection_reuse(self):
+        """OdinsonBaseAPI should reuse a single pooled connection across sequential calls."""
+        routes = {("GET", "/api/numdocs"): lambda req: (200, 42)}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            counts = [api.numdocs for _ in range(10)]
+            api.close()
+        self.assertTrue(all(c == 42 for c in counts), f"unexpected counts {counts}")
+        self.assertEqual(
+            len(server.connections),
+            1,
+            f"expected 1 connection, but found {len(server.connections)}",
+        )
+
+    def test_no_keep_alive(self):
+        """Transport(keep_alive=False) should open a new connection per call."""
+        routes = {("GET", "/api/numdocs"): lambda req: (200, 42)}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address, transport=Transport(keep_alive=False))
+            for _ in range(3):
+                api.numdocs
+            api.close()
+        self.assertEqual(len(server.connections), 3)
+
+    def test_retry_on_reset(self):
+        """Transport should retry a call when the connection is reset."""
+        attempts = []
+
+        def flaky(req):
+            attempts.append(1)
+            return (None, b"") if len(attempts) == 1 else (200, 7)
+
+        routes = {("GET", "/api/numdocs"): flaky}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(
+                server.address, transport=Transport(retries=2, backoff_factor=0)
+            )
+            self.assertEqual(api.numdocs, 7)
+            api.close()
+        self.assertEqual(len(attempts), 2)
+
+    def test_retry_on_shed(self):
+        """Transport should retry a call (even a POST) that the server shed with a 503."""
+        search = mk_paged_search_route(total=3, page_size=10)
+        attempts = []
+
+        def shedding(req):
+            attempts.append(1)
+            if len(attempts) == 1:
+                req.rfile.read(int(req.headers["Content-Length"]))
+                return 503, b"", {"Retry-After": "0"}
+            return search(req)
+
+        routes = {("POST", "/api/execute/disjunction-of-patterns"): shedding}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(
+                server.address, transport=Transport(retries=2, backoff_factor=0)
+            )
+            hits = list(api.search_disjunction_of_patterns(["[lemma=pie]"]))
+            api.close()
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual([sd.sentence_id for sd in hits], [0, 1, 2])
+
+    def test_unavailable_raises(self):
+        """A 503 that outlasts the retries should raise rather than end the results."""
+        attempts = []
+
+        def unavailable(req):
+            attempts.append(1)
+            return 503, b"", {"Retry-After": "0"}
+
+        routes = {
+            ("GET", "/api/execute/pattern"): unavailable,
+            ("GET", "/api/execute/pattern/stream"): unavailable,
+        }
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(
+                server.address, transport=Transport(retries=1, backoff_factor=0)
+            )
+            with self.assertRaises(requests.HTTPError):
+                list(api.search("[lemma=pie]"))
+            with self.assertRaises(requests.HTTPError):
+                list(api.search("[lemma=pie]", stream=True))
+            api.close()
+        self.assertEqual(len(attempts), 4)
+
+    def test_wait_until_ready(self):
+        """OdinsonBaseAPI.wait_until_ready should poll the healthcheck until it responds."""
+        probes = []
+
+        def starting(req):
+            probes.append(1)
+            # reset, then unavailable, then ready
+            if len(probes) == 1:
+                return None, b""
+            return (503, b"") if len(probes) < 4 else (200, 200)
+
+        routes = {("GET", "/api/healthcheck"): starting}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            waited = api.wait_until_ready(timeout=10.0, initial_delay=0.01)
+            api.close()
+        self.assertEqual(len(probes), 4)
+        self.assertLess(waited, 10.0)
+
+    def test_wait_until_ready_deadline(self):
+        """OdinsonBaseAPI.wait_until_ready should give up at the deadline."""
+        routes = {("GET", "/api/healthcheck"): lambda req: (503, b"")}
+        with StubOdinsonServer(routes) as server:
+            api = OdinsonBaseAPI(server.address)
+            with self.assertRaises(TimeoutError):
+                api.wait_until_ready(timeout=0.3, initial_delay=0.01, max_delay=0.05)
+            api.close()
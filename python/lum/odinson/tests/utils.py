@@ -10,3 +10,179 @@ TEST_DOC_PATH = os.path.join(
 )
 with open(TEST_DOC_PATH, "r") as infile:
     odinson_json = json.load(infile)
+
+
+class StubOdinsonServer:
+    """Minimal stand-in for the Odinson REST API that serves canned responses over keep-alive HTTP/1.1.
+
+    routes maps (method, path) to a callable accepting the request handler
+    and returning (status, body) or (status, body, headers).  Use as a context manager.
+    """
+
+    def __init__(self, routes):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stub = self
+        self.routes = routes
+        # client ports for each accepted connection
+        self.connections = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # write each response in a single segment (avoids Nagle/delayed ACK stalls)
+            wbufsize = 1 << 16
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                stub.connections.append(self.client_address[1])
+
+            def _dispatch(self, method):
+                path = self.path.split("?")[0]
+                route = stub.routes.get((method, path))
+                headers = dict()
+                if route is None:
+                    status, body = 404, b""
+                else:
+                    status, body, *rest = route(self)
+                    headers = rest[0] if rest else headers
+                if status is None:
+                    # simulate a connection reset
+                    self.close_connection = True
+                    return
+                body = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.address = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        import threading
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def mk_score_doc(sentence_id: int, score: float = 1.0):
+    """JSON for a single (minimal) ScoreDoc"""
+    return {
+        "sentenceId": sentence_id,
+        "score": score,
+        "documentId": f"doc-{sentence_id}",
+        "sentenceIndex": 0,
+        "words": ["Gonzo", "eats", "pies"],
+        "matches": [{"start": 0, "end": 1, "text": "Gonzo"}],
+    }
+
+
+def mk_paged_search_route(total: int, page_size: int):
+    """Stub route for /api/execute/pattern that pages through `total` hits using prevDoc"""
+    from urllib.parse import parse_qs, urlparse
+
+    requested = []
+
+    def route(req):
+        params = parse_qs(urlparse(req.path).query)
+        requested.append(params)
+        start = int(params["prevDoc"][0]) + 1 if "prevDoc" in params else 0
+        ids = range(start, min(start + page_size, total))
+        return 200, {
+            "odinsonQuery": params.get("odinsonQuery", [""])[0],
+            "duration": 0.01,
+            "totalHits": total,
+            "scoreDocs": [mk_score_doc(i, score=float(total - i)) for i in ids],
+        }
+
+    setattr(route, "requested", requested)
+    return route
+
+
+def mk_streaming_search_route(total: int):
+    """Stub route for /api/execute/pattern/stream that returns `total` hits (after prevDoc) as NDJSON"""
+    from urllib.parse import parse_qs, urlparse
+
+    requested = []
+
+    def route(req):
+        params = parse_qs(urlparse(req.path).query)
+        requested.append(params)
+        start = int(params["prevDoc"][0]) + 1 if "prevDoc" in params else 0
+        lines = [
+            json.dumps(mk_score_doc(i, score=float(total - i)))
+            for i in range(start, total)
+        ]
+        return 200, "\n".join(lines).encode() + b"\n"
+
+    setattr(route, "requested", requested)
+    return route
+
+
+def mk_mention(sentence_id: int, label: str = "Noun"):
+    """JSON for a single (minimal) mention"""
+    return {
+        "sentenceId": sentence_id,
+        "label": label,
+        "documentId": f"doc-{sentence_id}",
+        "sentenceIndex": 0,
+        "words": ["Gonzo", "eats", "pies"],
+        "foundBy": "nouns",
+        "match": [{"start": 0, "end": 1, "text": "Gonzo"}],
+    }
+
+
+def mk_streaming_grammar_route(total: int):
+    """Stub route for /api/execute/grammar/stream that returns `total` mentions as NDJSON"""
+    from urllib.parse import parse_qs, urlparse
+
+    requested = []
+
+    def route(req):
+        params = parse_qs(urlparse(req.path).query)
+        grammar = req.rfile.read(int(req.headers["Content-Length"])).decode()
+        requested.append((params, grammar))
+        lines = [json.dumps(mk_mention(i)) for i in range(total)]
+        return 200, "\n".join(lines).encode() + b"\n"
+
+    setattr(route, "requested", requested)
+    return route
+
+
+def mk_term_freq_route(total: int):
+    """Stub route for /api/term-freq over `total` terms (term{i} occurs total - i times)"""
+    from urllib.parse import parse_qs, urlparse
+
+    requested = []
+
+    def route(req):
+        params = parse_qs(urlparse(req.path).query)
+        requested.append(params)
+        lo, hi = int(params["min"][0]), int(params["max"][0])
+        return 200, [
+            {"term": f"term{i}", "frequency": float(total - i)}
+            for i in range(lo, min(hi + 1, total))
+        ]
+
+    setattr(route, "requested", requested)
+    return route
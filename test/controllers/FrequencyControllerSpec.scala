@@ -216,6 +216,9 @@ class FrequencyControllerSpec extends PlaySpec with GuiceOneAppPerTest with Inje
         case _                          => Nil
       }
 
+      // the window includes its last rank
+      rows must have length (10)
+
       // check for ordering (reverse Unicode sort)
       val terms = rows.map(_.term)
       terms.zip(terms.tail).foreach { case (term1, term2) =>
@@ -224,6 +227,17 @@ class FrequencyControllerSpec extends PlaySpec with GuiceOneAppPerTest with Inje
       }
     }
 
+    "return consecutive windows of ranks from the /term-freq endpoint" in {
+      def window(min: Int, max: Int): Seq[SingletonRow] = {
+        val response =
+          route(app, FakeRequest(GET, s"/api/term-freq?field=word&min=${min}&max=${max}")).get
+        status(response) mustBe OK
+        Helpers.contentAsJson(response).as[Seq[SingletonRow]]
+      }
+      // pages of ranks line up with a single larger window
+      window(0, 4) ++ window(5, 9) mustBe window(0, 9)
+    }
+
     "filter terms in /term-freq endpoint" in {
       // filter: `th.*`
       val response = route(app, FakeRequest(GET, "/api/term-freq?field=lemma&filter=th.*")).get
@@ -197,6 +197,42 @@ class OdinsonControllerSpec extends PlaySpec with GuiceOneAppPerSuite with Injec
 
     }
 
+    "stream every hit of a pattern by calling the /api/execute/pattern/stream endpoint" in {
+      // the pattern used in this test: "[lemma=be] []"
+      val result = route(
+        app,
+        FakeRequest(GET, "/api/execute/pattern/stream?odinsonQuery=%5Blemma%3Dbe%5D%20%5B%5D")
+      ).get
+
+      status(result) mustBe OK
+      contentType(result) mustBe Some("application/x-ndjson")
+      val lines = Helpers.contentAsString(result).split("\n").filter(_.nonEmpty)
+      lines must not be empty
+      lines.foreach { line => (Json.parse(line) \ "sentenceId").isDefined mustBe true }
+      Helpers.contentAsString(result) must include("core")
+    }
+
+    "reuse compiled patterns across requests and report it using the /api/cache/stats endpoint" in {
+      val pattern = "/api/execute/pattern?odinsonQuery=%5Blemma%3Dpie%5D"
+      def hits: Long = {
+        val stats = route(app, FakeRequest(GET, "/api/cache/stats")).get
+        status(stats) mustBe OK
+        (Helpers.contentAsJson(stats) \ "queries" \ "hits").as[Long]
+      }
+      status(route(app, FakeRequest(GET, pattern)).get) mustBe OK
+      val before = hits
+      status(route(app, FakeRequest(GET, pattern)).get) mustBe OK
+      hits must be > before
+    }
+
+    "report the thread pools using the /api/pools/stats endpoint" in {
+      val stats = route(app, FakeRequest(GET, "/api/pools/stats")).get
+      status(stats) mustBe OK
+      val json = Helpers.contentAsJson(stats)
+      (json \ "search" \ "threads").as[Int] must be > 0
+      (json \ "jobs" \ "rejected").as[Long] mustBe 0L
+    }
+
     // "process a pattern of disjunctive queries using the runDisjunctiveQuery method with a metadataQuery" in {
 
     //   val res1 = controller.runDisjunctiveQuery(
@@ -318,6 +354,35 @@ class OdinsonControllerSpec extends PlaySpec with GuiceOneAppPerSuite with Injec
       Helpers.contentAsString(response) must include("vision")
     }
 
+    "stream every mention of a grammar using the /api/execute/grammar/stream endpoint" in {
+      val ruleString =
+        s"""
+           |rules:
+           | - name: "example"
+           |   label: GrammaticalSubject
+           |   type: event
+           |   pattern: |
+           |     trigger  = [tag=/VB.*/]
+           |     subject  = >nsubj []
+           |
+        """.stripMargin
+
+      val result = route(
+        app,
+        FakeRequest(POST, "/api/execute/grammar/stream?label=GrammaticalSubject")
+          .withTextBody(ruleString)
+      ).get
+
+      status(result) mustBe OK
+      contentType(result) mustBe Some("application/x-ndjson")
+      val lines = Helpers.contentAsString(result).split("\n").filter(_.nonEmpty)
+      lines must not be empty
+      lines.foreach { line =>
+        (Json.parse(line) \ "foundBy").as[String] mustBe "example"
+      }
+      Helpers.contentAsString(result) must include("vision")
+    }
+
     "not persist state across uses of the /api/execute/grammar endpoint" in {
 
       val ruleString1 =
@@ -400,6 +465,40 @@ class OdinsonControllerSpec extends PlaySpec with GuiceOneAppPerSuite with Injec
       Helpers.contentAsString(response) must include("veranda") // other sentences in parent
     }
 
+    "retrieve a single sentence from its sidecar using the /api/sentence endpoint" in {
+      // written along with each document
+      new File(docsDir).listFiles.exists(_.getName.endsWith(".json.sentences")) mustBe true
+
+      val response = route(app, FakeRequest(GET, "/api/sentence/2")).get
+      status(response) mustBe OK
+      contentType(response) mustBe Some("application/json")
+      (Helpers.contentAsJson(response) \ "numTokens").as[Int] must be > 0
+    }
+
+    "retrieve many sentences and documents in one request" in {
+      val sentences = route(
+        app,
+        FakeRequest(POST, "/api/sentences").withJsonBody(Json.obj("sentenceIds" -> Seq(2, 1, 2)))
+      ).get
+      status(sentences) mustBe OK
+      val sentencesJson = Helpers.contentAsJson(sentences).as[Seq[JsValue]]
+      // one result per ID, in the order requested
+      sentencesJson must have length 3
+      sentencesJson.head mustBe sentencesJson(2)
+      (sentencesJson.head \ "numTokens").as[Int] must be > 0
+
+      val docs = route(
+        app,
+        FakeRequest(POST, "/api/metadata/documents")
+          .withJsonBody(Json.obj("documentIds" -> Seq("tp-pies", "not-a-doc")))
+      ).get
+      status(docs) mustBe OK
+      val docsJson = Helpers.contentAsJson(docs).as[Seq[JsValue]]
+      docsJson must have length 2
+      Json.stringify(docsJson.head) must include("MacLachlan")
+      docsJson(1) mustBe JsNull
+    }
+
     "retrieve an OdinsonDocument using the /api/document endpoint" in {
       val response =
         route(app, FakeRequest(GET, "/api/document/tp-pies")).get
@@ -411,6 +510,25 @@ class OdinsonControllerSpec extends PlaySpec with GuiceOneAppPerSuite with Injec
       Helpers.contentAsString(response) must include("pies") // sentence info
     }
 
+    "revalidate corpus information using ETags" in {
+      val first = route(app, FakeRequest(GET, "/api/corpus")).get
+      status(first) mustBe OK
+      val etag = header(ETAG, first)
+      etag mustBe defined
+
+      val revalidated =
+        route(app, FakeRequest(GET, "/api/corpus").withHeaders(IF_NONE_MATCH -> etag.get)).get
+      status(revalidated) mustBe NOT_MODIFIED
+      header(ETAG, revalidated) mustBe etag
+
+      // pretty-printed JSON is a different representation
+      val pretty = route(
+        app,
+        FakeRequest(GET, "/api/corpus?pretty=true").withHeaders(IF_NONE_MATCH -> etag.get)
+      ).get
+      status(pretty) mustBe OK
+    }
+
     "respond with corpus information using the /corpus endpoint" in {
       val response = route(app, FakeRequest(GET, "/api/corpus")).get
 
@@ -450,6 +568,15 @@ class OdinsonControllerSpec extends PlaySpec with GuiceOneAppPerSuite with Injec
       tags must contain("WRB")
     }
 
+    "share a single engine among controllers for the same index" in {
+      val other = new OdinsonController(testConfig, cc = Helpers.stubControllerComponents())
+      other.engines mustBe theSameInstanceAs(controller.engines)
+
+      val numDocs = route(app, FakeRequest(GET, "/api/numdocs")).get
+      status(numDocs) mustBe OK
+      Helpers.contentAsString(numDocs).toInt must be > 0
+    }
+
   }
 
 }